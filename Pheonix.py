@@ -1,51 +1,39 @@
 import phonenumbers
-from phonenumbers import carrier, geocoder, timezone, PhoneNumberFormat
 from colorama import init, Fore, Style
 import sys
 import json
 from datetime import datetime
 import csv
 import re
-import asyncio
-from holehe import core
-import warnings
-import bs4
-from bs4 import BeautifulSoup, GuessedAtParserWarning
-import tqdm
+import concurrent.futures
+import threading
+from collections import deque
 import tkinter as tk
 from tkinter import ttk, scrolledtext
-import threading
-import aiohttp
 import os
-import folium
-from opencage.geocoder import OpenCageGeocode
 import math
 import webbrowser
 from pathlib import Path
 import tkinter.messagebox
 import hashlib
 import tkinter.filedialog
-from config import OPEN_CAGE_API_KEY
+from config import OPEN_CAGE_API_KEY, PREWARM_ON_STARTUP, PORT_SCAN_PORTS, HOLEHE_PROFILES, HOLEHE_DEFAULT_PROFILE
 from phone_analyzer import PhoneAnalyzer
+from phone_record import PhoneRecord
+from batch_analyzer import analyze_number
 from osint_analyzer import OSINTAnalyzer
-
-# Monkey patch tqdm to handle cleanup gracefully
-def _del(self):
-    try:
-        self.close()
-    except:
-        pass
-tqdm.tqdm.__del__ = _del
-
-# Suppress BeautifulSoup warnings
-warnings.filterwarnings("ignore", category=GuessedAtParserWarning)
-
-# Configure BeautifulSoup to use lxml parser by default
-def _create_soup(*args, **kwargs):
-    kwargs['features'] = 'lxml'
-    return BeautifulSoup(*args, **kwargs)
-
-bs4.BeautifulSoup = _create_soup
+from async_runtime import get_background_loop
+from job_scheduler import JobScheduler
+from gui_renderer import TkRenderQueue
+from region_table import get_region_table
+from port_scanner import PortScanner, split_targets
+from nmap_scanner import NmapScanner, nmap_available
+from osint_results import HoleheResult, PhoneNumberResult, ResultExporter
+from result_cache import get_result_cache
+import lazy_deps
+
+# folium, holehe, bs4/lxml, aiohttp, tqdm, opencage, whois and socialscan are
+# imported on first use (see lazy_deps) so the window appears quickly
 
 init()  # Initialize colorama for colored output
 
@@ -90,6 +78,25 @@ class PhoneAnalyzerGUI:
         self.view_map_btn.grid(row=0, column=4, padx=5)
         self.view_map_btn.state(['disabled'])
         
+        # Batch Map button
+        self.batch_map_btn = ttk.Button(control_panel_frame, text="Batch Map", command=self.view_batch_map)
+        self.batch_map_btn.grid(row=0, column=5, padx=5)
+        
+        # Export button: streams OSINT results to JSONL/CSV as they arrive
+        self.export_btn = ttk.Button(control_panel_frame, text="Export", command=self.toggle_export)
+        self.export_btn.grid(row=0, column=6, padx=5)
+        
+        # Force Refresh: bypass cached results and replace them with fresh lookups
+        self.force_refresh_var = tk.BooleanVar(value=False)
+        self._force_refresh = False
+        force_refresh_check = ttk.Checkbutton(control_panel_frame, text="Force Refresh", variable=self.force_refresh_var,
+                                              command=lambda: setattr(self, "_force_refresh", self.force_refresh_var.get()))
+        force_refresh_check.grid(row=0, column=7, padx=5)
+        
+        # Cancel Jobs button
+        cancel_jobs_btn = ttk.Button(control_panel_frame, text="Cancel Jobs", command=self.cancel_jobs)
+        cancel_jobs_btn.grid(row=0, column=8, padx=5)
+        
         # Configure control_panel_frame grid weights
         control_panel_frame.columnconfigure(1, weight=1)
         
@@ -153,9 +160,17 @@ class PhoneAnalyzerGUI:
         self.osint_entry.pack(side=tk.LEFT, expand=True, fill='x', padx=5)
         self.osint_entry.insert(0, "test@example.com") # Placeholder
         
+        ttk.Label(osint_input_frame, text="Holehe Modules:").pack(side=tk.LEFT, padx=5)
+        self.holehe_profile_combo = ttk.Combobox(osint_input_frame, width=12, values=["all"] + list(HOLEHE_PROFILES))
+        self.holehe_profile_combo.pack(side=tk.LEFT, padx=5)
+        self.holehe_profile_combo.set(HOLEHE_DEFAULT_PROFILE)
+        
         self.osint_analyze_btn = ttk.Button(osint_input_frame, text="Analyze OSINT (Username/Email)", command=self.start_osint_analysis)
         self.osint_analyze_btn.pack(side=tk.LEFT, padx=5)
 
+        self.osint_cancel_btn = ttk.Button(osint_input_frame, text="Cancel Scan", command=self.cancel_osint_analysis, state='disabled')
+        self.osint_cancel_btn.pack(side=tk.LEFT, padx=5)
+
         ttk.Label(osint_input_frame, text="Email Domain:").pack(side=tk.LEFT, padx=5)
         self.email_domain_entry = ttk.Entry(osint_input_frame, width=30)
         self.email_domain_entry.pack(side=tk.LEFT, expand=True, fill='x', padx=5)
@@ -193,38 +208,57 @@ class PhoneAnalyzerGUI:
         self.osint_phone_isp_btn.pack(side=tk.LEFT, padx=5)
 
         self.osint_phone_validate_btn = ttk.Button(osint_input_frame, text="Validate Number", command=self.start_phone_validation)
-	        self.osint_phone_validate_btn.pack(side=tk.LEFT, padx=5)
-	
-	        ttk.Label(osint_input_frame, text="Username for Social Enumeration:").pack(side=tk.LEFT, padx=5)
-	        self.social_username_entry = ttk.Entry(osint_input_frame, width=30)
-	        self.social_username_entry.pack(side=tk.LEFT, expand=True, fill='x', padx=5)
-	        self.social_username_entry.insert(0, "username") # Placeholder
-	
-	        self.social_enumerate_btn = ttk.Button(osint_input_frame, text="Enumerate Social Media", command=self.start_social_enumeration)
-	        self.social_enumerate_btn.pack(side=tk.LEFT, padx=5)
-	        
-	        self.osint_text = scrolledtext.ScrolledText(self.osint_frame, wrap=tk.WORD, height=20)
-	        self.osint_text.pack(expand=True, fill='both', padx=5, pady=5)
-	        
-	        # Network Analysis tab
-	        self.network_frame = ttk.Frame(self.notebook)
-	        self.notebook.add(self.network_frame, text="Network Analysis")
-	        
-	        network_input_frame = ttk.Frame(self.network_frame, padding="5")
-	        network_input_frame.pack(fill='x')
-	        
-	        ttk.Label(network_input_frame, text="Target Host/IP:").pack(side=tk.LEFT, padx=5)
-	        self.network_target_entry = ttk.Entry(network_input_frame, width=30)
-	        self.network_target_entry.pack(side=tk.LEFT, expand=True, fill='x', padx=5)
-	        self.network_target_entry.insert(0, "scanme.nmap.org") # Placeholder
-	        
-	        self.port_scan_btn = ttk.Button(network_input_frame, text="Perform Port Scan (Nmap)", command=self.start_port_scan)
-	        self.port_scan_btn.pack(side=tk.LEFT, padx=5)
-	        
-	        self.network_text = scrolledtext.ScrolledText(self.network_frame, wrap=tk.WORD, height=20)
-	        self.network_text.pack(expand=True, fill='both', padx=5, pady=5)
-	        
-	        # Map tab
+        self.osint_phone_validate_btn.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(osint_input_frame, text="Username(s) for Social Enumeration:").pack(side=tk.LEFT, padx=5)
+        self.social_username_entry = ttk.Entry(osint_input_frame, width=30)
+        self.social_username_entry.pack(side=tk.LEFT, expand=True, fill='x', padx=5)
+        self.social_username_entry.insert(0, "username") # Placeholder
+
+        self.social_enumerate_btn = ttk.Button(osint_input_frame, text="Enumerate Social Media", command=self.start_social_enumeration)
+        self.social_enumerate_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.osint_text = scrolledtext.ScrolledText(self.osint_frame, wrap=tk.WORD, height=20)
+        self.osint_text.pack(expand=True, fill='both', padx=5, pady=5)
+        
+        # Network Analysis tab
+        self.network_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.network_frame, text="Network Analysis")
+        
+        network_input_frame = ttk.Frame(self.network_frame, padding="5")
+        network_input_frame.pack(fill='x')
+        
+        ttk.Label(network_input_frame, text="Targets (hosts, IPs, CIDR):").pack(side=tk.LEFT, padx=5)
+        self.network_target_entry = ttk.Entry(network_input_frame, width=30)
+        self.network_target_entry.pack(side=tk.LEFT, expand=True, fill='x', padx=5)
+        self.network_target_entry.insert(0, "scanme.nmap.org") # Placeholder
+        
+        ttk.Label(network_input_frame, text="Ports:").pack(side=tk.LEFT, padx=5)
+        self.network_ports_entry = ttk.Entry(network_input_frame, width=15)
+        self.network_ports_entry.pack(side=tk.LEFT, padx=5)
+        self.network_ports_entry.insert(0, PORT_SCAN_PORTS)
+        
+        self.port_scan_btn = ttk.Button(network_input_frame, text="Perform Port Scan", command=self.start_port_scan)
+        self.port_scan_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.network_text = scrolledtext.ScrolledText(self.network_frame, wrap=tk.WORD, height=20)
+        self.network_text.pack(expand=True, fill='both', padx=5, pady=5)
+        
+        # Summary tab
+        self.summary_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.summary_frame, text="Summary")
+        
+        summary_input_frame = ttk.Frame(self.summary_frame, padding="5")
+        summary_input_frame.pack(fill='x')
+        
+        self.summary_load_btn = ttk.Button(summary_input_frame, text="Load Batch Results", command=self.start_summary)
+        self.summary_load_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.summary_text = scrolledtext.ScrolledText(self.summary_frame, wrap=tk.WORD, height=20)
+        self.summary_text.pack(expand=True, fill='both', padx=5, pady=5)
+        self.summary_text.insert(tk.END, "Load a batch_analyzer output file (.jsonl or .csv) to see counts by country, carrier, number type, validation result and timezone, and the invalid rate per country.")
+        
+        # Map tab
         self.map_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.map_frame, text="Location Map")
         self.map_text = scrolledtext.ScrolledText(self.map_frame, wrap=tk.WORD, height=20)
@@ -246,291 +280,453 @@ class PhoneAnalyzerGUI:
         root.columnconfigure(0, weight=1)
         root.rowconfigure(0, weight=1)
         
+        # Worker threads never touch widgets directly; they queue updates here
+        self.ui = TkRenderQueue(root)
+        self.ui.start()
+        
         # Store the current phone number
         self.current_phone = None
         self.analyzer = None
         self.osint_analyzer = OSINTAnalyzer()
+        self._osint_future = None
+        # Bounded worker pool shared by every tab; identical in-flight jobs are coalesced
+        self.scheduler = JobScheduler()
+        # Parsed numbers shared by the Basic Info tab and the OSINT phone buttons
+        self._phone_records = {}
+        # Recent OSINT results (written out when an export starts) and the open exporter
+        self._results = deque(maxlen=1000)
+        self._exporter = None
+        self._export_lock = threading.Lock()
+
+    def _get_phone_record(self, phone_number):
+        """Return the cached PhoneRecord for a number, parsing it on first use"""
+        record = self._phone_records.get(phone_number)
+        if record is None:
+            try:
+                record = PhoneRecord(phone_number)
+            except phonenumbers.NumberParseException:
+                # Let the analyzers report the parse error in their usual way
+                return phone_number
+            if len(self._phone_records) >= 64:
+                self._phone_records.clear()
+            self._phone_records[phone_number] = record
+        return record
+
+    def _cached_result(self, analyzer, target, compute):
+        """
+        Answer from the result cache (memory, then disk) unless Force Refresh
+        is ticked; fresh results are stored for every tab to reuse
+        """
+        return get_result_cache().lookup_result(analyzer, target, compute, refresh=self._force_refresh)
+
+    def _publish_result(self, text_widget, result):
+        """Show a structured result and pass it to the running export, if any"""
+        self.ui.insert(text_widget, result.format())
+        self._record_result(result)
+
+    def _record_result(self, result):
+        """Keep a result for export, writing it out if an export is running"""
+        with self._export_lock:
+            self._results.append(result)
+            if self._exporter is not None:
+                try:
+                    self._exporter.write(result)
+                except (OSError, ValueError) as e:
+                    self._stop_export_locked()
+                    self.ui.set(self.status_var, f"Export stopped: {e}")
+
+    def toggle_export(self):
+        """Start streaming results to a file, or stop the running export"""
+        with self._export_lock:
+            if self._exporter is not None:
+                count = self._exporter.count
+                self._stop_export_locked()
+                self.status_var.set(f"Export finished: {count} result(s) written.")
+                return
+        path = tkinter.filedialog.asksaveasfilename(
+            title="Export results",
+            defaultextension=".jsonl",
+            filetypes=[("JSON Lines", "*.jsonl"), ("CSV", "*.csv")]
+        )
+        if not path:
+            return
+        try:
+            exporter = ResultExporter(path)
+        except OSError as e:
+            tkinter.messagebox.showerror("Error", f"Could not open {path}: {e}")
+            return
+        with self._export_lock:
+            exporter.write_many(self._results)
+            self._exporter = exporter
+        self.export_btn.config(text="Stop Export")
+        self.status_var.set(f"Exporting results to {os.path.basename(path)} as they arrive...")
+
+    def _stop_export_locked(self):
+        try:
+            self._exporter.close()
+        except OSError:
+            pass
+        self._exporter = None
+        self.ui.call(self.export_btn.config, text="Export")
+
+    def _submit_job(self, kind, target, button, fn, *args):
+        """Run fn on the job scheduler, re-enabling button if the job is cancelled before it starts"""
+        future = self.scheduler.submit(kind, target, fn, *args)
+
+        def on_done(f):
+            if f.cancelled():
+                self.ui.call(button.state, ['!disabled'])
+                self.ui.set(self.status_var, "Job cancelled.")
+
+        future.add_done_callback(on_done)
+        return future
+
+    def cancel_jobs(self):
+        """Cancel every queued job and the running Holehe scan"""
+        cancelled = self.scheduler.cancel()
+        self.cancel_osint_analysis()
+        self.status_var.set(f"Cancelled {cancelled} queued job(s).")
 
     def start_analysis(self):
+        phone_number = self.phone_entry.get().strip()
         self.analyze_btn.state(['disabled'])
         self.status_var.set("Analysis in progress...")
-        threading.Thread(target=self._run_analysis).start()
+        self._submit_job("phone", phone_number, self.analyze_btn, self._run_analysis, phone_number)
 
-    def _run_analysis(self):
+    def _run_analysis(self, phone_number):
         try:
-            phone_number = self.phone_entry.get().strip()
-            self.analyzer = PhoneAnalyzer(phone_number, OPEN_CAGE_API_KEY)
+            record = self._get_phone_record(phone_number)
+            self.analyzer = PhoneAnalyzer(record, OPEN_CAGE_API_KEY)
             self.current_phone = phone_number
-            
-            # Update basic info
-            validation = self.analyzer.validate_number()
-            if not validation["is_valid"]:
-                self.status_var.set(f"Invalid phone number: {validation['reason']}")
-                tkinter.messagebox.showerror("Error", f"Invalid phone number: {validation['reason']}")
-                return
 
-            basic_info = self.analyzer.get_basic_info()
-            number_type = self.analyzer.get_number_type()
+            # Update basic info, from the result cache (keyed by the number's E.164 digest) when possible
+            result = self._cached_result("phone", record, lambda: PhoneNumberResult.from_analysis(analyze_number(record)))
+            if result.error:
+                raise ValueError(result.error)
+            if not result.is_valid:
+                self.ui.set(self.status_var, f"Invalid phone number: {result.reason}")
+                self.ui.call(tkinter.messagebox.showerror, "Error", f"Invalid phone number: {result.reason}")
+                return
 
             info_text = f"Phone Number Analysis:\n\n"
-            info_text += f"International Format: {basic_info['formatted']['international']}\n"
-            info_text += f"National Format: {basic_info['formatted']['national']}\n"
-            info_text += f"E164 Format: {basic_info['formatted']['e164']}\n"
-            info_text += f"Region: {basic_info['region']}\n"
-            info_text += f"Carrier: {basic_info['carrier'] or 'Unknown'}\n"
-            info_text += f"Timezone(s): {', '.join(basic_info['timezone'])}\n"
-            info_text += f"Number Type: {number_type}\n"
-
-            self.basic_info_text.delete(1.0, tk.END)
-            self.basic_info_text.insert(tk.END, info_text)
+            info_text += f"International Format: {result.international}\n"
+            info_text += f"National Format: {result.national}\n"
+            info_text += f"E164 Format: {result.e164}\n"
+            info_text += f"Region: {result.region}\n"
+            info_text += f"Carrier: {result.carrier or 'Unknown'}\n"
+            info_text += f"Timezone(s): {', '.join(result.timezone)}\n"
+            info_text += f"Number Type: {result.number_type}\n"
+
+            self.ui.clear(self.basic_info_text)
+            self.ui.insert(self.basic_info_text, info_text)
+            self._record_result(result)
             
             # Enable map button
-            self.view_map_btn.state(['!disabled'])
+            self.ui.call(self.view_map_btn.state, ['!disabled'])
             
             # Enable social media buttons
-            self.telegram_btn.state(['!disabled'])
-            self.whatsapp_btn.state(['!disabled'])
-            self.facebook_btn.state(['!disabled'])
-            self.instagram_btn.state(['!disabled'])
+            self.ui.call(self.telegram_btn.state, ['!disabled'])
+            self.ui.call(self.whatsapp_btn.state, ['!disabled'])
+            self.ui.call(self.facebook_btn.state, ['!disabled'])
+            self.ui.call(self.instagram_btn.state, ['!disabled'])
             
-            self.status_var.set("Analysis complete.")
+            self.ui.set(self.status_var, "Analysis complete.")
 
         except ValueError as e:
-            tkinter.messagebox.showerror("Error", str(e))
-            self.status_var.set(str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", str(e))
+            self.ui.set(self.status_var, str(e))
         except Exception as e:
-            tkinter.messagebox.showerror("Error", f"An unexpected error occurred: {e}")
-            self.status_var.set(f"An unexpected error occurred: {e}")
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"An unexpected error occurred: {e}")
+            self.ui.set(self.status_var, f"An unexpected error occurred: {e}")
         finally:
-            self.analyze_btn.state(['!disabled'])
+            self.ui.call(self.analyze_btn.state, ['!disabled'])
 
     def start_osint_analysis(self):
+        query = self.osint_entry.get().strip()
+        modules = self.holehe_profile_combo.get().strip() or None
         self.osint_analyze_btn.state(['disabled'])
         self.status_var.set("OSINT analysis in progress...")
-        threading.Thread(target=self._run_osint_analysis).start()
+        self._submit_job("holehe", query, self.osint_analyze_btn, self._run_osint_analysis, query, modules)
 
-    def _run_osint_analysis(self):
+    def _run_osint_analysis(self, query, modules=None):
         try:
-            query = self.osint_entry.get().strip()
             if not query:
-                self.status_var.set("Please enter an email or username for OSINT analysis.")
-                tkinter.messagebox.showwarning("Warning", "Please enter an email or username for OSINT analysis.")
+                self.ui.set(self.status_var, "Please enter an email or username for OSINT analysis.")
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", "Please enter an email or username for OSINT analysis.")
+                return
+            
+            from holehe_runner import get_holehe_runner
+            try:
+                selected = get_holehe_runner().select(modules)
+            except ValueError as e:
+                self.ui.set(self.status_var, str(e))
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", str(e))
                 return
+            total = len(selected)
+            cache_target = (query, ",".join(selected))
+            
+            self.ui.clear(self.osint_text)
+            if not self._force_refresh:
+                cached = get_result_cache().get_result("holehe", cache_target)
+                if cached is not None:
+                    self.ui.insert(self.osint_text, f"Holehe results for: {query} (cached)\n\n")
+                    self._publish_result(self.osint_text, cached)
+                    self.ui.set(self.status_var, "OSINT analysis complete (cached).")
+                    return
+            
+            self.ui.insert(self.osint_text, f"Running Holehe scan for: {query} ({total} sites)\n\n")
+            sites = {}
+            
+            async def scan():
+                # Each site is shown as soon as its module answers
+                async for site, details in self.osint_analyzer.stream_email_or_username(query, modules):
+                    sites[site] = details
+                    self.ui.insert(self.osint_text, HoleheResult.format_site(site, details))
+                    hits = sum(1 for entry in sites.values() if entry.get("exists"))
+                    self.ui.set(self.status_var, f"Holehe: {len(sites)}/{total} sites checked, {hits} found...")
             
-            self.osint_text.delete(1.0, tk.END)
-            self.osint_text.insert(tk.END, f"Running Holehe scan for: {query}\n\n")
-            
-            # Holehe is an async function, so we need to run it in an event loop
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            results = loop.run_until_complete(self.osint_analyzer.analyze_email_or_username(query))
-            loop.close()
-
-            if results:
-                for service, data in results.items():
-                    self.osint_text.insert(tk.END, f"Service: {service}\n")
-                    for key, value in data.items():
-                        self.osint_text.insert(tk.END, f"  {key}: {value}\n")
-                    self.osint_text.insert(tk.END, "\n")
+            # Holehe runs on the shared background loop so scans reuse its connections
+            self._osint_future = get_background_loop().submit(scan())
+            self.ui.call(self.osint_cancel_btn.state, ['!disabled'])
+            try:
+                self._osint_future.result()
+            except concurrent.futures.CancelledError:
+                self.ui.insert(self.osint_text, "Holehe scan cancelled.\n")
+                self.ui.set(self.status_var, "OSINT analysis cancelled.")
+                return
+
+            hits = sorted(site for site, entry in sites.items() if entry.get("exists"))
+            if hits:
+                self.ui.insert(self.osint_text, f"--- Registered on {len(hits)} site(s) ---\n" + "\n".join(hits) + "\n")
             else:
-                self.osint_text.insert(tk.END, "No OSINT results found.")
+                self.ui.insert(self.osint_text, "Not registered on any of the checked sites.\n")
+            result = HoleheResult(query, sites=dict(sorted(sites.items())))
+            get_result_cache().set_result("holehe", cache_target, result)
+            self._record_result(result)
             
-            self.status_var.set("OSINT analysis complete.")
+            self.ui.set(self.status_var, "OSINT analysis complete.")
 
         except Exception as e:
-            self.status_var.set(str(e))
-            tkinter.messagebox.showerror("Error", f"Error during OSINT analysis: {e}")
+            self.ui.set(self.status_var, str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error during OSINT analysis: {e}")
         finally:
-            self.osint_analyze_btn.state(['!disabled'])
+            self._osint_future = None
+            self.ui.call(self.osint_cancel_btn.state, ['disabled'])
+            self.ui.call(self.osint_analyze_btn.state, ['!disabled'])
+
+    def cancel_osint_analysis(self):
+        """Cancel the Holehe scan that is currently running"""
+        if self._osint_future is not None:
+            self._osint_future.cancel()
 
     def start_email_domain_analysis(self):
+        email_address = self.email_domain_entry.get().strip()
         self.email_domain_analyze_btn.state(['disabled'])
         self.status_var.set("Email domain analysis in progress...")
-        threading.Thread(target=self._run_email_domain_analysis).start()
+        self._submit_job("whois", email_address, self.email_domain_analyze_btn, self._run_email_domain_analysis, email_address)
 
-    def _run_email_domain_analysis(self):
+    def _run_email_domain_analysis(self, email_address):
         try:
-            email_address = self.email_domain_entry.get().strip()
             if not email_address:
-                self.status_var.set("Please enter an email address for domain analysis.")
-                tkinter.messagebox.showwarning("Warning", "Please enter an email address for domain analysis.")
+                self.ui.set(self.status_var, "Please enter an email address for domain analysis.")
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", "Please enter an email address for domain analysis.")
                 return
             
-            self.osint_text.delete(1.0, tk.END)
-            self.osint_text.insert(tk.END, f"Performing WHOIS lookup for: {email_address}\n\n")
+            self.ui.clear(self.osint_text)
+            self.ui.insert(self.osint_text, f"Performing WHOIS lookup for: {email_address}\n\n")
             
-            whois_info = self.osint_analyzer.analyze_email_domain(email_address)
-            self.osint_text.insert(tk.END, whois_info)
+            result = self._cached_result("domain_whois", email_address,
+                                         lambda: self.osint_analyzer.email_domain_result(email_address))
+            self._publish_result(self.osint_text, result)
             
-            self.status_var.set("Email domain analysis complete.")
+            self.ui.set(self.status_var, "Email domain analysis complete.")
 
         except Exception as e:
-            self.status_var.set(str(e))
-            tkinter.messagebox.showerror("Error", f"Error during email domain analysis: {e}")
+            self.ui.set(self.status_var, str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error during email domain analysis: {e}")
         finally:
-            self.email_domain_analyze_btn.state(['!disabled'])
+            self.ui.call(self.email_domain_analyze_btn.state, ['!disabled'])
 
     def start_email_breach_analysis(self):
+        email_address = self.email_breach_entry.get().strip()
         self.email_breach_analyze_btn.state(['disabled'])
         self.status_var.set("Email breach analysis in progress...")
-        threading.Thread(target=self._run_email_breach_analysis).start()
+        self._submit_job("breach", email_address, self.email_breach_analyze_btn, self._run_email_breach_analysis, email_address)
 
-    def _run_email_breach_analysis(self):
+    def _run_email_breach_analysis(self, email_address):
         try:
-            email_address = self.email_breach_entry.get().strip()
             if not email_address:
-                self.status_var.set("Please enter an email address for breach analysis.")
-                tkinter.messagebox.showwarning("Warning", "Please enter an email address for breach analysis.")
+                self.ui.set(self.status_var, "Please enter an email address for breach analysis.")
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", "Please enter an email address for breach analysis.")
                 return
             
-            self.osint_text.delete(1.0, tk.END)
-            self.osint_text.insert(tk.END, f"Checking for breaches for: {email_address}\n\n")
+            self.ui.clear(self.osint_text)
+            self.ui.insert(self.osint_text, f"Checking for breaches for: {email_address}\n\n")
             
-            breach_info = self.osint_analyzer.check_breach(email_address)
-            self.osint_text.insert(tk.END, breach_info)
+            result = self._cached_result("breach", email_address, lambda: self.osint_analyzer.breach_result(email_address))
+            self._publish_result(self.osint_text, result)
             
-            self.status_var.set("Email breach analysis complete.")
+            self.ui.set(self.status_var, "Email breach analysis complete.")
 
         except Exception as e:
-            self.status_var.set(str(e))
-            tkinter.messagebox.showerror("Error", f"Error during email breach analysis: {e}")
+            self.ui.set(self.status_var, str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error during email breach analysis: {e}")
         finally:
-            self.email_breach_analyze_btn.state(['!disabled'])
+            self.ui.call(self.email_breach_analyze_btn.state, ['!disabled'])
 
     def start_ip_analysis(self):
+        ip_address = self.ip_entry.get().strip()
         self.ip_analyze_btn.state(['disabled'])
         self.status_var.set("IP address analysis in progress...")
-        threading.Thread(target=self._run_ip_analysis).start()
+        self._submit_job("ip", ip_address, self.ip_analyze_btn, self._run_ip_analysis, ip_address)
 
-    def _run_ip_analysis(self):
+    def _run_ip_analysis(self, ip_address):
         try:
-            ip_address = self.ip_entry.get().strip()
             if not ip_address:
-                self.status_var.set("Please enter an IP address for analysis.")
-                tkinter.messagebox.showwarning("Warning", "Please enter an IP address for analysis.")
+                self.ui.set(self.status_var, "Please enter an IP address for analysis.")
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", "Please enter an IP address for analysis.")
                 return
             
-            self.osint_text.delete(1.0, tk.END)
-            self.osint_text.insert(tk.END, f"Analyzing IP address: {ip_address}\n\n")
+            self.ui.clear(self.osint_text)
+            self.ui.insert(self.osint_text, f"Analyzing IP address: {ip_address}\n\n")
             
-            ip_info = self.osint_analyzer.analyze_ip_address(ip_address)
-            self.osint_text.insert(tk.END, ip_info)
+            result = self._cached_result("ip", ip_address, lambda: self.osint_analyzer.ip_address_result(ip_address))
+            self._publish_result(self.osint_text, result)
             
-            self.status_var.set("IP address analysis complete.")
+            self.ui.set(self.status_var, "IP address analysis complete.")
 
         except Exception as e:
-            self.status_var.set(str(e))
-            tkinter.messagebox.showerror("Error", f"Error during IP address analysis: {e}")
+            self.ui.set(self.status_var, str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error during IP address analysis: {e}")
         finally:
-            self.ip_analyze_btn.state(['!disabled'])
+            self.ui.call(self.ip_analyze_btn.state, ['!disabled'])
 
     def start_phone_basic_analysis(self):
+        phone_number = self.osint_phone_entry.get().strip()
         self.osint_phone_basic_btn.state(['disabled'])
         self.status_var.set("Phone number basic analysis in progress...")
-        threading.Thread(target=self._run_phone_basic_analysis).start()
+        self._submit_job("phone", phone_number, self.osint_phone_basic_btn, self._run_phone_basic_analysis, phone_number)
 
-    def _run_phone_basic_analysis(self):
+    def _run_phone_basic_analysis(self, phone_number):
         try:
-            phone_number = self.osint_phone_entry.get().strip()
             if not phone_number:
-                self.status_var.set("Please enter a phone number for basic analysis.")
-                tkinter.messagebox.showwarning("Warning", "Please enter a phone number for basic analysis.")
+                self.ui.set(self.status_var, "Please enter a phone number for basic analysis.")
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", "Please enter a phone number for basic analysis.")
                 return
             
-            self.osint_text.delete(1.0, tk.END)
-            self.osint_text.insert(tk.END, f"Analyzing basic info for phone number: {phone_number}\n\n")
+            self.ui.clear(self.osint_text)
+            self.ui.insert(self.osint_text, f"Analyzing basic info for phone number: {phone_number}\n\n")
             
-            basic_info = self.osint_analyzer.analyze_phone_number_basic_info(phone_number)
-            self.osint_text.insert(tk.END, basic_info)
+            record = self._get_phone_record(phone_number)
+            result = self._cached_result("phone_info", record, lambda: self.osint_analyzer.phone_basic_info_result(record))
+            self._publish_result(self.osint_text, result)
             
-            self.status_var.set("Phone number basic analysis complete.")
+            self.ui.set(self.status_var, "Phone number basic analysis complete.")
 
         except Exception as e:
-            self.status_var.set(str(e))
-            tkinter.messagebox.showerror("Error", f"Error during phone number basic analysis: {e}")
+            self.ui.set(self.status_var, str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error during phone number basic analysis: {e}")
         finally:
-            self.osint_phone_basic_btn.state(['!disabled'])
+            self.ui.call(self.osint_phone_basic_btn.state, ['!disabled'])
 
     def start_phone_isp_analysis(self):
+        phone_number = self.osint_phone_entry.get().strip()
         self.osint_phone_isp_btn.state(['disabled'])
         self.status_var.set("Phone number ISP analysis in progress...")
-        threading.Thread(target=self._run_phone_isp_analysis).start()
+        self._submit_job("phone", phone_number, self.osint_phone_isp_btn, self._run_phone_isp_analysis, phone_number)
 
-    def _run_phone_isp_analysis(self):
+    def _run_phone_isp_analysis(self, phone_number):
         try:
-            phone_number = self.osint_phone_entry.get().strip()
             if not phone_number:
-                self.status_var.set("Please enter a phone number for ISP analysis.")
-                tkinter.messagebox.showwarning("Warning", "Please enter a phone number for ISP analysis.")
+                self.ui.set(self.status_var, "Please enter a phone number for ISP analysis.")
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", "Please enter a phone number for ISP analysis.")
                 return
             
-            self.osint_text.delete(1.0, tk.END)
-            self.osint_text.insert(tk.END, f"Analyzing ISP for phone number: {phone_number}\n\n")
+            self.ui.clear(self.osint_text)
+            self.ui.insert(self.osint_text, f"Analyzing ISP for phone number: {phone_number}\n\n")
             
-            isp_info = self.osint_analyzer.analyze_phone_number_isp(phone_number)
-            self.osint_text.insert(tk.END, isp_info)
+            record = self._get_phone_record(phone_number)
+            result = self._cached_result("phone_carrier", record, lambda: self.osint_analyzer.phone_isp_result(record))
+            self._publish_result(self.osint_text, result)
             
-            self.status_var.set("Phone number ISP analysis complete.")
+            self.ui.set(self.status_var, "Phone number ISP analysis complete.")
 
         except Exception as e:
-            self.status_var.set(str(e))
-            tkinter.messagebox.showerror("Error", f"Error during phone number ISP analysis: {e}")
+            self.ui.set(self.status_var, str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error during phone number ISP analysis: {e}")
         finally:
-            self.osint_phone_isp_btn.state(['!disabled'])
+            self.ui.call(self.osint_phone_isp_btn.state, ['!disabled'])
 
     def start_social_enumeration(self):
+        username = self.social_username_entry.get().strip()
         self.social_enumerate_btn.state(['disabled'])
         self.status_var.set("Social media enumeration in progress...")
-        threading.Thread(target=self._run_social_enumeration).start()
+        self._submit_job("social", username, self.social_enumerate_btn, self._run_social_enumeration, username)
 
-    def _run_social_enumeration(self):
+    def _run_social_enumeration(self, username):
         try:
-            username = self.social_username_entry.get().strip()
             if not username:
-                self.status_var.set("Please enter a username for social media enumeration.")
-                tkinter.messagebox.showwarning("Warning", "Please enter a username for social media enumeration.")
+                self.ui.set(self.status_var, "Please enter a username for social media enumeration.")
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", "Please enter a username for social media enumeration.")
                 return
             
-            self.osint_text.delete(1.0, tk.END)
-            self.osint_text.insert(tk.END, f"Enumerating social media for username: {username}\n\n")
+            usernames = username.replace(",", " ").split()
+            self.ui.clear(self.osint_text)
+            self.ui.insert(self.osint_text, f"Enumerating social media for username(s): {', '.join(usernames)}\n\n")
+            
+            cache = get_result_cache()
+            pending = []
+            for name in usernames:
+                cached = None if self._force_refresh else cache.get_result("social_media", name)
+                if cached is None:
+                    pending.append(name)
+                else:
+                    self._publish_result(self.osint_text, cached)
+                    self.ui.insert(self.osint_text, "\n")
             
-            social_info = self.osint_analyzer.enumerate_social_media_username(username)
-            self.osint_text.insert(tk.END, social_info)
+            # Several usernames share one session and per-platform rate limits; each result shows as it finishes
+            if pending:
+                for result in self.osint_analyzer.social_media_results(pending):
+                    cache.set_result("social_media", result.query, result)
+                    self._publish_result(self.osint_text, result)
+                    self.ui.insert(self.osint_text, "\n")
             
-            self.status_var.set("Social media enumeration complete.")
+            self.ui.set(self.status_var, "Social media enumeration complete.")
 
         except Exception as e:
-            self.status_var.set(str(e))
-            tkinter.messagebox.showerror("Error", f"Error during social media enumeration: {e}")
+            self.ui.set(self.status_var, str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error during social media enumeration: {e}")
         finally:
-            self.social_enumerate_btn.state(['!disabled'])
+            self.ui.call(self.social_enumerate_btn.state, ['!disabled'])
 
     def start_phone_validation(self):
+        phone_number = self.osint_phone_entry.get().strip()
         self.osint_phone_validate_btn.state(['disabled'])
         self.status_var.set("Phone number validation in progress...")
-        threading.Thread(target=self._run_phone_validation).start()
+        self._submit_job("phone", phone_number, self.osint_phone_validate_btn, self._run_phone_validation, phone_number)
 
-    def _run_phone_validation(self):
+    def _run_phone_validation(self, phone_number):
         try:
-            phone_number = self.osint_phone_entry.get().strip()
             if not phone_number:
-                self.status_var.set("Please enter a phone number for validation.")
-                tkinter.messagebox.showwarning("Warning", "Please enter a phone number for validation.")
+                self.ui.set(self.status_var, "Please enter a phone number for validation.")
+                self.ui.call(tkinter.messagebox.showwarning, "Warning", "Please enter a phone number for validation.")
                 return
             
-            self.osint_text.delete(1.0, tk.END)
-            self.osint_text.insert(tk.END, f"Validating phone number: {phone_number}\n\n")
+            self.ui.clear(self.osint_text)
+            self.ui.insert(self.osint_text, f"Validating phone number: {phone_number}\n\n")
             
-            validation_result = self.osint_analyzer.validate_phone_number(phone_number)
-            self.osint_text.insert(tk.END, validation_result)
+            record = self._get_phone_record(phone_number)
+            result = self._cached_result("phone_validation", record,
+                                         lambda: self.osint_analyzer.phone_validation_result(record))
+            self._publish_result(self.osint_text, result)
             
-            self.status_var.set("Phone number validation complete.")
+            self.ui.set(self.status_var, "Phone number validation complete.")
 
         except Exception as e:
-            self.status_var.set(str(e))
-            tkinter.messagebox.showerror("Error", f"Error during phone number validation: {e}")
+            self.ui.set(self.status_var, str(e))
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error during phone number validation: {e}")
         finally:
-            self.osint_phone_validate_btn.state(['!disabled'])
+            self.ui.call(self.osint_phone_validate_btn.state, ['!disabled'])
 
     def clear_social_results(self):
         self.social_text.delete(1.0, tk.END)
@@ -584,112 +780,194 @@ class PhoneAnalyzerGUI:
     def view_map(self):
         self.view_map_btn.state(['disabled'])
         self.status_var.set("Generating map...")
-        threading.Thread(target=self._generate_map).start()
-
-	    def start_port_scan(self):
-	        """Start the port scan in a separate thread"""
-	        target = self.network_target_entry.get().strip()
-	        if not target:
-	            tkinter.messagebox.showerror("Error", "Please enter a target host or IP.")
-	            return
-	
-	        self.port_scan_btn.state(['disabled'])
-	        self.network_text.delete(1.0, tk.END)
-	        self.network_text.insert(tk.END, f"Starting Nmap port scan on {target}... This may take a moment.\n")
-	        self.status_var.set(f"Running port scan on {target}...")
-	        
-	        threading.Thread(target=self._run_port_scan_thread, args=(target,)).start()
-	
-	    def _run_port_scan_thread(self, target):
-	        """Threaded function to run nmap and update GUI"""
-	        try:
-	            # Use a simple, non-aggressive scan for common ports
-	            command = f"nmap -F {target}" 
-	            
-	            # Execute the command using subprocess and capture output
-	            import subprocess
-	            process = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=60)
-	            
-	            output = process.stdout
-	            if process.stderr:
-	                output += "\n--- Nmap Error Output ---\n" + process.stderr
-	            
-	            self.network_text.insert(tk.END, "\n--- Nmap Scan Results ---\n")
-	            self.network_text.insert(tk.END, output)
-	            self.status_var.set(f"Port scan on {target} complete.")
-	            
-	        except subprocess.TimeoutExpired:
-	            self.network_text.insert(tk.END, "\n--- Scan Failed ---\nNmap scan timed out after 60 seconds.")
-	            self.status_var.set(f"Port scan on {target} failed (Timeout).")
-	        except Exception as e:
-	            self.network_text.insert(tk.END, f"\n--- Scan Failed ---\nAn error occurred during the scan: {e}")
-	            self.status_var.set(f"Port scan on {target} failed.")
-	        finally:
-	            self.port_scan_btn.state(['!disabled'])
-	
-	    def _generate_map(self):
-	        try:
-	            if not self.analyzer:
-	                self.status_var.set("No phone number analyzed yet.")
-	                return
-
-	            # Use the region name first for geocoding
-	            region = self.analyzer.get_basic_info()['region']
-	            
-	            # Fallback to E164 number for more precise location if region is too broad (e.g., just a country)
-	            search_query = region
-	            if self.analyzer.get_region_code() == region: # If region is just the country name
-	                search_query = self.analyzer.get_e164_number()
-	
-	            if not search_query:
-	                self.status_var.set("No valid search query for map generation.")
-	                tkinter.messagebox.showerror("Error", "No valid search query for map generation.")
-	                return
-	
-	            try:
-	                results = self.analyzer.geocoder.geocode(search_query)
-	            except Exception as e:
-                self.status_var.set(f"OpenCage Geocoding API error: {e}")
-                tkinter.messagebox.showerror("API Error", f"OpenCage Geocoding API error: {e}. Please check your API key and daily quota.")
+        self._submit_job("map", self.current_phone, self.view_map_btn, self._generate_map)
+
+    def view_batch_map(self):
+        """Plot a batch_analyzer output file on one clustered map"""
+        results_path = tkinter.filedialog.askopenfilename(
+            title="Select batch results",
+            filetypes=[("Batch results", "*.jsonl *.ndjson *.csv"), ("All files", "*.*")]
+        )
+        if not results_path:
+            return
+        self.batch_map_btn.state(['disabled'])
+        self.status_var.set("Generating batch map...")
+        self._submit_job("map", results_path, self.batch_map_btn, self._generate_batch_map, results_path)
+
+    def _generate_batch_map(self, results_path):
+        try:
+            from cluster_map import build_batch_map
+            map_file = "batch_map.html"
+            count = build_batch_map(results_path, map_file)
+            self.ui.clear(self.map_text)
+            self.ui.insert(self.map_text, f"Plotted {count} locations from {os.path.basename(results_path)} to {map_file}.")
+            try:
+                webbrowser.open(map_file)
+                self.ui.set(self.status_var, "Batch map generated and opened.")
+            except webbrowser.Error:
+                self.ui.set(self.status_var, f"Error: Could not open map in browser. File saved to {map_file}.")
+        except Exception as e:
+            self.ui.set(self.status_var, f"Error generating batch map: {e}")
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error generating batch map: {e}")
+        finally:
+            self.ui.call(self.batch_map_btn.state, ['!disabled'])
+
+    def start_summary(self):
+        results_path = tkinter.filedialog.askopenfilename(
+            title="Select batch results",
+            filetypes=[("Batch results", "*.jsonl *.ndjson *.csv"), ("All files", "*.*")]
+        )
+        if not results_path:
+            return
+        self.summary_load_btn.state(['disabled'])
+        self.summary_text.delete(1.0, tk.END)
+        self.status_var.set(f"Summarizing {os.path.basename(results_path)}...")
+        self._submit_job("stats", results_path, self.summary_load_btn, self._run_summary, results_path)
+
+    def _run_summary(self, results_path):
+        try:
+            from result_stats import ResultStats, format_summary
+            stats = ResultStats.from_file(results_path)
+            self.ui.insert(self.summary_text, f"--- Summary of {os.path.basename(results_path)} ---\n\n")
+            self.ui.insert(self.summary_text, format_summary(stats, top=20))
+            self.ui.set(self.status_var, f"Summarized {len(stats)} results.")
+        except Exception as e:
+            self.ui.set(self.status_var, f"Error summarizing results: {e}")
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error summarizing results: {e}")
+        finally:
+            self.ui.call(self.summary_load_btn.state, ['!disabled'])
+
+    def start_port_scan(self):
+        """Start the port scan on the job scheduler"""
+        target = self.network_target_entry.get().strip()
+        if not target:
+            tkinter.messagebox.showerror("Error", "Please enter a target host or IP.")
+            return
+        # nmap adds service detection when it is installed; otherwise use the built-in scanner
+        scanner_class = NmapScanner if nmap_available() else PortScanner
+        try:
+            scanner = scanner_class(ports=self.network_ports_entry.get().strip() or PORT_SCAN_PORTS)
+        except ValueError as e:
+            tkinter.messagebox.showerror("Error", f"Invalid ports: {e}")
+            return
+
+        self.port_scan_btn.state(['disabled'])
+        self.network_text.delete(1.0, tk.END)
+        engine = "nmap" if scanner_class is NmapScanner else "built-in scanner"
+        self.network_text.insert(tk.END, f"Scanning {len(scanner.ports)} TCP port(s) on {target} with {engine}...\n")
+        self.status_var.set(f"Running port scan on {target}...")
+        
+        self._submit_job("port_scan", target, self.port_scan_btn, self._run_port_scan_thread, scanner, target)
+
+    def _run_port_scan_thread(self, scanner, target):
+        """Stream open ports into the Network tab as the scan finds them"""
+        try:
+            hosts = 0
+            found = 0
+            for event in scanner.iter_scan(split_targets(target)):
+                if event["event"] == "host":
+                    if event["error"]:
+                        self.ui.insert(self.network_text, f"{event['target']}: {event['error']}\n")
+                    else:
+                        hosts += 1
+                elif event["event"] == "done":
+                    if event["timed_out"]:
+                        self.ui.insert(self.network_text, f"{event['target']}: {event['error']}\n")
+                else:
+                    found += 1
+                    label = event["target"] if event["target"] == event["ip"] else f"{event['target']} ({event['ip']})"
+                    self.ui.insert(self.network_text, f"{label}  {event['port']}/tcp open  {event['service']}\n")
+            
+            self.ui.insert(self.network_text, f"\n--- Scan Complete ---\n{found} open port(s) across {hosts} host(s).\n")
+            self.ui.set(self.status_var, f"Port scan on {target} complete.")
+        except Exception as e:
+            self.ui.insert(self.network_text, f"\n--- Scan Failed ---\nAn error occurred during the scan: {e}")
+            self.ui.set(self.status_var, f"Port scan on {target} failed.")
+        finally:
+            self.ui.call(self.port_scan_btn.state, ['!disabled'])
+
+    def _generate_map(self):
+        try:
+            if not self.analyzer:
+                self.ui.set(self.status_var, "No phone number analyzed yet.")
                 return
 
-            if results and len(results) > 0:
-                lat = results[0]['geometry']['lat']
-                lng = results[0]['geometry']['lng']
+            # Use the region name first for geocoding; the record already has it from the analysis
+            region = self.analyzer.record.region
+
+            # Precomputed coordinates answer most regions with no network I/O, and
+            # locations geocoded before are kept in the result cache
+            location = get_region_table().lookup_record(self.analyzer.record)
+            cached = None if self._force_refresh else get_result_cache().get("map_location", self.analyzer.record)
+            if location is not None:
+                lat, lng, zoom_level = location
+                popup = region
+            elif cached is not None:
+                lat, lng, zoom_level, popup = cached
+                location = (lat, lng, zoom_level)
+            else:
+                # Fallback to E164 number for more precise location if region is too broad (e.g., just a country)
+                search_query = region
+                if self.analyzer.get_region_code() == region: # If region is just the country name
+                    search_query = self.analyzer.get_e164_number()
+
+                if not search_query:
+                    self.ui.set(self.status_var, "No valid search query for map generation.")
+                    self.ui.call(tkinter.messagebox.showerror, "Error", "No valid search query for map generation.")
+                    return
 
-	                # Create map
-	                # Adjust zoom level based on result confidence/type
-	                zoom_level = 10
-	                if 'confidence' in results[0] and results[0]['confidence'] > 5:
-	                    zoom_level = 14 # Higher confidence, zoom in more
-	                
-	                m = folium.Map(location=[lat, lng], zoom_start=zoom_level)
-	                folium.Marker([lat, lng], popup=results[0]['formatted']).add_to(m)
+                try:
+                    results = self.analyzer.geocoder.geocode(search_query)
+                except Exception as e:
+                    self.ui.set(self.status_var, f"OpenCage Geocoding API error: {e}")
+                    self.ui.call(tkinter.messagebox.showerror, "API Error", f"OpenCage Geocoding API error: {e}. Please check your API key and daily quota.")
+                    return
+
+                if results and len(results) > 0:
+                    lat = results[0]['geometry']['lat']
+                    lng = results[0]['geometry']['lng']
+
+                    # Adjust zoom level based on result confidence/type
+                    zoom_level = 10
+                    if 'confidence' in results[0] and results[0]['confidence'] > 5:
+                        zoom_level = 14 # Higher confidence, zoom in more
+                    popup = results[0]['formatted']
+                    location = (lat, lng, zoom_level)
+                    get_result_cache().set("map_location", self.analyzer.record, [lat, lng, zoom_level, popup])
+
+            if location is not None:
+                # Create map
+                import folium
+                m = folium.Map(location=[lat, lng], zoom_start=zoom_level)
+                folium.Marker([lat, lng], popup=popup).add_to(m)
 
                 # Save to file
                 map_file = "location_map.html"
                 m.save(map_file)
                 try:
                     webbrowser.open(map_file)
-                    self.map_text.delete(1.0, tk.END)
-                    self.map_text.insert(tk.END, f"Map saved to {map_file} and opened in browser.")
-                    self.status_var.set("Map generated and opened.")
+                    self.ui.clear(self.map_text)
+                    self.ui.insert(self.map_text, f"Map saved to {map_file} and opened in browser.")
+                    self.ui.set(self.status_var, "Map generated and opened.")
                 except webbrowser.Error:
-                    self.status_var.set(f"Error: Could not open map in browser. File saved to {map_file}.")
-                    tkinter.messagebox.showerror("Error", f"Could not open map in browser. File saved to {map_file}.")
+                    self.ui.set(self.status_var, f"Error: Could not open map in browser. File saved to {map_file}.")
+                    self.ui.call(tkinter.messagebox.showerror, "Error", f"Could not open map in browser. File saved to {map_file}.")
             else:
-                self.map_text.delete(1.0, tk.END)
-                self.map_text.insert(tk.END, "Could not find location coordinates for the region.")
-                tkinter.messagebox.showerror("Error", "Could not find location coordinates for the region.")
-                self.status_var.set("Map generation failed: No coordinates found.")
+                self.ui.clear(self.map_text)
+                self.ui.insert(self.map_text, "Could not find location coordinates for the region.")
+                self.ui.call(tkinter.messagebox.showerror, "Error", "Could not find location coordinates for the region.")
+                self.ui.set(self.status_var, "Map generation failed: No coordinates found.")
                 
         except Exception as e:
-            self.status_var.set(f"Error generating map: {e}")
-            tkinter.messagebox.showerror("Error", f"Error generating map: {e}")
+            self.ui.set(self.status_var, f"Error generating map: {e}")
+            self.ui.call(tkinter.messagebox.showerror, "Error", f"Error generating map: {e}")
         finally:
-            self.view_map_btn.state(['!disabled'])
+            self.ui.call(self.view_map_btn.state, ['!disabled'])
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = PhoneAnalyzerGUI(root)
+    if PREWARM_ON_STARTUP:
+        # Load the heavy subsystems in the background once the window is up
+        root.after(500, lazy_deps.prewarm)
     root.mainloop()
@@ -0,0 +1,186 @@
+import asyncio
+from config import SERVICE_MAX_PENDING, SERVICE_ANALYZER_LIMITS
+from result_cache import get_result_cache, result_key
+
+# Analyzer name -> what it takes, for help texts and the API's index
+ANALYZER_TARGETS = {
+    "phone": "phone number",
+    "email": "email address (Holehe site registrations)",
+    "breach": "email address (Have I Been Pwned)",
+    "ip": "IP address (geolocation and WHOIS)",
+    "whois": "domain or email address (domain WHOIS)",
+    "username": "username (social media platforms)",
+}
+
+
+# The `kind` of the result dicts each analyzer returns (see osint_results.RESULT_TYPES)
+RESULT_KINDS = {
+    "phone": "phone",
+    "email": "holehe",
+    "breach": "breach",
+    "ip": "ip",
+    "whois": "domain_whois",
+    "username": "social_media",
+}
+
+
+# Result cache names for analyzers whose results the GUI caches too, so the
+# service and the GUI answer each other's repeat lookups
+CACHE_NAMES = {
+    "phone": "phone",
+    "breach": "breach",
+    "ip": "ip",
+    "whois": "domain_whois",
+    "username": "social_media",
+}
+
+
+class UnknownAnalyzer(ValueError):
+    pass
+
+
+class Overloaded(RuntimeError):
+    """Raised when a request would exceed `max_pending`; callers should retry later"""
+
+
+def default_analyzers(osint=None, scheduler=None, limits=SERVICE_ANALYZER_LIMITS):
+    """
+    Return {name: async fn(target) -> result dict} backed by PhoneAnalyzer
+    and OSINTAnalyzer. Blocking analyzers run on the JobScheduler's workers,
+    which by default are sized and capped by `limits`.
+    """
+    from batch_analyzer import analyze_number
+    from job_scheduler import JobScheduler
+    from osint_results import PhoneNumberResult
+    if osint is None:
+        from osint_analyzer import OSINTAnalyzer
+        osint = OSINTAnalyzer()
+    if scheduler is None:
+        blocking_kinds = ("phone", "whois")
+        scheduler = JobScheduler(max_workers=sum(limits.get(kind, 4) for kind in blocking_kinds),
+                                 limits={kind: limits.get(kind, 4) for kind in blocking_kinds})
+
+    def blocking(kind, fn):
+        async def run(target):
+            return await asyncio.wrap_future(scheduler.submit(kind, target, fn, target))
+        return run
+
+    async def email(target):
+        return (await osint.holehe_result_async(target)).to_dict()
+
+    async def breach(target):
+        return (await osint.breach_result_async(target)).to_dict()
+
+    async def ip(target):
+        return (await osint.ip_address_result_async(target)).to_dict()
+
+    async def username(target):
+        return (await osint.social_media_result_async(target)).to_dict()
+
+    return {
+        "phone": blocking("phone", lambda target: PhoneNumberResult.from_analysis(analyze_number(target)).to_dict()),
+        "email": email,
+        "breach": breach,
+        "ip": ip,
+        "whois": blocking("whois", lambda target: osint.email_domain_result(target).to_dict()),
+        "username": username,
+    }
+
+
+class AnalysisService:
+    """
+    Runs analyzers for many concurrent callers on one event loop.
+    Concurrent requests for the same (analyzer, target) share one call, each
+    analyzer has its own concurrency cap, and finished results go through
+    the result cache. At most `max_pending` distinct requests are admitted
+    at once: analyze() raises Overloaded beyond that, or waits for room
+    when called with wait=True (batch work).
+    """
+
+    def __init__(self, analyzers=None, limits=SERVICE_ANALYZER_LIMITS, max_pending=SERVICE_MAX_PENDING, cache=None):
+        self.limits = dict(limits)
+        self.analyzers = analyzers if analyzers is not None else default_analyzers(limits=self.limits)
+        self.max_pending = max_pending
+        self.cache = get_result_cache() if cache is None else cache
+        self.coalesced = 0
+        self._inflight = {}
+        self._semaphores = {}
+        self._room = None
+
+    @property
+    def pending(self):
+        return len(self._inflight)
+
+    def _semaphore(self, name):
+        if name not in self._semaphores:
+            self._semaphores[name] = asyncio.Semaphore(self.limits.get(name, 4))
+        return self._semaphores[name]
+
+    async def analyze(self, name, target, refresh=False, wait=False):
+        """Return the result dict for one target, from the cache unless refresh is set"""
+        if name not in self.analyzers:
+            raise UnknownAnalyzer(f"Unknown analyzer {name!r}; choose from {', '.join(self.analyzers)}")
+        target = str(target).strip()
+        if not target:
+            raise ValueError("Empty target")
+        # A refresh must not join a request that may be answered from the cache
+        key = (result_key(name, target), refresh)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        if self._room is None:
+            self._room = asyncio.Condition()
+        while self.pending >= self.max_pending:
+            if not wait:
+                raise Overloaded(f"{self.pending} requests in progress; try again shortly")
+            async with self._room:
+                await self._room.wait()
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return await asyncio.shield(future)
+        future = asyncio.ensure_future(self._run(name, target, refresh))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._finished(key))
+        return await asyncio.shield(future)
+
+    def _finished(self, key):
+        self._inflight.pop(key, None)
+        asyncio.ensure_future(self._notify())
+
+    async def _notify(self):
+        async with self._room:
+            self._room.notify_all()
+
+    async def _run(self, name, target, refresh):
+        loop = asyncio.get_running_loop()
+        cache_name = CACHE_NAMES.get(name, name)
+        if not refresh:
+            cached = await loop.run_in_executor(None, self.cache.get, cache_name, target)
+            if cached is not None:
+                return cached
+        async with self._semaphore(name):
+            result = await self.analyzers[name](target)
+        if not result.get("error"):
+            await loop.run_in_executor(None, self.cache.set, cache_name, target, result)
+        return result
+
+    async def analyze_many(self, name, targets, concurrency=None, refresh=False):
+        """
+        Async generator of (target, result dict) in completion order, with
+        at most `concurrency` targets in flight (the analyzer's limit by
+        default). Failures are reported as {"error": ...} results.
+        """
+        from async_runtime import bounded_map
+        if name not in self.analyzers:
+            raise UnknownAnalyzer(f"Unknown analyzer {name!r}; choose from {', '.join(self.analyzers)}")
+
+        async def run(target):
+            try:
+                return target, await self.analyze(name, target, refresh=refresh, wait=True)
+            except Exception as e:
+                return target, {"kind": RESULT_KINDS.get(name, name), "query": target, "error": str(e)}
+
+        async for item in bounded_map(run, targets, concurrency or self.limits.get(name, 4)):
+            yield item
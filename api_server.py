@@ -0,0 +1,109 @@
+import argparse
+import json
+from aiohttp import web
+from analysis_service import AnalysisService, ANALYZER_TARGETS, UnknownAnalyzer, Overloaded
+from config import API_HOST, API_PORT, API_MAX_BATCH
+
+# aiohttp before 3.9 has no AppKey and takes plain string keys
+SERVICE_KEY = web.AppKey("service", AnalysisService) if hasattr(web, "AppKey") else "service"
+
+
+def _json_error(status, message, **headers):
+    return web.json_response({"error": message}, status=status, headers=headers)
+
+
+def _flag(value):
+    return str(value).lower() in ("1", "true", "yes")
+
+
+async def index(request):
+    service = request.app[SERVICE_KEY]
+    return web.json_response({
+        "analyzers": {name: ANALYZER_TARGETS.get(name, "") for name in service.analyzers},
+        "endpoints": ["GET /v1/{analyzer}?target=...[&refresh=1]", "POST /v1/{analyzer}/batch"],
+    })
+
+
+async def health(request):
+    service = request.app[SERVICE_KEY]
+    return web.json_response({"status": "ok", "pending": service.pending, "max_pending": service.max_pending,
+                              "coalesced": service.coalesced})
+
+
+async def analyze_one(request):
+    """GET /v1/{analyzer}?target=...: one result as JSON"""
+    service = request.app[SERVICE_KEY]
+    name = request.match_info["analyzer"]
+    target = request.query.get("target", "")
+    try:
+        result = await service.analyze(name, target, refresh=_flag(request.query.get("refresh")))
+    except UnknownAnalyzer as e:
+        return _json_error(404, str(e))
+    except Overloaded as e:
+        return _json_error(503, str(e), **{"Retry-After": "1"})
+    except ValueError as e:
+        return _json_error(400, str(e))
+    return web.json_response(result)
+
+
+async def _read_targets(request):
+    """Targets from a JSON body ({"targets": [...]} or a list) or one per line of plain text"""
+    if request.content_type == "application/json":
+        body = await request.json()
+        targets = body.get("targets") if isinstance(body, dict) else body
+        if not isinstance(targets, list):
+            raise ValueError('Expected a JSON list or {"targets": [...]}')
+        return [str(target) for target in targets if str(target).strip()]
+    text = await request.text()
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+async def analyze_batch(request):
+    """
+    POST /v1/{analyzer}/batch: results are streamed back as JSON lines
+    ({"target", "result"}) in completion order. Writes wait for the client
+    to read, so a slow reader slows the batch instead of buffering it.
+    """
+    service = request.app[SERVICE_KEY]
+    name = request.match_info["analyzer"]
+    if name not in service.analyzers:
+        return _json_error(404, f"Unknown analyzer {name!r}")
+    try:
+        targets = await _read_targets(request)
+    except ValueError as e:
+        return _json_error(400, str(e))
+    if len(targets) > API_MAX_BATCH:
+        return _json_error(413, f"Batch of {len(targets)} targets exceeds the limit of {API_MAX_BATCH}")
+    # Refuse up front rather than queue a batch behind a full service
+    if service.pending >= service.max_pending:
+        return _json_error(503, "Service is busy; try again shortly", **{"Retry-After": "5"})
+
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    async for target, result in service.analyze_many(name, targets, refresh=_flag(request.query.get("refresh"))):
+        line = json.dumps({"target": target, "result": result}, ensure_ascii=False, default=str)
+        await response.write(line.encode("utf-8") + b"\n")
+    await response.write_eof()
+    return response
+
+
+def create_app(service=None):
+    app = web.Application(client_max_size=16 * 1024 * 1024)
+    app[SERVICE_KEY] = service or AnalysisService()
+    app.router.add_get("/", index)
+    app.router.add_get("/health", health)
+    app.router.add_get("/v1/{analyzer}", analyze_one)
+    app.router.add_post("/v1/{analyzer}/batch", analyze_batch)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the phone and OSINT analyzers over a local HTTP API.")
+    parser.add_argument("--host", default=API_HOST, help=f"Address to listen on (default {API_HOST})")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"Port to listen on (default {API_PORT})")
+    args = parser.parse_args(argv)
+    web.run_app(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import asyncio
+import atexit
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class BackgroundLoop:
+    """
+    An asyncio event loop running forever in a daemon thread.
+    Synchronous code (the GUI, worker threads) hands coroutines to it and
+    waits on the returned concurrent.futures.Future, so connection pools
+    and other loop-bound resources survive between calls.
+    """
+
+    def __init__(self, name="pheonix-async"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks = []
+        self._futures = set()
+
+    @property
+    def loop(self):
+        self.start()
+        return self._loop
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def _run(self, ready):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    def submit(self, coro):
+        """
+        Schedule a coroutine on the loop and return a concurrent.futures.Future.
+        Calling cancel() on the future cancels the underlying task.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return future
+
+    def cancel_all(self):
+        """Cancel every coroutine submitted to the loop that is still running"""
+        for future in list(self._futures):
+            future.cancel()
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the loop and block until it finishes"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BackgroundLoop.run() cannot be called from the loop thread")
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, agen):
+        """
+        Consume an async generator on the loop from synchronous code, yielding
+        its items as they arrive. Closing the returned generator cancels it.
+        """
+        items = queue.Queue()
+
+        async def drain():
+            try:
+                async for item in agen:
+                    items.put((item, None))
+            except Exception as e:
+                items.put((None, e))
+            finally:
+                items.put((_DONE, None))
+
+        future = self.submit(drain())
+        try:
+            while True:
+                item, error = items.get()
+                if error is not None:
+                    raise error
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    def add_shutdown_hook(self, hook):
+        """Register a coroutine function to await on the loop before it stops"""
+        self._shutdown_hooks.append(hook)
+
+    def stop(self):
+        with self._lock:
+            if self._thread is None:
+                return
+            self.cancel_all()
+            for hook in self._shutdown_hooks:
+                try:
+                    asyncio.run_coroutine_threadsafe(hook(), self._loop).result(5)
+                except Exception:
+                    pass
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._thread = None
+            self._loop = None
+
+
+_background_loop = BackgroundLoop()
+atexit.register(_background_loop.stop)
+
+
+def get_background_loop():
+    """Return the process-wide BackgroundLoop"""
+    return _background_loop
+
+
+def run_sync(coro, timeout=None):
+    """Run a coroutine on the shared background loop from synchronous code"""
+    return _background_loop.run(coro, timeout)
+
+
+async def as_async_iter(items):
+    """Iterate a sync or async iterable asynchronously"""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def bounded_map(fn, items, concurrency):
+    """
+    Async generator that awaits fn(item) for every item of a sync or async
+    iterable, with at most `concurrency` calls in flight, and yields the
+    results in completion order. Input is consumed lazily.
+    """
+    pending = set()
+    done = set()
+    try:
+        async for item in as_async_iter(items):
+            if len(pending) >= concurrency:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                while done:
+                    yield done.pop().result()
+            pending.add(asyncio.ensure_future(fn(item)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            while done:
+                yield done.pop().result()
+    finally:
+        for task in pending:
+            task.cancel()
+        # Finished but unconsumed results are dropped; retrieving their
+        # exceptions keeps asyncio from logging them as never retrieved
+        for task in done:
+            if not task.cancelled():
+                task.exception()
+
+
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, bursting up to `capacity`.
+    pause() blocks every caller until a deadline, which is how a server's
+    Retry-After is applied to all in-flight workers at once.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
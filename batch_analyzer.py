@@ -0,0 +1,237 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from colorama import Fore, Style
+from phone_analyzer import PhoneAnalyzer
+
+# Column/field names looked up (in order) when reading CSV or JSONL input
+NUMBER_FIELDS = ("phone", "phone_number", "number", "msisdn")
+
+RESULT_FIELDS = [
+    "input", "is_valid", "reason", "international", "national", "e164",
+    "region", "region_code", "country_code", "carrier", "timezone", "number_type", "error"
+]
+
+
+def analyze_number(phone_number):
+    """Run the PhoneAnalyzer checks for one number (a string or PhoneRecord) and return a flat dict"""
+    result = {"input": getattr(phone_number, "raw", phone_number)}
+    try:
+        analyzer = PhoneAnalyzer(phone_number)
+    except ValueError as e:
+        result.update({"is_valid": False, "reason": str(e), "error": str(e)})
+        return result
+
+    validation = analyzer.validate_number()
+    basic_info = analyzer.get_basic_info()
+    result.update({
+        "is_valid": validation["is_valid"],
+        "reason": validation["reason"],
+        "international": basic_info["formatted"]["international"],
+        "national": basic_info["formatted"]["national"],
+        "e164": basic_info["formatted"]["e164"],
+        "region": basic_info["region"],
+        "region_code": analyzer.get_region_code(),
+        # The calling code is known even for invalid numbers, which usually have no region code
+        "country_code": analyzer.parsed_number.country_code,
+        "carrier": basic_info["carrier"],
+        "timezone": list(basic_info["timezone"]),
+        "number_type": analyzer.get_number_type(),
+        "error": None
+    })
+    return result
+
+
+def _analyze_chunk(numbers):
+    """Process-pool task: analyze a chunk of numbers in one round trip"""
+    return [analyze_number(number) for number in numbers]
+
+
+def read_numbers(path):
+    """
+    Stream phone numbers from a CSV, JSONL or plain text file ("-" for stdin).
+    CSV files use the first matching column in NUMBER_FIELDS, or the first
+    column if there is no recognised header. JSONL lines may be objects or
+    bare strings. Blank lines are skipped.
+    """
+    handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            yield from _read_csv_numbers(handle)
+        elif extension in (".jsonl", ".ndjson"):
+            yield from _read_jsonl_numbers(handle)
+        else:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield line
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def _read_csv_numbers(handle):
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if header is None:
+        return
+    column = 0
+    lowered = [name.strip().lower() for name in header]
+    for field in NUMBER_FIELDS:
+        if field in lowered:
+            column = lowered.index(field)
+            break
+    else:
+        # No recognised header, so the first row is data
+        if header and header[0].strip():
+            yield header[0].strip()
+    for row in reader:
+        if len(row) > column and row[column].strip():
+            yield row[column].strip()
+
+
+def _read_jsonl_numbers(handle):
+    for line in handle:
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if isinstance(record, dict):
+            for field in NUMBER_FIELDS:
+                if record.get(field):
+                    yield str(record[field])
+                    break
+        elif record:
+            yield str(record)
+
+
+class ResultWriter:
+    """Write analysis results to JSONL or CSV as they arrive"""
+
+    def __init__(self, path, output_format=None):
+        self.path = path
+        if output_format is None:
+            output_format = "csv" if path.lower().endswith(".csv") else "jsonl"
+        self.output_format = output_format
+        self.handle = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        self.csv_writer = None
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(self.handle, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            self.csv_writer.writeheader()
+
+    def write(self, result):
+        if self.csv_writer:
+            row = dict(result)
+            row["timezone"] = ";".join(row.get("timezone") or [])
+            self.csv_writer.writerow(row)
+        else:
+            self.handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.handle.flush()
+        if self.handle is not sys.stdout:
+            self.handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+
+def read_results(path):
+    """
+    Stream result dicts back from a ResultWriter file (JSONL or CSV). CSV
+    rows are converted back to the JSONL shapes: booleans, timezone lists
+    and None for empty fields.
+    """
+    handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        if path.lower().endswith(".csv"):
+            for row in csv.DictReader(handle):
+                row = {key: (value if value != "" else None) for key, value in row.items()}
+                row["is_valid"] = row.get("is_valid") == "True"
+                row["timezone"] = row["timezone"].split(";") if row.get("timezone") else []
+                if row.get("country_code"):
+                    row["country_code"] = int(row["country_code"])
+                yield row
+        else:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+class BatchPhoneAnalyzer:
+    """
+    Analyze large phone number lists across all cores.
+    Numbers are sent to a process pool in chunks and at most max_pending
+    chunks are in flight at once, so memory stays bounded no matter how long
+    the input is. Results are yielded in completion order, not input order.
+    """
+
+    def __init__(self, workers=None, chunk_size=500, max_pending=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or self.workers * 2
+
+    def _chunks(self, numbers):
+        chunk = []
+        for number in numbers:
+            chunk.append(number)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def iter_results(self, numbers):
+        """Yield result dicts for an iterable of numbers as chunks complete"""
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            for chunk in self._chunks(numbers):
+                if len(pending) >= self.max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from future.result()
+                pending.add(executor.submit(_analyze_chunk, chunk))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+
+    def analyze_file(self, input_path, output_path, output_format=None):
+        """Stream input_path through the pool into output_path, returning counts"""
+        summary = {"total": 0, "valid": 0, "invalid": 0}
+        with ResultWriter(output_path, output_format) as writer:
+            for result in self.iter_results(read_numbers(input_path)):
+                writer.write(result)
+                summary["total"] += 1
+                summary["valid" if result["is_valid"] else "invalid"] += 1
+        return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch phone number analysis")
+    parser.add_argument("input", help="CSV, JSONL or text file of phone numbers ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="Output file (.jsonl or .csv, '-' for stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Numbers per worker task")
+    args = parser.parse_args(argv)
+
+    batch = BatchPhoneAnalyzer(workers=args.workers, chunk_size=args.chunk_size)
+    summary = batch.analyze_file(args.input, args.output)
+    print(f"{Fore.GREEN}Analyzed {summary['total']} numbers "
+          f"({summary['valid']} valid, {summary['invalid']} invalid){Style.RESET_ALL}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
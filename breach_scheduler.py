@@ -0,0 +1,81 @@
+import asyncio
+import aiohttp
+from async_runtime import TokenBucket, get_background_loop, bounded_map, as_async_iter
+from config import HIBP_RATE_LIMIT_RPM
+from osint_analyzer import OSINTAnalyzer
+from osint_results import BreachResult
+
+# Requests per minute allowed by each HIBP subscription tier
+HIBP_TIER_RPM = {
+    1: 10,
+    2: 50,
+    3: 100,
+    4: 500,
+    5: 1000
+}
+
+def _retry_after(response, default=2.0):
+    try:
+        return max(float(response.headers.get("Retry-After", default)), 0.1)
+    except (TypeError, ValueError):
+        return default
+
+
+class BulkBreachChecker:
+    """
+    Check a stream of emails against HIBP without tripping its rate limit.
+    Requests are paced by a token bucket sized for the key's tier, 429
+    responses honor Retry-After and are retried, and addresses that differ
+    only in case are checked once. Results are produced as they complete.
+    """
+
+    def __init__(self, analyzer=None, rate_per_minute=None, tier=None, concurrency=5, max_retries=5):
+        self.analyzer = analyzer or OSINTAnalyzer()
+        if rate_per_minute is None:
+            rate_per_minute = HIBP_TIER_RPM[tier] if tier else HIBP_RATE_LIMIT_RPM
+        self.rate_per_minute = rate_per_minute
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+
+    async def _check_one(self, bucket, email_address):
+        for attempt in range(self.max_retries + 1):
+            await bucket.acquire()
+            try:
+                response = await self.analyzer.request_breaches(email_address)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return BreachResult(email_address, f"Network error during HIBP API call: {e}")
+            if response.status != 429:
+                try:
+                    return self.analyzer.breach_result_from_response(email_address, response)
+                except Exception as e:
+                    return BreachResult(email_address, f"An unexpected error occurred during breach check: {e}")
+            bucket.pause(_retry_after(response))
+        return BreachResult(email_address, f"Error checking breaches: rate limited after {self.max_retries} retries")
+
+    async def check_many(self, emails):
+        """Async generator yielding (email, BreachResult) pairs as each check completes"""
+        if not self.analyzer.hibp_configured():
+            raise ValueError("HIBP API key not configured. Please add your API key to config.py to use this feature.")
+
+        bucket = TokenBucket(self.rate_per_minute / 60.0)
+
+        async def check(email_address):
+            return email_address, await self._check_one(bucket, email_address)
+
+        async for item in bounded_map(check, _unique_emails(emails), self.concurrency):
+            yield item
+
+    def iter_check(self, emails):
+        """Blocking generator over check_many() for callers outside an event loop"""
+        return get_background_loop().iterate(self.check_many(emails))
+
+
+async def _unique_emails(emails):
+    """Strip blanks and drop addresses already seen, ignoring case"""
+    seen = set()
+    async for email_address in as_async_iter(emails):
+        email_address = email_address.strip()
+        key = email_address.lower()
+        if email_address and key not in seen:
+            seen.add(key)
+            yield email_address
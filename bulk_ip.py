@@ -0,0 +1,171 @@
+import asyncio
+import ipaddress
+from async_runtime import get_background_loop, bounded_map
+from whois_cache import ip_block
+from config import BULK_IP_CONCURRENCY, BULK_IP_WHOIS_CONCURRENCY, BULK_IP_MAX_HOSTS
+
+
+def expand_targets(targets, max_hosts=BULK_IP_MAX_HOSTS):
+    """
+    Expand IP addresses and CIDR ranges into (ip, error) pairs, lazily and
+    without duplicates. Invalid or oversized entries yield (target, error).
+    """
+    seen = set()
+    for target in targets:
+        target = str(target).strip()
+        if not target or target.startswith("#"):
+            continue
+        try:
+            if "/" in target:
+                network = ipaddress.ip_network(target, strict=False)
+                if network.num_addresses > max_hosts:
+                    yield target, f"Range {network} has {network.num_addresses} addresses (limit {max_hosts})"
+                    continue
+                # /31, /32 and single-address IPv6 networks have no separate host range
+                hosts = network.hosts() if network.num_addresses > 2 else iter(network)
+            else:
+                hosts = [ipaddress.ip_address(target)]
+        except ValueError as e:
+            yield target, f"Invalid IP address or range: {e}"
+            continue
+        for host in hosts:
+            ip = str(host)
+            if ip not in seen:
+                seen.add(ip)
+                yield ip, None
+
+
+class WhoisBlockIndex:
+    """
+    Index of WHOIS allocation blocks. Once one address in a block has been
+    looked up, every other address in it is answered from here. Blocks are
+    hashed by network address under their prefix length, so a lookup costs
+    one dict probe per distinct prefix length (a handful in practice) however
+    many blocks are indexed, and adding a block is a single insert.
+    """
+
+    def __init__(self):
+        self._tables = {}
+        # Prefix lengths in use per IP version, longest (most specific) first
+        self._prefixes = {4: [], 6: []}
+
+    def add(self, block, answer):
+        network = ipaddress.ip_network(block)
+        table = self._tables.get((network.version, network.prefixlen))
+        if table is None:
+            table = self._tables[(network.version, network.prefixlen)] = {}
+            prefixes = self._prefixes[network.version]
+            prefixes.append(network.prefixlen)
+            prefixes.sort(reverse=True)
+        table[int(network.network_address) >> (network.max_prefixlen - network.prefixlen)] = answer
+
+    def find(self, ip):
+        """The answer for the most specific indexed block containing ip, or None"""
+        address = ipaddress.ip_address(ip)
+        value = int(address)
+        for prefixlen in self._prefixes[address.version]:
+            answer = self._tables[(address.version, prefixlen)].get(value >> (address.max_prefixlen - prefixlen))
+            if answer is not None:
+                return answer
+        return None
+
+    def __len__(self):
+        return sum(len(table) for table in self._tables.values())
+
+
+class BulkIPAnalyzer:
+    """
+    Geolocates and WHOISes many IPs at once. Up to `concurrency` addresses are
+    in flight, geolocation and WHOIS for one address run side by side, and at
+    most `whois_concurrency` WHOIS queries hit the registries at a time. One
+    WHOIS answer is reused for every address in the block it describes.
+    """
+
+    def __init__(self, analyzer=None, concurrency=BULK_IP_CONCURRENCY,
+                 whois_concurrency=BULK_IP_WHOIS_CONCURRENCY, max_hosts=BULK_IP_MAX_HOSTS,
+                 geolocate=True, whois=True, use_api=False):
+        if analyzer is None:
+            from osint_analyzer import OSINTAnalyzer
+            analyzer = OSINTAnalyzer()
+        self.analyzer = analyzer
+        self.concurrency = concurrency
+        self.whois_concurrency = whois_concurrency
+        self.max_hosts = max_hosts
+        self.geolocate = geolocate
+        self.whois = whois
+        self.use_api = use_api
+
+    async def _whois(self, ip, index, pending, semaphore):
+        address = ipaddress.ip_address(ip)
+        key = str(ip_block(ip))
+        awaited = None
+        while True:
+            answer = index.find(ip)
+            if answer is not None:
+                return {"block": answer["block"], "summary": answer["summary"], "error": None}
+            future = pending.get(key)
+            if future is None or future is awaited:
+                break
+            # Another address in this /24 (or /48) is already being looked up;
+            # wait for it rather than sending a second query. shield() keeps a
+            # cancelled waiter from cancelling the shared lookup.
+            awaited = future
+            answer, error = await asyncio.shield(future)
+            if error:
+                return {"block": None, "summary": None, "error": error}
+            if answer is None or answer["block"] is None or address not in ipaddress.ip_network(answer["block"]):
+                # The lookup was cancelled, or the registry's block does not cover this address
+                break
+
+        future = asyncio.get_running_loop().create_future()
+        pending[key] = future
+        answer, error = None, None
+        try:
+            async with semaphore:
+                answer = await asyncio.get_running_loop().run_in_executor(None, self.analyzer.whois_ip, ip)
+            if answer["block"]:
+                index.add(answer["block"], answer)
+        except Exception as e:
+            error = f"Error performing IP WHOIS lookup: {e}"
+        finally:
+            if pending.get(key) is future:
+                del pending[key]
+            if not future.done():
+                # (None, None) after a cancellation sends waiters to their own query
+                future.set_result((answer, error))
+        if error:
+            return {"block": None, "summary": None, "error": error}
+        return {"block": answer["block"], "summary": answer["summary"], "error": None}
+
+    async def _analyze_one(self, target, index, pending, semaphore):
+        ip, error = target
+        if error:
+            return {"ip": ip, "geolocation": None, "whois": None, "error": error}
+        geo, whois_result = await asyncio.gather(
+            self.analyzer.geolocate_ip_async(ip, self.use_api) if self.geolocate else _none(),
+            self._whois(ip, index, pending, semaphore) if self.whois else _none()
+        )
+        return {"ip": ip, "geolocation": geo, "whois": whois_result, "error": None}
+
+    async def analyze(self, targets):
+        """
+        Async generator yielding one result dict per address, in completion
+        order: {"ip", "geolocation", "whois": {"block", "summary", "error"}, "error"}
+        """
+        index = WhoisBlockIndex()
+        # In-flight WHOIS lookups by provisional /24 or /48, shared by every
+        # address in it until the registry's real block is known
+        pending = {}
+        semaphore = asyncio.Semaphore(self.whois_concurrency)
+        expanded = expand_targets(targets, self.max_hosts)
+        async for result in bounded_map(lambda target: self._analyze_one(target, index, pending, semaphore),
+                                        expanded, self.concurrency):
+            yield result
+
+    def iter_analyze(self, targets):
+        """Run analyze() on the background loop and yield results to a sync caller"""
+        return get_background_loop().iterate(self.analyze(targets))
+
+
+async def _none():
+    return None
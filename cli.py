@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import ipaddress
+import os
+import re
+import sys
+from analysis_service import AnalysisService, ANALYZER_TARGETS, RESULT_KINDS
+from async_runtime import TokenBucket, bounded_map
+from batch_analyzer import read_numbers
+from config import SERVICE_ANALYZER_LIMITS
+from osint_results import AnalysisResult, ResultExporter
+
+# No tkinter anywhere on this path: the CLI has to run on headless servers
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+PHONE_PATTERN = re.compile(r"^\+?[\d\s().-]+$")
+
+# Which kind of target each analyzer accepts
+ANALYZER_INPUTS = {
+    "phone": "phone",
+    "email": "email",
+    "breach": "email",
+    "whois": "email",
+    "ip": "ip",
+    "username": "username",
+}
+
+# Analyzer used for each kind of target when --analyzers is "auto"
+AUTO_ANALYZERS = {
+    "phone": "phone",
+    "email": "breach",
+    "ip": "ip",
+    "username": "username",
+}
+
+
+def target_kind(target):
+    """Classify an input line as "ip", "email", "phone" or "username" """
+    try:
+        ipaddress.ip_address(target)
+        return "ip"
+    except ValueError:
+        pass
+    if EMAIL_PATTERN.match(target):
+        return "email"
+    # Short or malformed numbers still go to the phone analyzer, which reports why they are invalid
+    if PHONE_PATTERN.match(target) and any(char.isdigit() for char in target):
+        return "phone"
+    return "username"
+
+
+def plan(targets, analyzers):
+    """
+    Yield (analyzer, target, error) for every analyzer that accepts each
+    target. A target no selected analyzer accepts is yielded once, for the
+    first analyzer, with an error explaining why it was skipped.
+    """
+    for target in targets:
+        kind = target_kind(target)
+        if analyzers == ["auto"]:
+            yield AUTO_ANALYZERS[kind], target, None
+            continue
+        accepted = False
+        for name in analyzers:
+            accepts = ANALYZER_INPUTS[name]
+            # A domain is fine for whois even though it does not look like an email
+            if accepts == kind or (name == "whois" and kind == "username" and "." in target):
+                accepted = True
+                yield name, target, None
+        if not accepted:
+            yield analyzers[0], target, f"no selected analyzer accepts a {kind} target"
+
+
+def read_targets(paths):
+    """Stream targets from text, CSV or JSONL files ('-' for stdin), skipping blanks"""
+    for path in paths:
+        for target in read_numbers(path):
+            target = target.strip()
+            if target:
+                yield target
+
+
+def count_lookups(paths, analyzers):
+    """Count the planned lookups for the progress bar's ETA; None when reading stdin"""
+    if any(path == "-" or not os.path.isfile(path) for path in paths):
+        return None
+    return sum(1 for _ in plan(read_targets(paths), analyzers))
+
+
+def to_result(name, result):
+    """Rebuild a result dict as an AnalysisResult; bare {"query", "error"} records get the analyzer's kind"""
+    return AnalysisResult.from_dict(dict({"kind": RESULT_KINDS[name]}, **result))
+
+
+async def run(args, service=None):
+    """Run the planned lookups and return {"total", "errors"}"""
+    from lazy_deps import load_tqdm
+    analyzers = [name.strip() for name in args.analyzers.split(",") if name.strip()]
+    if service is None:
+        # --jobs caps everything in flight; per-analyzer caps still apply under it
+        limits = {name: min(limit, args.jobs) for name, limit in SERVICE_ANALYZER_LIMITS.items()}
+        service = AnalysisService(limits=limits, max_pending=max(args.jobs, 1))
+    bucket = TokenBucket(args.rate, capacity=max(1, int(args.rate))) if args.rate else None
+    total = None if args.no_progress else count_lookups(args.inputs, analyzers)
+    tqdm = load_tqdm()
+    progress = tqdm.tqdm(total=total, unit="lookup", disable=args.no_progress, file=sys.stderr, dynamic_ncols=True)
+    writer = ResultExporter(args.output, args.format)
+    summary = {"total": 0, "errors": 0}
+
+    async def lookup(item):
+        name, target, error = item
+        if error:
+            return to_result(name, {"query": target, "error": error})
+        if bucket is not None:
+            await bucket.acquire()
+        try:
+            result = await service.analyze(name, target, refresh=args.refresh, wait=True)
+        except Exception as e:
+            result = {"query": target, "error": str(e)}
+        return to_result(name, result)
+
+    try:
+        async for result in bounded_map(lookup, plan(read_targets(args.inputs), analyzers), args.jobs):
+            writer.write(result)
+            summary["total"] += 1
+            if result.error:
+                summary["errors"] += 1
+            progress.update(1)
+    finally:
+        progress.close()
+        writer.close()
+        await _close_clients()
+    return summary
+
+
+async def _close_clients():
+    """Close the HTTP sessions this run's loop opened (only for clients that were used)"""
+    for module, getter in (("http_client", "get_http_client"), ("holehe_runner", "get_holehe_runner"),
+                           ("social_scanner", "get_social_scanner")):
+        if module in sys.modules:
+            await getattr(sys.modules[module], getter)().close()
+
+
+def main(argv=None):
+    analyzer_help = "; ".join(f"{name}: {what}" for name, what in ANALYZER_TARGETS.items())
+    parser = argparse.ArgumentParser(
+        description="Analyze phone numbers, emails, usernames or IPs from files or stdin without the GUI.",
+        epilog=f"Analyzers - {analyzer_help}. 'auto' picks one per target: phone numbers -> phone, "
+               "emails -> breach, IPs -> ip, anything else -> username."
+    )
+    parser.add_argument("inputs", nargs="*", default=["-"], help="Text, CSV or JSONL files of targets (default: stdin)")
+    parser.add_argument("-a", "--analyzers", default="auto",
+                        help="Comma separated analyzers to run on each matching target (default: auto)")
+    parser.add_argument("-j", "--jobs", type=int, default=8, help="Lookups in flight at once (default: 8)")
+    parser.add_argument("-r", "--rate", type=float, default=None, help="Maximum lookups started per second")
+    parser.add_argument("-o", "--output", default="-", help="Output file (.jsonl or .csv, '-' for stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default=None, help="Output format (default: by extension)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached results and look everything up again")
+    parser.add_argument("--no-progress", action="store_true", help="Do not show the progress bar")
+    args = parser.parse_args(argv)
+
+    analyzers = [name.strip() for name in args.analyzers.split(",") if name.strip()]
+    unknown = [name for name in analyzers if name != "auto" and name not in ANALYZER_INPUTS]
+    if unknown or not analyzers or ("auto" in analyzers and len(analyzers) > 1):
+        parser.error(f"--analyzers takes 'auto' or names from: {', '.join(ANALYZER_INPUTS)}")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+
+    summary = asyncio.run(run(args))
+    print(f"Completed {summary['total']} lookup(s), {summary['errors']} with errors.", file=sys.stderr)
+    return 1 if summary["total"] and summary["errors"] == summary["total"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
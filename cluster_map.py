@@ -0,0 +1,183 @@
+import argparse
+import collections
+import html
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import phonenumbers
+from config import OPEN_CAGE_API_KEY
+from region_table import get_region_table
+
+# Coordinates are rounded to this many decimals (about 1 m) before points at
+# the same spot are merged into one weighted row
+COORDINATE_PRECISION = 5
+
+HEATMAP_PRECISION = 3
+
+# Leaflet callback turning one data row [lat, lng, weight, label] into a marker
+_MARKER_CALLBACK = """function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {weight: row[2]});
+    marker.bindPopup(row[3]);
+    return marker;
+}"""
+
+# Cluster bubbles show the number of phone numbers, not the number of markers
+_CLUSTER_ICON = """function (cluster) {
+    var total = 0;
+    cluster.getAllChildMarkers().forEach(function (marker) { total += marker.options.weight; });
+    var size = total < 100 ? "small" : (total < 1000 ? "medium" : "large");
+    return L.divIcon({
+        html: "<div><span>" + total + "</span></div>",
+        className: "marker-cluster marker-cluster-" + size,
+        iconSize: new L.Point(40, 40)
+    });
+}"""
+
+
+def aggregate_points(points, precision=COORDINATE_PRECISION):
+    """
+    Merge (lat, lng, label[, weight]) points at the same rounded coordinate.
+    Returns compact rows [lat, lng, weight, label]; the label of the first
+    point at a spot is kept, HTML-escaped because it becomes a popup.
+    """
+    merged = collections.OrderedDict()
+    for point in points:
+        lat, lng, label = point[0], point[1], point[2]
+        weight = point[3] if len(point) > 3 else 1
+        key = (round(lat, precision), round(lng, precision))
+        row = merged.get(key)
+        if row is None:
+            merged[key] = [key[0], key[1], weight, html.escape(str(label)) if label is not None else ""]
+        else:
+            row[2] += weight
+    return list(merged.values())
+
+
+def build_cluster_map(points, map_file="cluster_map.html", cluster=True, heatmap=True):
+    """
+    Render many points on one map and save it to map_file.
+    Markers are created in the browser from one embedded JSON array
+    (FastMarkerCluster) and a HeatMap layer shows density, so the HTML grows
+    by one short array row per distinct location. Returns the number of
+    distinct locations plotted.
+    """
+    import folium
+    from folium.plugins import FastMarkerCluster, HeatMap
+
+    rows = aggregate_points(points)
+    if not rows:
+        raise ValueError("No points with coordinates to plot")
+
+    m = folium.Map(tiles="OpenStreetMap", prefer_canvas=True)
+    if cluster:
+        FastMarkerCluster(rows, callback=_MARKER_CALLBACK, icon_create_function=_CLUSTER_ICON,
+                          name="Numbers", chunkedLoading=True).add_to(m)
+    if heatmap:
+        # The density layer needs far less precision than the markers, so its
+        # copy of the data is coarser and merged again
+        heat = aggregate_points(((row[0], row[1], None, row[2]) for row in rows), HEATMAP_PRECISION)
+        max_weight = max(row[2] for row in heat)
+        HeatMap([[row[0], row[1], round(row[2] / max_weight, 3)] for row in heat], name="Density",
+                min_opacity=0.3, radius=18, show=not cluster).add_to(m)
+    if cluster and heatmap:
+        folium.LayerControl().add_to(m)
+
+    lats = [row[0] for row in rows]
+    lngs = [row[1] for row in rows]
+    m.fit_bounds([[min(lats), min(lngs)], [max(lats), max(lngs)]])
+    m.save(map_file)
+    return len(rows)
+
+
+def _coordinates(result):
+    try:
+        return float(result["latitude"]), float(result["longitude"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def points_from_results(results, geocoder=None, workers=8):
+    """
+    Turn batch results into weighted (lat, lng, label, count) points.
+    Rows that already carry latitude/longitude are used as they are; the rest
+    are grouped by region, resolved from the precomputed region table where
+    possible, and otherwise geocoded once per distinct region (through the
+    geocode cache), however many numbers share it.
+    """
+    counts = collections.Counter()
+    direct = []
+    for result in results:
+        coordinates = _coordinates(result)
+        if coordinates is not None:
+            direct.append((coordinates[0], coordinates[1], result.get("e164") or result.get("input") or ""))
+        elif result.get("is_valid") and result.get("region"):
+            counts[(result["region"], result.get("region_code") or "")] += 1
+
+    points = [(lat, lng, label, 1) for lat, lng, label in direct]
+
+    # Regions in the precomputed table need no geocoding at all
+    table = get_region_table()
+    for region in list(counts):
+        country_code = phonenumbers.country_code_for_region(region[1]) if region[1] else 0
+        location = table.lookup(country_code, region[0]) if country_code else None
+        if location is not None:
+            points.append((location[0], location[1], _region_label(region, counts[region]), counts[region]))
+            del counts[region]
+
+    if not counts:
+        return points
+    if geocoder is None:
+        geocoder = _default_geocoder()
+
+    def locate(region):
+        name, region_code = region
+        try:
+            found = geocoder.geocode(name, countrycode=region_code.lower(), limit=1) if region_code \
+                else geocoder.geocode(name, limit=1)
+        except Exception:
+            return None
+        if not found:
+            return None
+        return found[0]["geometry"]["lat"], found[0]["geometry"]["lng"]
+
+    regions = list(counts)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for region, location in zip(regions, executor.map(locate, regions)):
+            if location is not None:
+                points.append((location[0], location[1], _region_label(region, counts[region]), counts[region]))
+    return points
+
+
+def _region_label(region, count):
+    return f"{region[0]} ({region[1]}): {count} number{'s' if count != 1 else ''}"
+
+
+def _default_geocoder():
+    if not OPEN_CAGE_API_KEY or OPEN_CAGE_API_KEY == "YOUR_OPENCAGE_API_KEY":
+        raise ValueError("OpenCage API key not configured. Please add your API key to config.py to map batch results.")
+    from geocode_cache import CachedGeocoder, opencage_client
+    return CachedGeocoder(opencage_client(OPEN_CAGE_API_KEY))
+
+
+def build_batch_map(results_path, map_file="cluster_map.html", geocoder=None):
+    """Plot a batch_analyzer output file on one clustered map; returns the location count"""
+    from batch_analyzer import read_results
+    points = points_from_results(read_results(results_path), geocoder)
+    return build_cluster_map(points, map_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plot batch analysis results on one clustered map")
+    parser.add_argument("input", help="batch_analyzer output (.jsonl or .csv)")
+    parser.add_argument("-o", "--output", default="cluster_map.html", help="HTML file to write (default: cluster_map.html)")
+    args = parser.parse_args(argv)
+    try:
+        count = build_batch_map(args.input, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Plotted {count} locations to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
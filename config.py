@@ -1,3 +1,156 @@
 OPEN_CAGE_API_KEY = "76e73af5f4fc4409a1b613eada8c2b77"
 HIBP_API_KEY = "TEST_HIBP_API_KEY" # Placeholder for testing, replace with actual key for production
 GEOAPIFY_API_KEY = "4560d7ee1c154acb9d20bdb137ea4ba2"
+
+# Provider base URLs. Point all three at fake_providers.py (e.g.
+# "http://localhost:8766/api/v3", "http://localhost:8766/v1" and
+# "http://localhost:8766") to run without internet access.
+HIBP_API_URL = "https://haveibeenpwned.com/api/v3"
+GEOAPIFY_API_URL = "https://api.geoapify.com/v1"
+# The opencage library only accepts *.opencagedata.com, localhost or 0.0.0.0
+OPENCAGE_API_URL = "https://api.opencagedata.com"
+
+# Geocode cache (SQLite) used in front of the OpenCage API
+GEOCODE_CACHE_PATH = "geocode_cache.db"
+GEOCODE_CACHE_TTL = 30 * 24 * 3600  # seconds
+GEOCODE_CACHE_MAX_ENTRIES = 5000
+
+# Shared aiohttp connection pool for provider APIs (HIBP, Geoapify)
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 10
+HTTP_KEEPALIVE_TIMEOUT = 30  # seconds
+HTTP_TIMEOUT = 10  # seconds
+
+# HIBP requests per minute for the configured key (Pwned 1 tier = 10)
+HIBP_RATE_LIMIT_RPM = 10
+
+# Holehe scans: per-request timeout and max site checks in flight across all scans
+HOLEHE_TIMEOUT = 10  # seconds
+HOLEHE_MAX_CONCURRENCY = 60
+# Seconds one site module may take in total before it is reported as timed out
+HOLEHE_MODULE_TIMEOUT = 12
+# Named module selections for Holehe scans. Entries are module names (e.g.
+# "github"), holehe categories (e.g. "social_media") or other profiles;
+# a leading "-" removes modules. "all" is every module.
+HOLEHE_PROFILES = {
+    "quick": ["github", "twitter", "instagram", "spotify", "discord", "imgur", "pinterest",
+              "tumblr", "amazon", "ebay", "gravatar", "wordpress", "office365", "protonmail"],
+    "social": ["social_media", "medias", "music"],
+    "developer": ["programing", "software", "cms"],
+    # Skips the modules that send the target a password reset email
+    "silent": ["all", "-adobe", "-mail_ru", "-odnoklassniki", "-samsung"],
+}
+HOLEHE_DEFAULT_PROFILE = "all"
+
+# Import folium/holehe/whois/etc. in the background after the GUI window appears
+PREWARM_ON_STARTUP = True
+
+# Background job scheduler: worker threads and per-job-type concurrency caps
+JOB_MAX_WORKERS = 8
+JOB_TYPE_LIMITS = {
+    "phone": 4,
+    "holehe": 2,
+    "whois": 2,
+    "breach": 1,
+    "ip": 2,
+    "social": 1,
+    "port_scan": 1,
+    "map": 1,
+    "stats": 1
+}
+
+# GUI rendering: how often queued widget updates are drained and the per-frame time budget
+GUI_RENDER_INTERVAL_MS = 16
+GUI_RENDER_BUDGET_MS = 12
+GUI_RENDER_CHUNK_CHARS = 64 * 1024
+
+# WHOIS cache (SQLite), keyed by registrable domain or IP block
+WHOIS_CACHE_PATH = "whois_cache.db"
+WHOIS_CACHE_TTL = 7 * 24 * 3600  # seconds
+WHOIS_CACHE_MAX_ENTRIES = 50000
+
+# Bulk IP analysis: concurrent IPs, concurrent WHOIS queries and the largest
+# CIDR range that will be expanded
+BULK_IP_CONCURRENCY = 50
+BULK_IP_WHOIS_CONCURRENCY = 4
+BULK_IP_MAX_HOSTS = 65536
+
+# Optional offline IP geolocation database (.csv range file or .mmdb).
+# When set, IP lookups are answered locally and Geoapify is only used on misses
+IP_GEO_DB_PATH = None
+
+# Precomputed region description -> coordinates table used by the map before
+# falling back to OpenCage (build it with tools/build_region_table.py)
+REGION_TABLE_PATH = "data/region_coordinates.tsv.gz"
+
+# Built-in TCP connect port scanner: simultaneous connection attempts,
+# seconds to wait for each connect, default port set, and largest expansion
+PORT_SCAN_CONCURRENCY = 1000
+PORT_SCAN_TIMEOUT = 0.75
+PORT_SCAN_PORTS = "top100"
+PORT_SCAN_MAX_HOSTS = 4096
+
+# nmap integration, used instead of the built-in scanner when nmap is on the
+# PATH: extra arguments, seconds before a scan is stopped (keeping whatever it
+# found so far), and nmap processes allowed to run at once across all scans
+NMAP_ARGS = ("-T4",)
+NMAP_TIMEOUT = 300
+NMAP_MAX_PROCESSES = 4
+
+# Bulk social media username enumeration (socialscan): usernames checked at
+# once, and per-platform in-flight requests, requests per minute and
+# consecutive failures before a platform is skipped for the rest of a run.
+# SOCIAL_PLATFORM_RPM overrides the rate for individual platforms.
+SOCIAL_SCAN_CONCURRENCY = 20
+SOCIAL_PLATFORM_CONCURRENCY = 2
+SOCIAL_PLATFORM_DEFAULT_RPM = 60
+SOCIAL_PLATFORM_RPM = {
+    "Instagram": 20,
+    "Twitter": 30
+}
+SOCIAL_PLATFORM_MAX_FAILURES = 5
+
+# Analysis result cache: recent results in memory, all of them on disk
+# (SQLite), keyed by a digest of (analyzer, normalized target). Each
+# analyzer keeps its results for its own TTL in seconds; analyzers not
+# listed use RESULT_CACHE_DEFAULT_TTL.
+RESULT_CACHE_PATH = "result_cache.db"
+RESULT_CACHE_MEMORY_ENTRIES = 512
+RESULT_CACHE_MAX_ENTRIES = 20000
+RESULT_CACHE_DEFAULT_TTL = 24 * 3600
+RESULT_CACHE_TTLS = {
+    "phone": 7 * 24 * 3600,
+    "phone_info": 30 * 24 * 3600,
+    "phone_carrier": 7 * 24 * 3600,
+    "phone_validation": 30 * 24 * 3600,
+    "map_location": 30 * 24 * 3600,
+    "domain_whois": 7 * 24 * 3600,
+    "ip": 7 * 24 * 3600,
+    "breach": 24 * 3600,
+    "holehe": 24 * 3600,
+    "social_media": 24 * 3600
+}
+
+# Analysis service shared by the HTTP API and the command line: requests
+# admitted at once (the API answers 503 beyond this) and calls in flight per
+# analyzer
+SERVICE_MAX_PENDING = 256
+SERVICE_ANALYZER_LIMITS = {
+    "phone": 8,
+    "email": 2,
+    "breach": 1,
+    "ip": 8,
+    "whois": 4,
+    "username": 2
+}
+
+# Local HTTP API server (api_server.py)
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_MAX_BATCH = 10000
+
+# Fake provider server (fake_providers.py) for offline load tests
+FAKE_PROVIDERS_HOST = "localhost"
+FAKE_PROVIDERS_PORT = 8766
+# Recorded responses, one JSON file per distinct request
+FAKE_PROVIDERS_FIXTURES = "provider_fixtures"
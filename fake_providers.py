@@ -0,0 +1,286 @@
+"""
+A local stand-in for the HIBP, Geoapify and OpenCage APIs, for load-testing
+the analyzers without internet access.
+
+It serves the providers' real paths, so pointing HIBP_API_URL,
+GEOAPIFY_API_URL and OPENCAGE_API_URL in config.py at it is enough:
+
+    python fake_providers.py                                   # synthetic answers
+    python fake_providers.py --latency 0.2 --jitter 0.3 --rate-limit-rate 0.05 --error-rate 0.01
+    python fake_providers.py --mode record                     # proxy to the real APIs, save fixtures
+    python fake_providers.py --mode replay                     # answer from the saved fixtures
+
+holehe and socialscan talk to each site directly and cannot be pointed
+elsewhere; their runners take fake modules/queries in tests instead.
+"""
+import argparse
+import asyncio
+import collections
+import hashlib
+import json
+import os
+import random
+from aiohttp import web
+from config import FAKE_PROVIDERS_HOST, FAKE_PROVIDERS_PORT, FAKE_PROVIDERS_FIXTURES
+
+# Where record mode forwards each provider's requests
+UPSTREAMS = {
+    "hibp": "https://haveibeenpwned.com",
+    "geoapify": "https://api.geoapify.com",
+    "opencage": "https://api.opencagedata.com",
+}
+
+# Credentials are forwarded upstream but never saved or used in fixture keys
+SECRET_PARAMS = ("apiKey", "key")
+FORWARDED_HEADERS = ("hibp-api-key", "User-Agent", "Accept")
+
+MODES = ("synthetic", "record", "replay")
+
+
+def request_key(provider, path, query):
+    """Identify a request by provider, path and non-secret query parameters"""
+    params = sorted((name, value) for name, value in query.items() if name not in SECRET_PARAMS)
+    return f"{provider} {path}?" + "&".join(f"{name}={value}" for name, value in params)
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _seeded(text):
+    """A Random seeded from text, so synthetic answers are stable per request"""
+    return random.Random(int(_digest(text)[:16], 16))
+
+
+def synthetic_breaches(account):
+    rng = _seeded(account.lower())
+    # Roughly half the addresses have no breaches, which HIBP reports as 404
+    if rng.random() < 0.5:
+        return None
+    breaches = []
+    for index in range(rng.randint(1, 6)):
+        name = f"Breach{rng.randint(1, 500)}x{index}"
+        breaches.append({
+            "Name": name, "Title": name, "Domain": f"{name.lower()}.example",
+            "BreachDate": f"{rng.randint(2008, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "PwnCount": rng.randint(1000, 500000000),
+            "DataClasses": rng.sample(["Email addresses", "Passwords", "Usernames", "Phone numbers",
+                                       "IP addresses", "Names", "Dates of birth"], rng.randint(1, 4)),
+        })
+    return breaches
+
+
+def synthetic_ipinfo(ip):
+    rng = _seeded(ip)
+    place = rng.randint(1, 5000)
+    return {
+        "ip": ip,
+        "city": {"name": f"City {place}"},
+        "state": {"name": f"State {place % 300}"},
+        "country": {"name": f"Country {place % 200}", "iso_code": "ZZ"},
+        "location": {"latitude": round(rng.uniform(-60, 70), 4), "longitude": round(rng.uniform(-170, 170), 4)},
+    }
+
+
+def synthetic_geocode(query):
+    rng = _seeded(query.lower())
+    results = [{
+        "geometry": {"lat": round(rng.uniform(-60, 70), 6), "lng": round(rng.uniform(-170, 170), 6)},
+        "formatted": query,
+        "confidence": rng.randint(1, 10),
+        "components": {"_type": "city"},
+    }]
+    return {"results": results, "status": {"code": 200, "message": "OK"}, "total_results": len(results)}
+
+
+class FakeProviders:
+    """
+    Answers provider requests in one of three modes:
+    "synthetic" generates plausible, deterministic data per request;
+    "record" proxies to the real API and saves each answer as a fixture;
+    "replay" serves saved fixtures and answers 502 for anything unrecorded.
+    On top of any mode it can add latency and fail a fraction of requests
+    with 500 or with 429 plus Retry-After, like a throttled provider.
+    """
+
+    def __init__(self, mode="synthetic", fixtures=FAKE_PROVIDERS_FIXTURES, latency=0.0, jitter=0.0,
+                 error_rate=0.0, rate_limit_rate=0.0, retry_after=1, seed=None, upstreams=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.upstreams = dict(UPSTREAMS, **(upstreams or {}))
+        self.stats = collections.Counter()
+        self._random = random.Random(seed)
+        self._loaded = {}
+        self._session = None
+
+    def fixture_path(self, key):
+        return os.path.join(self.fixtures, key.split(" ", 1)[0], _digest(key)[:24] + ".json")
+
+    def load_fixture(self, key):
+        """The recorded {"key", "status", "headers", "body"} for key, or None"""
+        if key not in self._loaded:
+            try:
+                with open(self.fixture_path(key), encoding="utf-8") as handle:
+                    self._loaded[key] = json.load(handle)
+            except FileNotFoundError:
+                return None
+        return self._loaded[key]
+
+    def save_fixture(self, key, status, headers, body):
+        path = self.fixture_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fixture = {"key": key, "status": status, "headers": headers, "body": body}
+        # Write then rename so a concurrent replay never reads half a file
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(fixture, handle, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+        self._loaded[key] = fixture
+
+    async def _fault(self):
+        """Sleep for the configured latency; return an injected failure response or None"""
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return web.json_response({"statusCode": 429, "message": "Rate limit exceeded (injected)"}, status=429,
+                                     headers={"Retry-After": str(self.retry_after)})
+        if roll < self.rate_limit_rate + self.error_rate:
+            return web.json_response({"statusCode": 500, "message": "Internal error (injected)"}, status=500)
+        return None
+
+    async def _record(self, provider, request, key):
+        import aiohttp
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+        url = self.upstreams[provider] + request.path
+        async with self._session.get(url, params=request.query, headers=headers) as upstream:
+            body = await upstream.text()
+            kept = {name: upstream.headers[name] for name in ("Content-Type", "Retry-After") if name in upstream.headers}
+        # Throttled and failed answers are passed through but not kept as fixtures
+        if upstream.status < 500 and upstream.status != 429:
+            self.save_fixture(key, upstream.status, kept, body)
+        return web.Response(status=upstream.status, text=body, headers=kept)
+
+    async def respond(self, provider, request, synthesize):
+        """Answer one request; synthesize() returns (status, JSON body) for synthetic mode"""
+        key = request_key(provider, request.path, request.query)
+        self.stats[f"{provider}.requests"] += 1
+        response = await self._fault()
+        if response is None:
+            if self.mode == "record":
+                response = await self._record(provider, request, key)
+            elif self.mode == "replay":
+                fixture = self.load_fixture(key)
+                if fixture is None:
+                    response = web.json_response({"message": f"No recorded response for {key}"}, status=502)
+                else:
+                    response = web.Response(status=fixture["status"], text=fixture["body"],
+                                            headers=fixture["headers"])
+            else:
+                status, body = synthesize()
+                response = web.json_response(body, status=status)
+        self.stats[f"{provider}.{response.status}"] += 1
+        return response
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+# aiohttp before 3.9 has no AppKey and takes plain string keys
+PROVIDERS_KEY = web.AppKey("providers", FakeProviders) if hasattr(web, "AppKey") else "providers"
+
+
+async def hibp_breached_account(request):
+    """GET /api/v3/breachedaccount/{account}"""
+    def synthesize():
+        if not request.headers.get("hibp-api-key"):
+            return 401, {"statusCode": 401, "message": "Access denied due to missing hibp-api-key."}
+        breaches = synthetic_breaches(request.match_info["account"])
+        if breaches is None:
+            return 404, {"statusCode": 404, "message": "Not found"}
+        return 200, breaches
+    return await request.app[PROVIDERS_KEY].respond("hibp", request, synthesize)
+
+
+async def geoapify_ipinfo(request):
+    """GET /v1/ipinfo?ip=...&apiKey=..."""
+    def synthesize():
+        if not request.query.get("apiKey"):
+            return 401, {"statusCode": 401, "message": "Invalid apiKey"}
+        ip = request.query.get("ip") or request.remote or "127.0.0.1"
+        return 200, synthetic_ipinfo(ip)
+    return await request.app[PROVIDERS_KEY].respond("geoapify", request, synthesize)
+
+
+async def opencage_geocode(request):
+    """GET /geocode/v1/json?q=...&key=..."""
+    def synthesize():
+        if not request.query.get("key"):
+            return 401, {"status": {"code": 401, "message": "missing API key"}, "results": []}
+        if not request.query.get("q"):
+            return 400, {"status": {"code": 400, "message": "missing query"}, "results": []}
+        return 200, synthetic_geocode(request.query["q"])
+    return await request.app[PROVIDERS_KEY].respond("opencage", request, synthesize)
+
+
+async def stats(request):
+    providers = request.app[PROVIDERS_KEY]
+    return web.json_response({"mode": providers.mode, "counts": dict(sorted(providers.stats.items()))})
+
+
+def create_app(providers=None):
+    app = web.Application()
+    app[PROVIDERS_KEY] = providers or FakeProviders()
+    app.router.add_get("/api/v3/breachedaccount/{account}", hibp_breached_account)
+    app.router.add_get("/v1/ipinfo", geoapify_ipinfo)
+    app.router.add_get("/geocode/v1/json", opencage_geocode)
+    app.router.add_get("/stats", stats)
+
+    async def close_providers(app):
+        await app[PROVIDERS_KEY].close()
+    app.on_cleanup.append(close_providers)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve fake HIBP, Geoapify and OpenCage APIs for offline testing.")
+    parser.add_argument("--host", default=FAKE_PROVIDERS_HOST, help=f"Address to listen on (default {FAKE_PROVIDERS_HOST})")
+    parser.add_argument("--port", type=int, default=FAKE_PROVIDERS_PORT,
+                        help=f"Port to listen on (default {FAKE_PROVIDERS_PORT})")
+    parser.add_argument("--mode", choices=MODES, default="synthetic", help="How requests are answered (default synthetic)")
+    parser.add_argument("--fixtures", default=FAKE_PROVIDERS_FIXTURES, help="Directory for recorded responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many more seconds, chosen at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with each 429")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and failure injection")
+    args = parser.parse_args(argv)
+    for name in ("latency", "jitter"):
+        if getattr(args, name) < 0:
+            parser.error(f"--{name} must not be negative")
+    if not 0 <= args.error_rate + args.rate_limit_rate <= 1 or min(args.error_rate, args.rate_limit_rate) < 0:
+        parser.error("--error-rate and --rate-limit-rate must be fractions adding up to at most 1")
+
+    providers = FakeProviders(args.mode, args.fixtures, args.latency, args.jitter, args.error_rate,
+                              args.rate_limit_rate, args.retry_after, args.seed)
+    base = f"http://{args.host}:{args.port}"
+    print(f"Set HIBP_API_URL = \"{base}/api/v3\", GEOAPIFY_API_URL = \"{base}/v1\" "
+          f"and OPENCAGE_API_URL = \"{base}\" in config.py to use this server.")
+    web.run_app(create_app(providers), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import json
+import re
+import threading
+from urllib.parse import urlsplit
+from sqlite_cache import SQLiteCache
+from config import GEOCODE_CACHE_PATH, GEOCODE_CACHE_TTL, GEOCODE_CACHE_MAX_ENTRIES, OPENCAGE_API_URL
+
+
+def normalize_query(query):
+    """Normalize a geocoding query so equivalent region strings share a cache entry"""
+    query = re.sub(r"\s+", " ", str(query)).strip().strip(",").strip()
+    return query.lower()
+
+
+class GeocodeCache(SQLiteCache):
+    """OpenCage results keyed by normalized query, with TTL and LRU limits"""
+
+    def __init__(self, path=GEOCODE_CACHE_PATH, ttl=GEOCODE_CACHE_TTL, max_entries=GEOCODE_CACHE_MAX_ENTRIES):
+        super().__init__(path, "geocode_results", ttl, max_entries)
+        self._migrate_legacy_table()
+
+    def _migrate_legacy_table(self):
+        """Move entries from the `geocode` table older versions wrote into this one, then drop it"""
+        with self._lock:
+            legacy = self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'geocode'"
+            ).fetchone()
+            if legacy is None:
+                return
+            self._conn.execute(
+                f"INSERT OR IGNORE INTO {self.table} (key, value, created, accessed)"
+                " SELECT query, results, created, accessed FROM geocode"
+            )
+            self._conn.execute("DROP TABLE geocode")
+            self._conn.commit()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_geocode_cache():
+    """Return the process-wide GeocodeCache, opening it on first use"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = GeocodeCache()
+        return _shared_cache
+
+
+def opencage_client(api_key, api_url=OPENCAGE_API_URL):
+    """An OpenCageGeocode talking to api_url (config.OPENCAGE_API_URL by default)"""
+    from opencage.geocoder import OpenCageGeocode
+    parts = urlsplit(api_url)
+    return OpenCageGeocode(api_key, protocol=parts.scheme or "https", domain=parts.netloc)
+
+
+class CachedGeocoder:
+    """
+    Drop-in wrapper around OpenCageGeocode that answers repeated queries
+    from the geocode cache instead of spending API quota.
+    """
+
+    def __init__(self, geocoder, cache=None):
+        self.geocoder = geocoder
+        self.cache = cache if cache is not None else get_geocode_cache()
+
+    def geocode(self, query, **kwargs):
+        key = normalize_query(query)
+        if kwargs:
+            key += "|" + json.dumps(kwargs, sort_keys=True)
+        results = self.cache.get(key)
+        if results is None:
+            results = self.geocoder.geocode(query, **kwargs)
+            self.cache.set(key, results)
+        return results
+
+    def __getattr__(self, name):
+        return getattr(self.geocoder, name)
@@ -0,0 +1,128 @@
+import collections
+import threading
+import time
+import tkinter as tk
+from config import GUI_RENDER_INTERVAL_MS, GUI_RENDER_BUDGET_MS, GUI_RENDER_CHUNK_CHARS
+
+_INSERT = "insert"
+_CLEAR = "clear"
+_SET = "set"
+_CALL = "call"
+
+
+class TkRenderQueue:
+    """
+    Thread-safe bridge from worker threads to Tk widgets.
+    Workers only enqueue operations; the Tk main loop drains them every
+    `interval_ms` via root.after, spending at most `budget_ms` per frame.
+    Consecutive inserts into the same widget are merged into one insert and
+    consecutive sets of the same variable collapse to the last value, so a
+    large result costs a handful of redraws instead of one per line.
+    """
+
+    def __init__(self, root, interval_ms=GUI_RENDER_INTERVAL_MS, budget_ms=GUI_RENDER_BUDGET_MS,
+                 chunk_chars=GUI_RENDER_CHUNK_CHARS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget = budget_ms / 1000.0
+        self.chunk_chars = chunk_chars
+        self._ops = collections.deque()
+        self._lock = threading.Lock()
+        self._draining = False
+        self._started = False
+
+    def start(self):
+        if not self._started:
+            self._started = True
+            self.root.after(self.interval_ms, self._tick)
+
+    def insert(self, widget, text):
+        """Append text at the end of a Text widget"""
+        text = str(text)
+        with self._lock:
+            # Very large outputs are split so one insert never blows the frame budget
+            for start in range(0, len(text), self.chunk_chars):
+                self._ops.append((_INSERT, widget, text[start:start + self.chunk_chars]))
+
+    def clear(self, widget):
+        """Delete the contents of a Text widget"""
+        with self._lock:
+            self._ops.append((_CLEAR, widget, None))
+
+    def set(self, variable, value):
+        """Set a Tk variable such as the status bar StringVar"""
+        with self._lock:
+            self._ops.append((_SET, variable, value))
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the Tk main thread"""
+        with self._lock:
+            self._ops.append((_CALL, fn, (args, kwargs)))
+
+    def _take(self, max_ops=5000):
+        """Pop queued operations, stopping after about chunk_chars of inserted text"""
+        ops = []
+        chars = 0
+        with self._lock:
+            while self._ops and len(ops) < max_ops and chars < self.chunk_chars:
+                op = self._ops.popleft()
+                if op[0] == _INSERT:
+                    chars += len(op[2])
+                ops.append(op)
+        return ops
+
+    def _tick(self):
+        # A modal dialog opened by a _CALL runs a nested event loop; a tick
+        # fired from inside it must not drain or start a second after() chain
+        if self._draining:
+            return
+        self._draining = True
+        try:
+            self._drain()
+        finally:
+            self._draining = False
+            self.root.after(self.interval_ms, self._tick)
+
+    def _drain(self):
+        deadline = time.perf_counter() + self.budget
+        while time.perf_counter() < deadline:
+            ops = self._take()
+            if not ops:
+                return
+            self._apply(ops)
+
+    def _apply(self, ops):
+        # Inserts are buffered per widget and variable sets keep only the last
+        # value; both are flushed before any call so ordering stays intact
+        buffers = {}
+        values = {}
+
+        def flush():
+            for widget, parts in buffers.items():
+                self._run(widget.insert, tk.END, "".join(parts))
+            for variable, value in values.items():
+                self._run(variable.set, value)
+            buffers.clear()
+            values.clear()
+
+        for kind, target, payload in ops:
+            if kind == _INSERT:
+                buffers.setdefault(target, []).append(payload)
+            elif kind == _CLEAR:
+                # Text queued for this widget would be deleted anyway
+                buffers.pop(target, None)
+                self._run(target.delete, 1.0, tk.END)
+            elif kind == _SET:
+                values[target] = payload
+            else:
+                flush()
+                args, kwargs = payload
+                self._run(target, *args, **kwargs)
+        flush()
+
+    def _run(self, fn, *args, **kwargs):
+        try:
+            fn(*args, **kwargs)
+        except tk.TclError:
+            # The widget was destroyed while the operation was queued
+            pass
@@ -0,0 +1,170 @@
+import asyncio
+import weakref
+import httpx
+from async_runtime import get_background_loop
+from config import (HOLEHE_TIMEOUT, HOLEHE_MAX_CONCURRENCY, HOLEHE_MODULE_TIMEOUT, HOLEHE_PROFILES,
+                    HOLEHE_DEFAULT_PROFILE)
+from lazy_deps import load_bs4, load_tqdm
+
+
+def load_holehe_modules():
+    """
+    Import every holehe site checker and return ({name: coroutine function},
+    {name: category}), the category being the holehe package it lives in
+    """
+    load_bs4()
+    load_tqdm()
+    from holehe.core import import_submodules, get_functions
+    websites = get_functions(import_submodules("holehe.modules"))
+    modules = {website.__name__: website for website in websites}
+    # e.g. holehe.modules.social_media.instagram -> social_media
+    categories = {website.__name__: website.__module__.split(".")[2] for website in websites}
+    return modules, categories
+
+
+def _failed_entry(name, error):
+    # Same shape holehe's own launcher records for a crashed module, plus the reason
+    return {"name": name, "domain": None, "rateLimit": True, "exists": False,
+            "emailrecovery": None, "phoneNumber": None, "others": None, "error": error}
+
+
+class HoleheRunner:
+    """
+    Runs holehe site checkers on the caller's event loop.
+    The module list is imported once and every query on a loop shares one
+    httpx client, so several scans can run side by side (capped by
+    `max_concurrency` module calls in total) over warm connections. Each
+    module gets `module_timeout` seconds, and stream() hands back every
+    site's answer as soon as it lands.
+    """
+
+    def __init__(self, timeout=HOLEHE_TIMEOUT, max_concurrency=HOLEHE_MAX_CONCURRENCY,
+                 module_timeout=HOLEHE_MODULE_TIMEOUT, profiles=HOLEHE_PROFILES):
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.module_timeout = module_timeout
+        self.profiles = profiles
+        self._modules = None
+        self._categories = None
+        self._clients = weakref.WeakKeyDictionary()
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def modules(self):
+        if self._modules is None:
+            self._modules, self._categories = load_holehe_modules()
+        return self._modules
+
+    @property
+    def categories(self):
+        self.modules
+        return self._categories
+
+    def select(self, spec=None):
+        """
+        Resolve a module selection to a sorted list of module names. `spec` is
+        a profile name, category, module name, "all", or a comma separated
+        mix of them; "-name" removes modules. None uses HOLEHE_DEFAULT_PROFILE.
+        Raises ValueError for unknown names.
+        """
+        if spec is None:
+            spec = HOLEHE_DEFAULT_PROFILE
+        if isinstance(spec, str):
+            spec = [part.strip() for part in spec.split(",") if part.strip()]
+        selected = set()
+        for part in spec:
+            names = self._expand(part.lstrip("-"), set())
+            if part.startswith("-"):
+                selected -= names
+            else:
+                selected |= names
+        if not selected:
+            raise ValueError("No Holehe modules selected")
+        return sorted(selected)
+
+    def _expand(self, name, seen):
+        if name == "all":
+            return set(self.modules)
+        if name in self.profiles:
+            if name in seen:
+                raise ValueError(f"Holehe profile {name!r} includes itself")
+            seen = seen | {name}
+            names = set()
+            for part in self.profiles[name]:
+                expanded = self._expand(part.lstrip("-"), seen)
+                names = names - expanded if part.startswith("-") else names | expanded
+            return names
+        if name in self.modules:
+            return {name}
+        names = {module for module, category in self.categories.items() if category == name}
+        if not names:
+            raise ValueError(f"Unknown Holehe module, category or profile: {name!r}")
+        return names
+
+    def _get_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.timeout)
+            self._clients[loop] = client
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return client
+
+    async def _run_module(self, name, module, email, client, semaphore):
+        out = []
+        async with semaphore:
+            try:
+                await asyncio.wait_for(module(email, client, out), self.module_timeout)
+            except asyncio.TimeoutError:
+                return [_failed_entry(name, f"timed out after {self.module_timeout} seconds")]
+            except Exception as e:
+                return [_failed_entry(name, f"{type(e).__name__}: {e}")]
+        return out
+
+    async def stream(self, email, modules=None):
+        """
+        Async generator yielding (site, details) for one email as each site
+        module finishes. `modules` is a selection accepted by select().
+        """
+        names = self.select(modules)
+        client = self._get_client()
+        semaphore = self._semaphores[asyncio.get_running_loop()]
+        tasks = [asyncio.ensure_future(self._run_module(name, self.modules[name], email, client, semaphore))
+                 for name in names]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for entry in await finished:
+                    entry = dict(entry)
+                    yield entry.pop("name"), entry
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run(self, email, modules=None):
+        """Check one email against the selected modules and return {site: details}"""
+        results = {}
+        async for site, details in self.stream(email, modules):
+            results[site] = details
+        return dict(sorted(results.items()))
+
+    async def run_many(self, emails, modules=None):
+        """Async generator yielding (email, results) as each scan finishes"""
+        async def scan(email):
+            return email, await self.run(email, modules)
+
+        for finished in asyncio.as_completed([scan(email) for email in emails]):
+            yield await finished
+
+    async def close(self):
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_holehe_runner = HoleheRunner()
+get_background_loop().add_shutdown_hook(_holehe_runner.close)
+
+
+def get_holehe_runner():
+    """Return the process-wide HoleheRunner"""
+    return _holehe_runner
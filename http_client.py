@@ -0,0 +1,82 @@
+import asyncio
+import json
+import weakref
+import aiohttp
+from async_runtime import get_background_loop
+from config import HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_KEEPALIVE_TIMEOUT, HTTP_TIMEOUT
+
+USER_AGENT = "Pheonix-Phone-Tool"
+
+
+class HTTPResponse:
+    """A fully read HTTP response, safe to use after the connection is released"""
+
+    __slots__ = ("status", "text", "headers")
+
+    def __init__(self, status, text, headers):
+        self.status = status
+        self.text = text
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncHTTPClient:
+    """
+    Pooled aiohttp client shared by the provider lookups.
+    Connections are kept alive between requests and capped per host. aiohttp
+    sessions are bound to the event loop that created them, so one session
+    is kept per running loop.
+    """
+
+    def __init__(self, limit=HTTP_POOL_LIMIT, limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                 keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT, timeout=HTTP_TIMEOUT):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._sessions = weakref.WeakKeyDictionary()
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": USER_AGENT}
+            )
+            self._sessions[loop] = session
+        return session
+
+    async def request(self, method, url, **kwargs):
+        """Send a request and return an HTTPResponse with the body already read"""
+        session = self._get_session()
+        async with session.request(method, url, **kwargs) as response:
+            text = await response.text()
+            return HTTPResponse(response.status, text, dict(response.headers))
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def close(self):
+        """Close the session belonging to the running loop"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+_http_client = AsyncHTTPClient()
+get_background_loop().add_shutdown_hook(_http_client.close)
+
+
+def get_http_client():
+    """Return the process-wide AsyncHTTPClient"""
+    return _http_client
@@ -0,0 +1,279 @@
+import bisect
+import csv
+import ipaddress
+import socket
+import threading
+from array import array
+from config import IP_GEO_DB_PATH
+
+# Column names accepted in headed CSV files, mapped to the index's fields
+_COLUMN_ALIASES = {
+    "start": ("start", "start_ip", "ip_start", "range_start", "first_ip"),
+    "end": ("end", "end_ip", "ip_end", "range_end", "last_ip"),
+    "network": ("network", "cidr", "prefix"),
+    "city": ("city", "city_name"),
+    "state": ("state", "region", "stateprov", "subdivision_1_name"),
+    "country": ("country", "country_name", "country_code", "country_iso_code"),
+    "latitude": ("latitude", "lat"),
+    "longitude": ("longitude", "lon", "lng"),
+}
+
+# Column order of headerless "ip-to-city" CSV exports such as DB-IP Lite:
+# start, end, continent, country, state, city, latitude, longitude
+_HEADERLESS_COLUMNS = {"start": 0, "end": 1, "country": 3, "state": 4, "city": 5, "latitude": 6, "longitude": 7}
+
+GEO_FIELDS = ("city", "state", "country", "latitude", "longitude")
+
+
+def _ip_to_int(text):
+    """Parse an IP string to (version, integer); much cheaper than ipaddress for bulk loads"""
+    text = text.strip()
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, text), "big")
+    except OSError:
+        pass
+    try:
+        return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, text), "big")
+    except OSError:
+        raise ValueError(f"{text!r} does not appear to be an IPv4 or IPv6 address")
+
+
+def _parse_bound(value, version=None):
+    value = value.strip()
+    if value.isdigit():
+        # Integer bounds: assume IPv4 unless the value cannot fit
+        number = int(value)
+        return version or (4 if number <= 0xFFFFFFFF else 6), number
+    return _ip_to_int(value)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _RangeTable:
+    """Sorted, non-overlapping [start, end] ranges for one IP version"""
+
+    def __init__(self, typecode):
+        self.typecode = typecode
+        self.rows = []
+        self.starts = None
+        self.ends = None
+        self.locations = None
+
+    def freeze(self):
+        self.rows.sort()
+        if self.typecode:
+            self.starts = array(self.typecode, (row[0] for row in self.rows))
+            self.ends = array(self.typecode, (row[1] for row in self.rows))
+            self.locations = array("I", (row[2] for row in self.rows))
+        else:
+            # IPv6 addresses do not fit a machine word, so plain lists are used
+            self.starts = [row[0] for row in self.rows]
+            self.ends = [row[1] for row in self.rows]
+            self.locations = [row[2] for row in self.rows]
+        self.rows = None
+
+    def find(self, value):
+        position = bisect.bisect_right(self.starts, value) - 1
+        if position >= 0 and value <= self.ends[position]:
+            return self.locations[position]
+        return None
+
+    def __len__(self):
+        return len(self.starts) if self.starts is not None else len(self.rows)
+
+
+class IPGeoIndex:
+    """
+    Offline IP geolocation backed by a range file.
+    Ranges are kept as sorted integer arrays (one per IP version) and the
+    repeated city/state/country tuples are stored once, so a lookup is one
+    binary search. Build it with from_csv() or open an MMDB with from_mmdb().
+    """
+
+    def __init__(self):
+        self._tables = {4: _RangeTable("L" if array("L").itemsize >= 4 else "Q"), 6: _RangeTable(None)}
+        self._locations = []
+        self._location_ids = {}
+        self._reader = None
+
+    def add_range(self, first, last, city=None, state=None, country=None, latitude=None, longitude=None):
+        """
+        Add an inclusive address range given as IP strings or ipaddress
+        objects; call freeze() after the last one.
+        """
+        if isinstance(first, str):
+            first, last = ipaddress.ip_address(first), ipaddress.ip_address(last)
+        self._add(first.version, int(first), int(last), city, state, country, latitude, longitude)
+
+    def _add(self, version, first, last, city, state, country, latitude, longitude):
+        location = (city or None, state or None, country or None, latitude, longitude)
+        location_id = self._location_ids.get(location)
+        if location_id is None:
+            location_id = len(self._locations)
+            self._locations.append(location)
+            self._location_ids[location] = location_id
+        self._tables[version].rows.append((first, last, location_id))
+
+    def freeze(self):
+        for table in self._tables.values():
+            if table.rows is not None:
+                table.freeze()
+        self._location_ids = None
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Load a CSV of ranges. Headed files need start/end (IPs or integers) or
+        network (CIDR) columns plus any of city, state, country, latitude and
+        longitude; headerless files are read in DB-IP Lite column order.
+        """
+        index = cls()
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            first_row = next(reader, None)
+            if first_row is None:
+                index.freeze()
+                return index
+            lowered = [column.strip().lower() for column in first_row]
+            columns = {}
+            for field, aliases in _COLUMN_ALIASES.items():
+                for alias in aliases:
+                    if alias in lowered:
+                        columns[field] = lowered.index(alias)
+                        break
+            if "network" not in columns and not ("start" in columns and "end" in columns):
+                columns = _HEADERLESS_COLUMNS
+                rows = _chain([first_row], reader)
+            else:
+                if not any(field in columns for field in GEO_FIELDS):
+                    # e.g. GeoLite2 "Blocks" files, whose place names live in a separate file
+                    raise ValueError(f"{path} has address ranges but no city, state, country, "
+                                     "latitude or longitude columns")
+                rows = reader
+
+            def column(row, field):
+                position = columns.get(field)
+                return row[position] if position is not None and position < len(row) else None
+
+            for row in rows:
+                if not row:
+                    continue
+                try:
+                    if "network" in columns:
+                        network = ipaddress.ip_network(row[columns["network"]].strip(), strict=False)
+                        version = network.version
+                        first, last = int(network.network_address), int(network.broadcast_address)
+                    else:
+                        version, first = _parse_bound(row[columns["start"]])
+                        last = _parse_bound(row[columns["end"]], version)[1]
+                except (ValueError, IndexError):
+                    continue
+                index._add(version, first, last, column(row, "city"), column(row, "state"), column(row, "country"),
+                                _to_float(column(row, "latitude")), _to_float(column(row, "longitude")))
+        index.freeze()
+        return index
+
+    @classmethod
+    def from_mmdb(cls, path):
+        """Open a MaxMind-format database (GeoLite2-City, DB-IP, ...) with the maxminddb package"""
+        try:
+            import maxminddb
+        except ImportError:
+            raise ImportError("Reading .mmdb files requires the maxminddb package: pip install maxminddb")
+        index = cls()
+        index._reader = maxminddb.open_database(path)
+        return index
+
+    def lookup(self, ip):
+        """Return {"city", "state", "country", "latitude", "longitude"} for ip, or None"""
+        if self._reader is not None:
+            return _from_mmdb_record(self._reader.get(str(ip).strip()))
+        if isinstance(ip, str):
+            version, number = _ip_to_int(ip)
+        else:
+            version, number = ip.version, int(ip)
+        location_id = self._tables[version].find(number)
+        if location_id is None:
+            return None
+        location = self._locations[location_id]
+        if all(value is None for value in location):
+            # A range with no usable location data is a miss, not an answer
+            return None
+        return dict(zip(GEO_FIELDS, location))
+
+    def __len__(self):
+        return sum(len(table) for table in self._tables.values())
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
+
+
+def _from_mmdb_record(record):
+    if not record:
+        return None
+
+    def name(entry):
+        if not entry:
+            return None
+        names = entry.get("names")
+        return names.get("en") if names else entry.get("name")
+
+    location = record.get("location") or {}
+    subdivisions = record.get("subdivisions") or [{}]
+    result = {
+        "city": name(record.get("city")),
+        "state": name(subdivisions[0]),
+        "country": name(record.get("country")),
+        "latitude": location.get("latitude"),
+        "longitude": location.get("longitude"),
+    }
+    if all(value is None for value in result.values()):
+        return None
+    return result
+
+
+def load_ip_geo_index(path):
+    """Open path as an MMDB or CSV range file depending on its extension"""
+    if str(path).lower().endswith(".mmdb"):
+        return IPGeoIndex.from_mmdb(path)
+    return IPGeoIndex.from_csv(path)
+
+
+_index = None
+_index_error = None
+_index_lock = threading.Lock()
+
+
+def get_ip_geo_index(load=True):
+    """
+    Return the index configured by IP_GEO_DB_PATH, loading it once; None if
+    unset. With load=False an index that has not been loaded yet is not
+    loaded, so async callers can push the load to a worker thread. A file
+    that fails to load raises the same error on every call without being
+    read again.
+    """
+    global _index, _index_error
+    if not IP_GEO_DB_PATH:
+        return None
+    if _index is None and load:
+        with _index_lock:
+            if _index_error is not None:
+                raise _index_error
+            if _index is None:
+                try:
+                    _index = load_ip_geo_index(IP_GEO_DB_PATH)
+                except (OSError, ValueError, ImportError) as e:
+                    _index_error = e
+                    raise
+    return _index
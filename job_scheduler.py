@@ -0,0 +1,124 @@
+import collections
+import concurrent.futures
+import queue
+import threading
+from config import JOB_MAX_WORKERS, JOB_TYPE_LIMITS
+
+
+class _Job:
+    __slots__ = ("kind", "key", "fn", "args", "kwargs", "future")
+
+    def __init__(self, kind, key, fn, args, kwargs):
+        self.kind = kind
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = concurrent.futures.Future()
+
+
+class JobScheduler:
+    """
+    Bounded pool of daemon worker threads for analysis jobs.
+    Every job has a kind ("whois", "breach", ...) with its own concurrency
+    cap from JOB_TYPE_LIMITS; jobs over the cap wait in a per-kind queue.
+    Submitting the same function for the same target while an earlier
+    submission is still pending or running returns the earlier future, so
+    identical requests share one provider call.
+    """
+
+    def __init__(self, max_workers=JOB_MAX_WORKERS, limits=JOB_TYPE_LIMITS):
+        self.max_workers = max_workers
+        self.limits = dict(limits or {})
+        self._lock = threading.Lock()
+        self._ready = queue.Queue()
+        self._waiting = collections.defaultdict(collections.deque)
+        self._running = collections.Counter()
+        self._inflight = {}
+        self._threads = []
+        self._idle = 0
+        self._shutdown = False
+
+    def _limit(self, kind):
+        return max(1, min(self.limits.get(kind, self.max_workers), self.max_workers))
+
+    def submit(self, kind, target, fn, *args, **kwargs):
+        """
+        Queue fn(*args, **kwargs) as a `kind` job for `target` and return a
+        concurrent.futures.Future. Identical in-flight jobs are coalesced.
+        """
+        key = (kind, getattr(fn, "__qualname__", repr(fn)), target)
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("JobScheduler has been shut down")
+            existing = self._inflight.get(key)
+            if existing is not None and not existing.future.cancelled():
+                return existing.future
+            job = _Job(kind, key, fn, args, kwargs)
+            self._inflight[key] = job
+            if self._running[kind] < self._limit(kind):
+                self._dispatch(job)
+            else:
+                self._waiting[kind].append(job)
+        return job.future
+
+    def _dispatch(self, job):
+        # Caller holds self._lock
+        self._running[job.kind] += 1
+        self._ready.put(job)
+        # Threads are started on demand, up to max_workers
+        if self._idle < self._ready.qsize() and len(self._threads) < self.max_workers:
+            thread = threading.Thread(target=self._worker, name=f"pheonix-job-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                self._idle += 1
+            job = self._ready.get()
+            with self._lock:
+                self._idle -= 1
+            if job is None:
+                return
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    try:
+                        job.future.set_result(job.fn(*job.args, **job.kwargs))
+                    except BaseException as e:
+                        job.future.set_exception(e)
+            finally:
+                self._finish(job)
+
+    def _finish(self, job):
+        with self._lock:
+            if self._inflight.get(job.key) is job:
+                del self._inflight[job.key]
+            self._running[job.kind] -= 1
+            waiting = self._waiting[job.kind]
+            if waiting and not self._shutdown:
+                self._dispatch(waiting.popleft())
+
+    def cancel(self, kind=None):
+        """
+        Cancel queued jobs (all kinds, or just `kind`) and return how many were
+        cancelled. Jobs that are already running finish normally.
+        """
+        with self._lock:
+            jobs = [job for job in self._inflight.values() if kind is None or job.kind == kind]
+        # Cancel outside the lock: done callbacks may submit new jobs
+        return sum(1 for job in jobs if job.future.cancel())
+
+    def active(self, kind=None):
+        """Number of queued or running jobs, optionally for one kind"""
+        with self._lock:
+            return sum(1 for job in self._inflight.values()
+                       if (kind is None or job.kind == kind) and not job.future.done())
+
+    def shutdown(self, cancel_pending=True):
+        with self._lock:
+            self._shutdown = True
+        if cancel_pending:
+            self.cancel()
+        for _ in self._threads:
+            self._ready.put(None)
@@ -0,0 +1,81 @@
+import importlib
+import threading
+import warnings
+
+# Heavy subsystems imported ahead of time by prewarm(), roughly in the order
+# an analyst reaches for them after Basic Info
+PREWARM_MODULES = (
+    "phonenumbers.geocoder",
+    "phonenumbers.carrier",
+    "phonenumbers.timezone",
+    "aiohttp",
+    "http_client",
+    "whois",
+    "folium",
+    "opencage.geocoder",
+    "socialscan.util",
+    "holehe_runner",
+    "ip_geo_index",
+)
+
+_configured = set()
+_configure_lock = threading.Lock()
+
+
+def load_bs4():
+    """Import bs4 with the app's defaults: lxml parser and no parser-guess warnings"""
+    import bs4
+    with _configure_lock:
+        if "bs4" not in _configured:
+            warnings.filterwarnings("ignore", category=bs4.GuessedAtParserWarning)
+
+            # Configure BeautifulSoup to use lxml parser by default
+            original = bs4.BeautifulSoup
+
+            def _create_soup(*args, **kwargs):
+                if len(args) < 2:
+                    kwargs.setdefault('features', 'lxml')
+                return original(*args, **kwargs)
+
+            bs4.BeautifulSoup = _create_soup
+            _configured.add("bs4")
+    return bs4
+
+
+def load_tqdm():
+    """Import tqdm, patched so progress bars are closed quietly on garbage collection"""
+    import tqdm
+    with _configure_lock:
+        if "tqdm" not in _configured:
+            def _del(self):
+                try:
+                    self.close()
+                except:
+                    pass
+            tqdm.tqdm.__del__ = _del
+            _configured.add("tqdm")
+    return tqdm
+
+
+def _prewarm(modules):
+    for name in modules:
+        try:
+            if name == "holehe_runner":
+                from holehe_runner import get_holehe_runner
+                get_holehe_runner().modules
+            elif name == "ip_geo_index":
+                # Loads the offline range file, if one is configured
+                from ip_geo_index import get_ip_geo_index
+                get_ip_geo_index()
+            else:
+                importlib.import_module(name)
+        except Exception:
+            # Prewarming is best effort; the real import reports the error later
+            pass
+
+
+def prewarm(modules=PREWARM_MODULES):
+    """Import heavy subsystems in a daemon thread so first use is fast"""
+    thread = threading.Thread(target=_prewarm, args=(modules,), name="pheonix-prewarm", daemon=True)
+    thread.start()
+    return thread
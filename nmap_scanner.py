@@ -0,0 +1,191 @@
+import asyncio
+import shutil
+import time
+import weakref
+import xml.etree.ElementTree as ET
+from async_runtime import get_background_loop
+from config import NMAP_ARGS, NMAP_TIMEOUT, NMAP_MAX_PROCESSES, PORT_SCAN_PORTS
+from port_scanner import parse_ports
+
+_FINISHED = object()
+
+# Semaphores per event loop and limit: scans with the same max_processes on
+# one loop share a cap, and a scanner with a different limit gets its own
+_process_slots = weakref.WeakKeyDictionary()
+
+
+def nmap_available(binary="nmap"):
+    return shutil.which(binary) is not None
+
+
+def format_ports(ports):
+    """Collapse sorted ports into nmap's -p syntax, e.g. "22,80,8000-8100" """
+    ranges = []
+    for port in ports:
+        if ranges and port == ranges[-1][1] + 1:
+            ranges[-1][1] = port
+        else:
+            ranges.append([port, port])
+    return ",".join(str(first) if first == last else f"{first}-{last}" for first, last in ranges)
+
+
+def _slots(limit):
+    slots = _process_slots.setdefault(asyncio.get_running_loop(), {})
+    if limit not in slots:
+        slots[limit] = asyncio.Semaphore(limit)
+    return slots[limit]
+
+
+def _host_events(target, host):
+    """Turn a finished <host> element into host and open-port events"""
+    addresses = {address.get("addrtype"): address.get("addr") for address in host.findall("address")}
+    ip = addresses.get("ipv4") or addresses.get("ipv6")
+    hostname = host.find("hostnames/hostname")
+    status = host.find("status")
+    yield {
+        "event": "host", "target": target, "ip": ip, "error": None,
+        "hostname": hostname.get("name") if hostname is not None else None,
+        "status": status.get("state") if status is not None else None,
+    }
+    for port in host.findall("ports/port"):
+        state = port.find("state")
+        if state is None or state.get("state") != "open":
+            continue
+        service = port.find("service")
+        name = "unknown"
+        if service is not None:
+            name = " ".join(filter(None, (service.get("name"), service.get("product"), service.get("version"))))
+        yield {
+            "event": "open", "target": target, "ip": ip, "port": int(port.get("portid")),
+            "protocol": port.get("protocol"), "service": name or "unknown",
+        }
+
+
+class NmapScanner:
+    """
+    Runs nmap without a shell, reading its XML report (-oX -) incrementally
+    so each host reaches the caller as soon as nmap finishes it. A scan that
+    runs past `timeout` is killed and keeps what it already reported.
+    Several targets run as parallel nmap processes, at most `max_processes`
+    at a time across all scanners on the loop. Events match PortScanner's,
+    plus a final {"event": "done"} per target.
+    """
+
+    def __init__(self, ports=PORT_SCAN_PORTS, args=NMAP_ARGS, timeout=NMAP_TIMEOUT,
+                 max_processes=NMAP_MAX_PROCESSES, binary="nmap"):
+        self.ports = parse_ports(ports)
+        self.args = tuple(args)
+        self.timeout = timeout
+        self.max_processes = max_processes
+        self.binary = binary
+
+    def command(self, target):
+        return [self.binary, *self.args, "-p", format_ports(self.ports), "-oX", "-", target]
+
+    async def _scan_one(self, target, emit):
+        """Scan one target with its own nmap process, passing events to emit()"""
+        if target.startswith("-"):
+            # Without a shell this is the only way a target could smuggle in options
+            emit({"event": "host", "target": target, "ip": None, "error": f"Invalid target: {target}"})
+            return
+        async with _slots(self.max_processes):
+            started = time.monotonic()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self.command(target), stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            except OSError as e:
+                emit({"event": "host", "target": target, "ip": None, "error": f"Could not run nmap: {e}"})
+                return
+            stderr = asyncio.ensure_future(process.stderr.read())
+            parser = ET.XMLPullParser(events=("end",))
+            hosts = 0
+            timed_out = False
+            try:
+                while True:
+                    remaining = started + self.timeout - time.monotonic()
+                    try:
+                        chunk = await asyncio.wait_for(process.stdout.read(65536), max(remaining, 0))
+                    except asyncio.TimeoutError:
+                        timed_out = True
+                        break
+                    if not chunk:
+                        break
+                    try:
+                        parser.feed(chunk)
+                        for _, element in parser.read_events():
+                            if element.tag == "host":
+                                hosts += 1
+                                for event in _host_events(target, element):
+                                    emit(event)
+                                element.clear()
+                    except ET.ParseError:
+                        # A truncated or garbled report; keep the hosts parsed so far
+                        break
+            finally:
+                if process.returncode is None:
+                    try:
+                        process.kill()
+                    except ProcessLookupError:
+                        pass
+                await process.wait()
+            errors = (await stderr).decode(errors="replace").strip()
+            error = None
+            if timed_out:
+                error = f"nmap timed out after {self.timeout} seconds; results are partial"
+            elif process.returncode != 0 or (errors and not hosts):
+                error = errors or f"nmap exited with status {process.returncode}"
+            if not hosts and error:
+                emit({"event": "host", "target": target, "ip": None, "error": error})
+            emit({"event": "done", "target": target, "hosts": hosts, "timed_out": timed_out,
+                  "error": error, "elapsed": time.monotonic() - started})
+
+    async def scan_iter(self, targets):
+        """Async generator of events from all targets as their nmap processes report them"""
+        events = asyncio.Queue()
+
+        async def run(target):
+            try:
+                await self._scan_one(target, events.put_nowait)
+            except Exception as e:
+                events.put_nowait({"event": "host", "target": target, "ip": None, "error": f"Scan failed: {e}"})
+            finally:
+                events.put_nowait(_FINISHED)
+
+        tasks = [asyncio.ensure_future(run(target)) for target in targets]
+        running = len(tasks)
+        try:
+            while running:
+                event = await events.get()
+                if event is _FINISHED:
+                    running -= 1
+                else:
+                    yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def scan(self, targets):
+        """
+        Scan and return {ip: {"target", "open": [(port, service)], "error"}}
+        like PortScanner.scan(); a timed out target's hosts carry its error.
+        """
+        results = {}
+        async for event in self.scan_iter(targets):
+            if event["event"] == "host":
+                results.setdefault(event["ip"] or event["target"],
+                                   {"target": event["target"], "open": [], "error": event["error"]})
+            elif event["event"] == "open":
+                results[event["ip"]]["open"].append((event["port"], event["service"]))
+            elif event["error"]:
+                for result in results.values():
+                    if result["target"] == event["target"]:
+                        result["error"] = result["error"] or event["error"]
+        for result in results.values():
+            result["open"].sort()
+        return results
+
+    def iter_scan(self, targets):
+        """Run scan_iter() on the background loop and yield events to a sync caller"""
+        return get_background_loop().iterate(self.scan_iter(targets))
@@ -1,145 +1,276 @@
 import asyncio
-from holehe import core
-import whois
-import requests
-from config import HIBP_API_KEY, GEOAPIFY_API_KEY
-import phonenumbers
-from phonenumbers import carrier, geocoder, timezone, PhoneNumberFormat
-from socialscan.util import sync_execute_queries
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+from config import HIBP_API_KEY, HIBP_API_URL, GEOAPIFY_API_KEY, GEOAPIFY_API_URL, IP_GEO_DB_PATH
+from phone_record import to_phone_record
+from async_runtime import run_sync
+from ip_geo_index import get_ip_geo_index
+from whois_cache import (get_whois_cache, get_ip_whois_cache, registrable_domain, whois_cache_key,
+                         allocated_block, query_ip_whois)
+from osint_results import (PhoneInfoResult, PhoneCarrierResult, PhoneValidationResult, DomainWhoisResult,
+                           BreachResult, SocialMediaResult, HoleheResult, IPResult)
+
+# whois, aiohttp, holehe and socialscan are slow to import and most sessions
+# never touch them, so each method imports what it needs on first use.
+# Each analyzer has a *_result method returning a typed result from
+# osint_results; the older string methods return that result's text.
 
 class OSINTAnalyzer:
     def __init__(self):
         pass
 
-    async def analyze_email_or_username(self, query):
-        results = await core.core(query, no_api_key=True, no_clear=True, no_color=True)
+    async def analyze_email_or_username(self, query, modules=None):
+        from holehe_runner import get_holehe_runner
+        results = await get_holehe_runner().run(query, modules)
         return results
 
+    def stream_email_or_username(self, query, modules=None):
+        """Async generator of (site, details) as each Holehe module answers"""
+        from holehe_runner import get_holehe_runner
+        return get_holehe_runner().stream(query, modules)
+
+    async def holehe_result_async(self, query, modules=None):
+        try:
+            return HoleheResult(query, sites=await self.analyze_email_or_username(query, modules))
+        except Exception as e:
+            return HoleheResult(query, f"Error during OSINT analysis: {e}")
+
+    def phone_basic_info_result(self, phone_number):
+        query = str(phone_number)
+        try:
+            record = to_phone_record(phone_number)
+            query = record.raw
+            if not record.is_valid:
+                return PhoneInfoResult(query, is_valid=False)
+            return PhoneInfoResult(query, is_valid=True, parsed=str(record.parsed), region=record.region,
+                                   timezones=list(record.timezones))
+        except Exception as e:
+            return PhoneInfoResult(query, f"Error getting basic phone info: {e}")
+
     def analyze_phone_number_basic_info(self, phone_number):
+        return self.phone_basic_info_result(phone_number).format()
+
+    def phone_isp_result(self, phone_number):
+        query = str(phone_number)
         try:
-            parse = phonenumbers.parse(phone_number)
-            if not phonenumbers.is_valid_number(parse):
-                return "Invalid phone number."
-            region = geocoder.description_for_number(parse, 'en')
-            timezones = timezone.time_zones_for_number(parse)
-            
-            result = f"--- Phone Number Basic Info ---\n"
-            result += f"Parsed Phone Number: {parse}\n"
-            result += f"Region: {region}\n"
-            result += f"Time Zone(s): {', '.join(timezones)}\n"
-            return result
+            record = to_phone_record(phone_number)
+            query = record.raw
+            if not record.is_valid:
+                return PhoneCarrierResult(query, is_valid=False)
+            return PhoneCarrierResult(query, is_valid=True, carrier=record.carrier)
         except Exception as e:
-            return f"Error getting basic phone info: {e}"
+            return PhoneCarrierResult(query, f"Error getting phone number ISP: {e}")
 
     def analyze_phone_number_isp(self, phone_number):
+        return self.phone_isp_result(phone_number).format()
+
+    def phone_validation_result(self, phone_number):
+        query = str(phone_number)
         try:
-            parse = phonenumbers.parse(phone_number)
-            if not phonenumbers.is_valid_number(parse):
-                return "Invalid phone number."
-            isp = carrier.name_for_number(parse, 'en')
-            return f"--- Phone Number ISP ---\nISP: {isp}\n"
+            record = to_phone_record(phone_number)
+            return PhoneValidationResult(record.raw, is_valid=record.is_valid)
         except Exception as e:
-            return f"Error getting phone number ISP: {e}"
+            return PhoneValidationResult(query, f"Error validating phone number: {e}")
 
     def validate_phone_number(self, phone_number):
+        return self.phone_validation_result(phone_number).format()
+
+    def email_domain_result(self, email_address):
+        domain = None
         try:
-            parse = phonenumbers.parse(phone_number)
-            is_valid = phonenumbers.is_valid_number(parse)
-            return f"--- Phone Number Validation ---\nIs Valid: {is_valid}\n"
+            import whois
+            domain = registrable_domain(email_address.split('@')[-1])
+            text = get_whois_cache().lookup(whois_cache_key(domain), lambda: whois.whois(domain).text)
+            return DomainWhoisResult(email_address, domain=domain, text=text)
         except Exception as e:
-            return f"Error validating phone number: {e}"
+            return DomainWhoisResult(email_address, f"Error performing WHOIS lookup: {e}", domain=domain)
 
     def analyze_email_domain(self, email_address):
-        try:
-            domain = email_address.split('@')[-1]
-            w = whois.whois(domain)
-            return w.text
-        except Exception as e:
-            return f"Error performing WHOIS lookup: {e}"
+        return self.email_domain_result(email_address).format()
 
-    def check_breach(self, email_address):
-        if not HIBP_API_KEY or HIBP_API_KEY == "YOUR_HIBP_API_KEY":
-            return "HIBP API key not configured. Please add your API key to config.py to use this feature."
+    def analyze_email_domains(self, email_addresses, workers=8):
+        """
+        WHOIS many emails at once. Emails are grouped by registrable domain so
+        each domain is queried once; yields (email, whois_text) pairs as each
+        domain's lookup completes.
+        """
+        groups = {}
+        for email_address in email_addresses:
+            email_address = email_address.strip()
+            if email_address:
+                groups.setdefault(registrable_domain(email_address.split('@')[-1]), []).append(email_address)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.analyze_email_domain, domain): domain for domain in groups}
+            for future in as_completed(futures):
+                whois_text = future.result()
+                for email_address in groups[futures[future]]:
+                    yield email_address, whois_text
 
+    def hibp_configured(self):
+        return bool(HIBP_API_KEY) and HIBP_API_KEY != "YOUR_HIBP_API_KEY"
+
+    async def request_breaches(self, email_address):
+        """Send the raw HIBP breachedaccount request and return the HTTPResponse"""
+        from http_client import get_http_client
         headers = {
             "hibp-api-key": HIBP_API_KEY,
             "User-Agent": "Pheonix-Phone-Tool"
         }
-        url = f"https://haveibeenpwned.com/api/v3/breachedaccount/{email_address}"
-        
+        url = f"{HIBP_API_URL}/breachedaccount/{quote(email_address)}"
+        return await get_http_client().get(url, headers=headers, params={"truncateResponse": "false"})
+
+    def breach_result_from_response(self, email_address, response):
+        if response.status == 200:
+            breaches = [{
+                "name": breach.get("Name"), "title": breach["Title"], "domain": breach["Domain"],
+                "date": breach["BreachDate"], "pwn_count": breach.get("PwnCount"),
+                "data_classes": breach.get("DataClasses") or [],
+            } for breach in response.json()]
+            return BreachResult(email_address, breaches=breaches)
+        elif response.status == 404:
+            return BreachResult(email_address, breaches=[])
+        elif response.status == 401:
+            return BreachResult(email_address, "HIBP API key is invalid. Please check your API key in config.py.")
+        else:
+            return BreachResult(email_address, f"Error checking breaches: {response.status} - {response.text}")
+
+    def format_breach_response(self, email_address, response):
+        return self.breach_result_from_response(email_address, response).format()
+
+    async def breach_result_async(self, email_address):
+        import aiohttp
+        if not self.hibp_configured():
+            return BreachResult(email_address, "HIBP API key not configured. Please add your API key to config.py to use this feature.")
+
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                breaches = response.json()
-                if breaches:
-                    result_text = f"Breaches found for {email_address}:\n"
-                    for breach in breaches:
-                        result_text += f"  - {breach['Title']} (Domain: {breach['Domain']}, Date: {breach['BreachDate']})\n"
-                    return result_text
-                else:
-                    return f"No breaches found for {email_address}."
-            elif response.status_code == 404:
-                return f"No breaches found for {email_address}."
-            elif response.status_code == 401:
-                return "HIBP API key is invalid. Please check your API key in config.py."
-            else:
-                return f"Error checking breaches: {response.status_code} - {response.text}"
-        except requests.exceptions.RequestException as e:
-            return f"Network error during HIBP API call: {e}"
+            response = await self.request_breaches(email_address)
+            return self.breach_result_from_response(email_address, response)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return BreachResult(email_address, f"Network error during HIBP API call: {e}")
         except Exception as e:
-            return f"An unexpected error occurred during breach check: {e}"
+            return BreachResult(email_address, f"An unexpected error occurred during breach check: {e}")
 
-    def enumerate_social_media_username(self, username):
+    async def check_breach_async(self, email_address):
+        return (await self.breach_result_async(email_address)).format()
+
+    def breach_result(self, email_address):
+        return run_sync(self.breach_result_async(email_address))
+
+    def check_breach(self, email_address):
+        return self.breach_result(email_address).format()
+
+    async def social_media_result_async(self, username):
         try:
-            results = sync_execute_queries([username])
-            output = f"--- Social Media Username Enumeration for {username} ---\n"
-            found_any = False
-            for result in results:
-                if result.available == False and result.valid == True:
-                    output += f"  - {result.platform}: Found (URL: {result.uri})\n"
-                    found_any = True
-                elif result.valid == False:
-                    output += f"  - {result.platform}: Invalid/Unavailable\n"
-            if not found_any:
-                output += "No profiles found for this username on supported platforms.\n"
-            return output
+            from social_scanner import get_social_scanner
+            return await get_social_scanner().scan(username)
         except Exception as e:
-            return f"Error during social media username enumeration: {e}"
-
-    def analyze_ip_address(self, ip_address):
-        results = ""
-        # Geoapify IP Geolocation
-        if GEOAPIFY_API_KEY and GEOAPIFY_API_KEY != "YOUR_GEOAPIFY_API_KEY":
-            geo_url = f"https://api.geoapify.com/v1/ipinfo?ip={ip_address}&apiKey={GEOAPIFY_API_KEY}"
-            try:
-                geo_response = requests.get(geo_url, timeout=10)
-                if geo_response.status_code == 200:
-                    geo_data = geo_response.json()
-                    results += "--- IP Geolocation (Geoapify) ---\n"
-                    if 'city' in geo_data and 'name' in geo_data['city']:
-                        results += f"City: {geo_data['city']['name']}\n"
-                    if 'state' in geo_data and 'name' in geo_data['state']:
-                        results += f"State: {geo_data['state']['name']}\n"
-                    if 'country' in geo_data and 'name' in geo_data['country']:
-                        results += f"Country: {geo_data['country']['name']}\n"
-                    if 'location' in geo_data:
-                        results += f"Latitude: {geo_data['location']['latitude']}, Longitude: {geo_data['location']['longitude']}\n"
-                    results += "\n"
-                else:
-                    results += f"Error with Geoapify IP Geolocation: {geo_response.status_code} - {geo_response.text}\n\n"
-            except requests.exceptions.RequestException as e:
-                results += f"Network error during Geoapify API call: {e}\n\n"
-            except Exception as e:
-                results += f"An unexpected error occurred during Geoapify IP Geolocation: {e}\n\n"
-        else:
-            results += "Geoapify API key not configured. Please add your API key to config.py to use IP geolocation.\n\n"
+            return SocialMediaResult(username, f"Error during social media username enumeration: {e}")
+
+    def social_media_result(self, username):
+        return run_sync(self.social_media_result_async(username))
 
-        # WHOIS Lookup
-        results += "--- IP WHOIS Lookup ---\n"
+    def social_media_results(self, usernames):
+        """Yield a SocialMediaResult per distinct username as each finishes"""
+        from social_scanner import get_social_scanner
+        return get_social_scanner().iter_scan(usernames)
+
+    def enumerate_social_media_username(self, username):
+        return self.social_media_result(username).format()
+
+    def geolocate_ip_local(self, ip_address, index=None):
+        """Look up an IP in the offline database (IP_GEO_DB_PATH); None on a miss"""
+        if index is None:
+            index = get_ip_geo_index()
+        if index is None:
+            return None
         try:
-            w = whois.whois(ip_address)
-            results += str(w)
+            location = index.lookup(ip_address)
+        except ValueError:
+            return None
+        if location is None:
+            return None
+        return dict(location, source="Local database", error=None)
+
+    async def geolocate_ip_async(self, ip_address, use_api=False):
+        """
+        Geolocate an IP. Returns a dict of city, state, country, latitude and
+        longitude (None when unknown), the source, and an "error" message that
+        is None on success. The offline database is tried first when one is
+        configured; Geoapify is used on a miss or when use_api is True.
+        """
+        if not use_api and IP_GEO_DB_PATH:
+            index = get_ip_geo_index(load=False)
+            if index is None:
+                # First use: loading the range file must not stall the loop
+                try:
+                    index = await asyncio.get_running_loop().run_in_executor(None, get_ip_geo_index)
+                except (OSError, ValueError, ImportError):
+                    # An unusable database file falls back to Geoapify
+                    index = None
+            local = self.geolocate_ip_local(ip_address, index) if index is not None else None
+            if local is not None:
+                return local
+
+        import aiohttp
+        from http_client import get_http_client
+        geo = {"source": "Geoapify", "city": None, "state": None, "country": None,
+               "latitude": None, "longitude": None, "error": None}
+        if not GEOAPIFY_API_KEY or GEOAPIFY_API_KEY == "YOUR_GEOAPIFY_API_KEY":
+            geo["error"] = "Geoapify API key not configured. Please add your API key to config.py to use IP geolocation."
+            return geo
+
+        geo_url = f"{GEOAPIFY_API_URL}/ipinfo"
+        try:
+            geo_response = await get_http_client().get(geo_url, params={"ip": ip_address, "apiKey": GEOAPIFY_API_KEY})
+            if geo_response.status == 200:
+                geo_data = geo_response.json()
+                for field in ("city", "state", "country"):
+                    geo[field] = (geo_data.get(field) or {}).get("name")
+                if 'location' in geo_data:
+                    geo["latitude"] = geo_data['location']['latitude']
+                    geo["longitude"] = geo_data['location']['longitude']
+            else:
+                geo["error"] = f"Error with Geoapify IP Geolocation: {geo_response.status} - {geo_response.text}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            geo["error"] = f"Network error during Geoapify API call: {e}"
         except Exception as e:
-            results += f"Error performing IP WHOIS lookup: {e}\n"
-        
-        return results
+            geo["error"] = f"An unexpected error occurred during Geoapify IP Geolocation: {e}"
+        return geo
+
+    def whois_ip(self, ip_address):
+        """
+        WHOIS an IP at its regional registry, through the cache. Returns
+        {"server": registry queried, "summary": the registry's answer without
+        comment lines, "block": CIDR of the allocation, or None}.
+        """
+        def query():
+            server, text = query_ip_whois(ip_address)
+            lines = [line.rstrip() for line in text.splitlines()
+                     if line.strip() and not line.lstrip().startswith(("%", "#"))]
+            summary = f"Registry: {server}\n" + "\n".join(lines) + "\n"
+            return {"server": server, "summary": summary, "block": allocated_block(text, ip_address)}
+
+        return get_ip_whois_cache().lookup(ip_address, query)
+
+    async def ip_address_result_async(self, ip_address, use_api=False):
+        # Geolocation and WHOIS run side by side; WHOIS is blocking, so it
+        # goes to the loop's thread pool
+        geo, whois_result = await asyncio.gather(
+            self.geolocate_ip_async(ip_address, use_api),
+            asyncio.get_running_loop().run_in_executor(None, self.whois_ip, ip_address),
+            return_exceptions=True
+        )
+        if isinstance(geo, Exception):
+            geo = {"error": f"An unexpected error occurred during Geoapify IP Geolocation: {geo}"}
+        if isinstance(whois_result, Exception):
+            whois_result = {"error": f"Error performing IP WHOIS lookup: {whois_result}"}
+        return IPResult(ip_address, geolocation=geo, whois=whois_result)
+
+    async def analyze_ip_address_async(self, ip_address, use_api=False):
+        return (await self.ip_address_result_async(ip_address, use_api)).format()
+
+    def ip_address_result(self, ip_address, use_api=False):
+        return run_sync(self.ip_address_result_async(ip_address, use_api))
+
+    def analyze_ip_address(self, ip_address, use_api=False):
+        return self.ip_address_result(ip_address, use_api).format()
@@ -0,0 +1,288 @@
+import csv
+import json
+import sys
+
+
+class AnalysisResult:
+    """
+    The structured outcome of one analyzer run. Subclasses name their data
+    attributes in `fields`; every result also carries the `query` it was run
+    for and an `error` message that is None on success. format() renders
+    the same text the GUI has always shown, to_dict() is what gets exported.
+    """
+
+    kind = None
+    fields = ()
+    __slots__ = ("query", "error")
+
+    def __init__(self, query, error=None, **values):
+        self.query = query
+        self.error = error
+        for field in self.fields:
+            setattr(self, field, values.pop(field, None))
+        if values:
+            raise TypeError(f"Unknown fields for {type(self).__name__}: {', '.join(values)}")
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.fields)
+        return f"{type(self).__name__}(query={self.query!r}, {values}, error={self.error!r})"
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def to_dict(self):
+        data = {"kind": self.kind, "query": self.query}
+        for field in self.fields:
+            data[field] = getattr(self, field)
+        data["error"] = self.error
+        return data
+
+    @staticmethod
+    def from_dict(data):
+        """Rebuild a result from to_dict() output, e.g. a line of an exported JSONL file"""
+        data = dict(data)
+        result_type = RESULT_TYPES[data.pop("kind")]
+        return result_type(data.pop("query"), data.pop("error", None), **data)
+
+    def format(self):
+        raise NotImplementedError
+
+
+class PhoneInfoResult(AnalysisResult):
+    kind = "phone_info"
+    __slots__ = fields = ("is_valid", "parsed", "region", "timezones")
+
+    def format(self):
+        if self.error:
+            return self.error
+        if not self.is_valid:
+            return "Invalid phone number."
+        result = "--- Phone Number Basic Info ---\n"
+        result += f"Parsed Phone Number: {self.parsed}\n"
+        result += f"Region: {self.region}\n"
+        result += f"Time Zone(s): {', '.join(self.timezones)}\n"
+        return result
+
+
+class PhoneCarrierResult(AnalysisResult):
+    kind = "phone_carrier"
+    __slots__ = fields = ("is_valid", "carrier")
+
+    def format(self):
+        if self.error:
+            return self.error
+        if not self.is_valid:
+            return "Invalid phone number."
+        return f"--- Phone Number ISP ---\nISP: {self.carrier}\n"
+
+
+class PhoneValidationResult(AnalysisResult):
+    kind = "phone_validation"
+    __slots__ = fields = ("is_valid",)
+
+    def format(self):
+        if self.error:
+            return self.error
+        return f"--- Phone Number Validation ---\nIs Valid: {self.is_valid}\n"
+
+
+class PhoneNumberResult(AnalysisResult):
+    """Every PhoneAnalyzer check for one number, as batch_analyzer.analyze_number() reports it"""
+
+    kind = "phone"
+    __slots__ = fields = ("is_valid", "reason", "international", "national", "e164", "region", "region_code",
+                          "country_code", "carrier", "timezone", "number_type")
+
+    @classmethod
+    def from_analysis(cls, data):
+        """Build a result from an analyze_number() dict"""
+        data = dict(data)
+        return cls(data.pop("input"), data.pop("error", None), **data)
+
+    def format(self):
+        if self.error:
+            return self.error
+        if not self.is_valid:
+            return f"Invalid phone number: {self.reason}"
+        result = "--- Phone Number ---\n"
+        result += f"International: {self.international}\n"
+        result += f"Region: {self.region}\n"
+        result += f"Carrier: {self.carrier}\n"
+        result += f"Number Type: {self.number_type}\n"
+        result += f"Time Zone(s): {', '.join(self.timezone)}\n"
+        return result
+
+
+class DomainWhoisResult(AnalysisResult):
+    kind = "domain_whois"
+    __slots__ = fields = ("domain", "text")
+
+    def format(self):
+        return self.error or self.text
+
+
+class BreachResult(AnalysisResult):
+    """breaches: [{"name", "title", "domain", "date", "pwn_count", "data_classes"}]"""
+
+    kind = "breach"
+    __slots__ = fields = ("breaches",)
+
+    def format(self):
+        if self.error:
+            return self.error
+        if not self.breaches:
+            return f"No breaches found for {self.query}."
+        result = f"Breaches found for {self.query}:\n"
+        for breach in self.breaches:
+            result += f"  - {breach['title']} (Domain: {breach['domain']}, Date: {breach['date']})\n"
+        return result
+
+
+class SocialMediaResult(AnalysisResult):
+    """
+    profiles: [{"platform", "status", "url", "message"}], status being one of
+    "found", "available", "invalid", "error" or "skipped"
+    """
+
+    kind = "social_media"
+    __slots__ = fields = ("profiles",)
+
+    def format(self):
+        if self.error:
+            return self.error
+        output = f"--- Social Media Username Enumeration for {self.query} ---\n"
+        for profile in self.profiles:
+            if profile["status"] == "found":
+                output += f"  - {profile['platform']}: Found (URL: {profile['url']})\n"
+            elif profile["status"] == "invalid":
+                output += f"  - {profile['platform']}: Invalid/Unavailable\n"
+            elif profile["status"] in ("error", "skipped"):
+                output += f"  - {profile['platform']}: {profile['status'].capitalize()} ({profile['message']})\n"
+        if not any(profile["status"] == "found" for profile in self.profiles):
+            output += "No profiles found for this username on supported platforms.\n"
+        return output
+
+
+class HoleheResult(AnalysisResult):
+    """sites: {site: holehe's details for it}"""
+
+    kind = "holehe"
+    __slots__ = fields = ("sites",)
+
+    def format(self):
+        if self.error:
+            return self.error
+        if not self.sites:
+            return "No OSINT results found."
+        return "".join(self.format_site(service, data) for service, data in self.sites.items())
+
+    @staticmethod
+    def format_site(service, data):
+        output = f"Service: {service}\n"
+        for key, value in data.items():
+            output += f"  {key}: {value}\n"
+        return output + "\n"
+
+
+class IPResult(AnalysisResult):
+    """
+    geolocation: OSINTAnalyzer.geolocate_ip_async() dict;
+    whois: {"server", "summary", "block"} or {"error"}
+    """
+
+    kind = "ip"
+    __slots__ = fields = ("geolocation", "whois")
+
+    def format(self):
+        if self.error:
+            return self.error
+        geo = self.geolocation
+        if geo.get("error"):
+            results = f"{geo['error']}\n\n"
+        else:
+            results = f"--- IP Geolocation ({geo['source']}) ---\n"
+            if geo["city"] is not None:
+                results += f"City: {geo['city']}\n"
+            if geo["state"] is not None:
+                results += f"State: {geo['state']}\n"
+            if geo["country"] is not None:
+                results += f"Country: {geo['country']}\n"
+            if geo["latitude"] is not None:
+                results += f"Latitude: {geo['latitude']}, Longitude: {geo['longitude']}\n"
+            results += "\n"
+        results += "--- IP WHOIS Lookup ---\n"
+        if self.whois.get("error"):
+            results += f"{self.whois['error']}\n"
+        else:
+            results += self.whois["summary"]
+        return results
+
+
+RESULT_TYPES = {result_type.kind: result_type for result_type in (
+    PhoneInfoResult, PhoneCarrierResult, PhoneValidationResult, PhoneNumberResult, DomainWhoisResult,
+    BreachResult, SocialMediaResult, HoleheResult, IPResult
+)}
+
+# CSV exports share one header so mixed result kinds stream into one file
+CSV_FIELDS = ["kind", "query"]
+for _result_type in RESULT_TYPES.values():
+    CSV_FIELDS.extend(field for field in _result_type.fields if field not in CSV_FIELDS)
+CSV_FIELDS.append("error")
+
+
+class ResultExporter:
+    """
+    Write AnalysisResults to JSONL or CSV as they arrive, one line each.
+    CSV rows leave fields of other result kinds empty and JSON-encode list
+    and dict values. Each result is flushed as soon as it is written, so an
+    interrupted export keeps everything written before the interruption.
+    """
+
+    def __init__(self, path, output_format=None):
+        self.path = path
+        if output_format is None:
+            output_format = "csv" if path.lower().endswith(".csv") else "jsonl"
+        self.output_format = output_format
+        self.handle = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        self.csv_writer = None
+        self.count = 0
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(self.handle, fieldnames=CSV_FIELDS)
+            self.csv_writer.writeheader()
+
+    def write(self, result):
+        data = result.to_dict()
+        if self.csv_writer:
+            self.csv_writer.writerow({
+                key: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, tuple, dict)) else value
+                for key, value in data.items()
+            })
+        else:
+            self.handle.write(json.dumps(data, ensure_ascii=False, default=str) + "\n")
+        self.handle.flush()
+        self.count += 1
+
+    def write_many(self, results):
+        for result in results:
+            self.write(result)
+
+    def close(self):
+        self.handle.flush()
+        if self.handle is not sys.stdout:
+            self.handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+
+def read_exported_results(path):
+    """Stream AnalysisResults back from a JSONL export"""
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield AnalysisResult.from_dict(json.loads(line))
@@ -1,15 +1,21 @@
 import phonenumbers
-from phonenumbers import carrier, geocoder, timezone, PhoneNumberFormat
-from opencage.geocoder import OpenCageGeocode
 from colorama import Fore, Style
+from geocode_cache import CachedGeocoder, opencage_client
+from phone_record import to_phone_record
 
 class PhoneAnalyzer:
-    def __init__(self, phone_number, opencage_api_key):
-        self.raw_number = phone_number
+    def __init__(self, phone_number, opencage_api_key=None):
+        """phone_number may be a string or an already parsed PhoneRecord"""
+        self.geocoder = None
         try:
-            self.parsed_number = phonenumbers.parse(phone_number)
-            self.geocoder = OpenCageGeocode(opencage_api_key)
-            print(f"{Fore.GREEN}OpenCage API initialized successfully{Style.RESET_ALL}")
+            self.record = to_phone_record(phone_number)
+            self.raw_number = self.record.raw
+            self.parsed_number = self.record.parsed
+            # Headless/batch callers analyze numbers without a map, so the
+            # OpenCage client is only created when a key is supplied
+            if opencage_api_key:
+                self.geocoder = CachedGeocoder(opencage_client(opencage_api_key))
+                print(f"{Fore.GREEN}OpenCage API initialized successfully{Style.RESET_ALL}")
         except phonenumbers.NumberParseException:
             raise ValueError("Invalid phone number format")
 
@@ -22,7 +28,7 @@ class PhoneAnalyzer:
         - Have a valid country calling code
         - Match the numbering pattern for that country
         """
-        is_valid = phonenumbers.is_valid_number(self.parsed_number)
+        is_valid = self.record.is_valid
         validation_details = {
             "is_valid": is_valid,
             "reason": "Valid phone number" if is_valid else self._get_validation_error()
@@ -38,7 +44,7 @@ class PhoneAnalyzer:
         if not region:
             return "Invalid or missing country code"
             
-        number_length = len(phonenumbers.format_number(self.parsed_number, PhoneNumberFormat.NATIONAL).replace(" ", ""))
+        number_length = len(self.record.national.replace(" ", ""))
         if number_length < 5:
             return "Number is too short"
         if number_length > 15:
@@ -50,35 +56,23 @@ class PhoneAnalyzer:
         """Get basic information about the phone number"""
         return {
             "formatted": {
-                "international": phonenumbers.format_number(self.parsed_number, PhoneNumberFormat.INTERNATIONAL),
-                "national": phonenumbers.format_number(self.parsed_number, PhoneNumberFormat.NATIONAL),
-                "e164": phonenumbers.format_number(self.parsed_number, PhoneNumberFormat.E164)
+                "international": self.record.international,
+                "national": self.record.national,
+                "e164": self.record.e164
             },
-            "region": geocoder.description_for_number(self.parsed_number, "en"),
-            "carrier": carrier.name_for_number(self.parsed_number, "en"),
-            "timezone": timezone.time_zones_for_number(self.parsed_number)
+            "region": self.record.region,
+            "carrier": self.record.carrier,
+            "timezone": self.record.timezones
         }
 
     def get_region_code(self):
         """Get the region code for the phone number"""
-        return phonenumbers.region_code_for_number(self.parsed_number)
+        return self.record.region_code
+
+    def get_e164_number(self):
+        """Get the number in E164 format"""
+        return self.record.e164
 
     def get_number_type(self):
         """Get the type of the phone number"""
-        number_type = phonenumbers.number_type(self.parsed_number)
-        type_names = {
-            0: "FIXED_LINE",
-            1: "MOBILE",
-            2: "FIXED_LINE_OR_MOBILE",
-            3: "TOLL_FREE",
-            4: "PREMIUM_RATE",
-            5: "SHARED_COST",
-            6: "VOIP",
-            7: "PERSONAL_NUMBER",
-            8: "PAGER",
-            9: "UAN",
-            10: "UNKNOWN",
-            27: "EMERGENCY",
-            28: "VOICEMAIL"
-        }
-        return type_names.get(number_type, "UNKNOWN")
+        return self.record.number_type
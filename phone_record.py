@@ -0,0 +1,112 @@
+import phonenumbers
+from phonenumbers import PhoneNumberFormat
+
+NUMBER_TYPE_NAMES = {
+    0: "FIXED_LINE",
+    1: "MOBILE",
+    2: "FIXED_LINE_OR_MOBILE",
+    3: "TOLL_FREE",
+    4: "PREMIUM_RATE",
+    5: "SHARED_COST",
+    6: "VOIP",
+    7: "PERSONAL_NUMBER",
+    8: "PAGER",
+    9: "UAN",
+    10: "UNKNOWN",
+    27: "EMERGENCY",
+    28: "VOICEMAIL"
+}
+
+_UNSET = object()
+
+
+class PhoneRecord:
+    """
+    A phone number that is parsed and validated exactly once.
+    Region, carrier, timezones, number type and formatted strings are looked
+    up on first access and cached, so the same record can be passed to every
+    analyzer method without repeating the phonenumbers metadata work.
+    Raises phonenumbers.NumberParseException if the input cannot be parsed.
+    """
+
+    __slots__ = ("raw", "parsed", "is_valid", "_region", "_region_code", "_carrier",
+                 "_timezones", "_number_type", "_formats")
+
+    def __init__(self, phone_number):
+        self.raw = phone_number
+        self.parsed = phonenumbers.parse(phone_number)
+        self.is_valid = phonenumbers.is_valid_number(self.parsed)
+        self._region = _UNSET
+        self._region_code = _UNSET
+        self._carrier = _UNSET
+        self._timezones = _UNSET
+        self._number_type = _UNSET
+        self._formats = {}
+
+    def __repr__(self):
+        return f"PhoneRecord({self.raw!r})"
+
+    @property
+    def region(self):
+        """Geographic description, e.g. 'California'"""
+        if self._region is _UNSET:
+            # The geocoding/carrier/timezone tables are large, so they are
+            # only imported once a record actually needs them
+            from phonenumbers import geocoder
+            self._region = geocoder.description_for_number(self.parsed, "en")
+        return self._region
+
+    @property
+    def region_code(self):
+        """ISO country code, e.g. 'US'"""
+        if self._region_code is _UNSET:
+            self._region_code = phonenumbers.region_code_for_number(self.parsed)
+        return self._region_code
+
+    @property
+    def carrier(self):
+        if self._carrier is _UNSET:
+            from phonenumbers import carrier
+            self._carrier = carrier.name_for_number(self.parsed, "en")
+        return self._carrier
+
+    @property
+    def timezones(self):
+        if self._timezones is _UNSET:
+            from phonenumbers import timezone
+            self._timezones = timezone.time_zones_for_number(self.parsed)
+        return self._timezones
+
+    @property
+    def number_type(self):
+        """Number type name, e.g. 'MOBILE'"""
+        if self._number_type is _UNSET:
+            self._number_type = NUMBER_TYPE_NAMES.get(phonenumbers.number_type(self.parsed), "UNKNOWN")
+        return self._number_type
+
+    def format(self, number_format):
+        """Format the number with a PhoneNumberFormat value, caching the result"""
+        formatted = self._formats.get(number_format)
+        if formatted is None:
+            formatted = phonenumbers.format_number(self.parsed, number_format)
+            self._formats[number_format] = formatted
+        return formatted
+
+    @property
+    def international(self):
+        return self.format(PhoneNumberFormat.INTERNATIONAL)
+
+    @property
+    def national(self):
+        return self.format(PhoneNumberFormat.NATIONAL)
+
+    @property
+    def e164(self):
+        return self.format(PhoneNumberFormat.E164)
+
+
+def to_phone_record(phone_number):
+    """Return phone_number as a PhoneRecord, parsing it only if it is a string"""
+    if isinstance(phone_number, PhoneRecord):
+        return phone_number
+    return PhoneRecord(phone_number)
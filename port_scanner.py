@@ -0,0 +1,205 @@
+import asyncio
+import ipaddress
+import socket
+from async_runtime import get_background_loop, bounded_map
+from bulk_ip import expand_targets
+from config import PORT_SCAN_CONCURRENCY, PORT_SCAN_TIMEOUT, PORT_SCAN_PORTS, PORT_SCAN_MAX_HOSTS
+
+# nmap's 100 most common TCP ports (what `nmap -F` scans)
+TOP_100_PORTS = (
+    7, 9, 13, 21, 22, 23, 25, 26, 37, 53, 79, 80, 81, 88, 106, 110, 111, 113, 119, 135,
+    139, 143, 144, 179, 199, 389, 427, 443, 444, 445, 465, 513, 514, 515, 543, 544, 548, 554,
+    587, 631, 646, 873, 990, 993, 995, 1025, 1026, 1027, 1028, 1029, 1110, 1433, 1720, 1723,
+    1755, 1900, 2000, 2001, 2049, 2121, 2717, 3000, 3128, 3306, 3389, 3986, 4899, 5000, 5009,
+    5051, 5060, 5101, 5190, 5357, 5432, 5631, 5666, 5800, 5900, 6000, 6001, 6646, 7070, 8000,
+    8008, 8009, 8080, 8081, 8443, 8888, 9100, 9999, 10000, 32768, 49152, 49153, 49154, 49155,
+    49156, 49157
+)
+
+# Named port sets accepted wherever a port specification is
+PORT_SETS = {
+    "top100": TOP_100_PORTS,
+    "web": (80, 81, 443, 591, 3000, 5000, 8000, 8008, 8080, 8081, 8443, 8888, 9000, 9443),
+    "mail": (25, 110, 143, 465, 587, 993, 995),
+    "remote": (22, 23, 3389, 5800, 5900, 5901),
+    "database": (1433, 1521, 3306, 5432, 6379, 9200, 11211, 27017),
+    "all": range(1, 65536),
+}
+
+
+def parse_ports(spec):
+    """
+    Parse a port specification such as "top100", "22,80,8000-8100" or
+    "web,3306" into a sorted tuple of unique ports. Raises ValueError.
+    """
+    if not isinstance(spec, str):
+        ports = set(int(port) for port in spec)
+    else:
+        ports = set()
+        for part in spec.replace(" ", "").split(","):
+            if not part:
+                continue
+            if part.lower() in PORT_SETS:
+                ports.update(PORT_SETS[part.lower()])
+            elif "-" in part:
+                first, last = part.split("-", 1)
+                ports.update(range(int(first), int(last) + 1))
+            else:
+                ports.add(int(part))
+    if not ports:
+        raise ValueError("No ports to scan")
+    if min(ports) < 1 or max(ports) > 65535:
+        raise ValueError("Ports must be between 1 and 65535")
+    return tuple(sorted(ports))
+
+
+def split_targets(text):
+    """Split user input on commas and whitespace into target strings"""
+    return [part for part in text.replace(",", " ").split() if part]
+
+
+def service_name(port):
+    try:
+        return socket.getservbyport(port, "tcp")
+    except OSError:
+        return "unknown"
+
+
+def _raise_open_file_limit(wanted):
+    """Raise the soft open-file limit toward `wanted` sockets; returns the usable concurrency"""
+    try:
+        import resource
+    except ImportError:
+        # Windows has no RLIMIT_NOFILE; its socket limits are far higher
+        return wanted
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = wanted + 64
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+    if soft == resource.RLIM_INFINITY:
+        return wanted
+    # Leave room for the files and sockets the rest of the app has open
+    return max(1, min(wanted, soft - 64))
+
+
+class PortScanner:
+    """
+    Asyncio TCP connect scanner; needs no nmap and no raw sockets.
+    Host names are resolved, IPs and CIDR ranges are expanded, and
+    (host, port) probes run with at most `concurrency` connects in flight,
+    ports interleaved across hosts so no single target sees a burst. Open
+    ports are produced as soon as they answer.
+    """
+
+    def __init__(self, ports=PORT_SCAN_PORTS, concurrency=PORT_SCAN_CONCURRENCY, timeout=PORT_SCAN_TIMEOUT,
+                 max_hosts=PORT_SCAN_MAX_HOSTS):
+        self.ports = parse_ports(ports)
+        self.concurrency = _raise_open_file_limit(concurrency)
+        self.timeout = timeout
+        self.max_hosts = max_hosts
+
+    async def resolve(self, targets):
+        """
+        Expand targets into [(target, ip, error)]. IPs and CIDR ranges are
+        expanded locally; anything else is resolved as a host name.
+        """
+        loop = asyncio.get_running_loop()
+        hosts = []
+        names = []
+        for target in targets:
+            for ip, error in expand_targets([target], self.max_hosts):
+                if error and "/" not in target and not _looks_like_ip(target):
+                    names.append(target)
+                else:
+                    hosts.append((target, None if error else ip, error))
+
+        async def lookup(name):
+            try:
+                infos = await loop.getaddrinfo(name, None, type=socket.SOCK_STREAM)
+            except (socket.gaierror, UnicodeError) as e:
+                return name, None, f"Could not resolve {name}: {e}"
+            # Prefer IPv4, which is what most scan targets answer on
+            infos.sort(key=lambda info: info[0] != socket.AF_INET)
+            return name, infos[0][4][0], None
+
+        hosts.extend(await asyncio.gather(*[lookup(name) for name in dict.fromkeys(names)]))
+        if len(hosts) > self.max_hosts:
+            raise ValueError(f"{len(hosts)} hosts to scan (limit {self.max_hosts})")
+        return hosts
+
+    async def probe(self, ip, port):
+        """Return "open", "closed" or "filtered" for one TCP port"""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), self.timeout)
+        except asyncio.TimeoutError:
+            return "filtered"
+        except ConnectionRefusedError:
+            return "closed"
+        except OSError:
+            # Unreachable network/host and similar
+            return "filtered"
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return "open"
+
+    async def scan_iter(self, targets):
+        """
+        Async generator of events as the scan runs:
+        {"event": "host", "target", "ip", "error"} once per host, then
+        {"event": "open", "target", "ip", "port", "service"} per open port.
+        """
+        hosts = await self.resolve(targets)
+        live = []
+        for target, ip, error in hosts:
+            yield {"event": "host", "target": target, "ip": ip, "error": error}
+            if ip is not None:
+                live.append((target, ip))
+
+        def probes():
+            for port in self.ports:
+                for target, ip in live:
+                    yield target, ip, port
+
+        async def check(probe):
+            target, ip, port = probe
+            return target, ip, port, await self.probe(ip, port)
+
+        async for target, ip, port, state in bounded_map(check, probes(), self.concurrency):
+            if state == "open":
+                yield {"event": "open", "target": target, "ip": ip, "port": port, "service": service_name(port)}
+
+    async def scan(self, targets):
+        """
+        Scan and return {ip: {"target", "open": [(port, service)], "error"}}
+        with open ports sorted; targets that failed are keyed by themselves.
+        """
+        results = {}
+        async for event in self.scan_iter(targets):
+            if event["event"] == "host":
+                results.setdefault(event["ip"] or event["target"],
+                                   {"target": event["target"], "open": [], "error": event["error"]})
+            elif event["ip"] in results and (event["port"], event["service"]) not in results[event["ip"]]["open"]:
+                results[event["ip"]]["open"].append((event["port"], event["service"]))
+        for result in results.values():
+            result["open"].sort()
+        return results
+
+    def iter_scan(self, targets):
+        """Run scan_iter() on the background loop and yield events to a sync caller"""
+        return get_background_loop().iterate(self.scan_iter(targets))
+
+
+def _looks_like_ip(text):
+    try:
+        ipaddress.ip_address(text)
+        return True
+    except ValueError:
+        return False
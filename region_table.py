@@ -0,0 +1,85 @@
+import csv
+import gzip
+import io
+import threading
+from config import REGION_TABLE_PATH
+
+# Column order of the region table (tab separated, gzip compressed)
+REGION_TABLE_FIELDS = ("country_code", "description", "latitude", "longitude", "zoom")
+
+
+def region_key(country_code, description):
+    """Lookup key: country calling code plus the exact geocoder description"""
+    return int(country_code), " ".join(str(description).split()).lower()
+
+
+class RegionTable:
+    """
+    Precomputed coordinates for the region descriptions phonenumbers can
+    return ("Jersey City, NJ", "Germany", ...), keyed by country calling code
+    so identical names in different countries stay apart. Built offline by
+    tools/build_region_table.py; lookups need no network I/O.
+    """
+
+    def __init__(self, entries=None):
+        self._entries = dict(entries or {})
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as handle:
+            reader = csv.reader(handle, delimiter="\t")
+            header = next(reader, None)
+            if header is None:
+                return cls()
+            entries = {}
+            for row in reader:
+                try:
+                    entries[region_key(row[0], row[1])] = (float(row[2]), float(row[3]), int(row[4]))
+                except (IndexError, ValueError):
+                    continue
+        return cls(entries)
+
+    def save(self, path, descriptions):
+        """Write the table; `descriptions` maps keys back to their display text"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter="\t", lineterminator="\n")
+        writer.writerow(REGION_TABLE_FIELDS)
+        for key in sorted(self._entries):
+            latitude, longitude, zoom = self._entries[key]
+            writer.writerow([key[0], descriptions.get(key, key[1]), f"{latitude:.5f}", f"{longitude:.5f}", zoom])
+        # mtime=0 keeps rebuilds of unchanged data byte-identical
+        with open(path, "wb") as f, gzip.GzipFile(fileobj=f, mode="wb", mtime=0) as gz:
+            gz.write(buffer.getvalue().encode("utf-8"))
+
+    def add(self, country_code, description, latitude, longitude, zoom):
+        self._entries[region_key(country_code, description)] = (latitude, longitude, zoom)
+
+    def lookup(self, country_code, description):
+        """Return (latitude, longitude, zoom) for a region description, or None"""
+        if not description:
+            return None
+        return self._entries.get(region_key(country_code, description))
+
+    def lookup_record(self, record):
+        """Look up a PhoneRecord's region description"""
+        return self.lookup(record.parsed.country_code, record.region)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_region_table():
+    """Return the shipped RegionTable, loading it once; empty if the file is missing"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                try:
+                    _table = RegionTable.load(REGION_TABLE_PATH)
+                except (OSError, EOFError):
+                    _table = RegionTable()
+    return _table
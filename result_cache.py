@@ -0,0 +1,155 @@
+import hashlib
+import ipaddress
+import json
+import threading
+import time
+from collections import OrderedDict
+from sqlite_cache import SQLiteCache
+from config import (RESULT_CACHE_PATH, RESULT_CACHE_MEMORY_ENTRIES, RESULT_CACHE_MAX_ENTRIES,
+                    RESULT_CACHE_DEFAULT_TTL, RESULT_CACHE_TTLS)
+from osint_results import AnalysisResult
+
+
+def normalize_target(target):
+    """
+    Canonical form of a lookup target so equivalent spellings share a cache
+    entry: phone numbers as E.164, IPs in compressed form, everything else
+    trimmed and lower-cased. Tuples (target plus options) are normalized
+    element by element.
+    """
+    if isinstance(target, (tuple, list)):
+        return "\x1f".join(normalize_target(part) for part in target)
+    if hasattr(target, "e164"):
+        # A PhoneRecord
+        return target.e164
+    text = str(target).strip()
+    try:
+        return ipaddress.ip_address(text).compressed
+    except ValueError:
+        pass
+    if text.startswith("+"):
+        import phonenumbers
+        try:
+            return phonenumbers.format_number(phonenumbers.parse(text), phonenumbers.PhoneNumberFormat.E164)
+        except phonenumbers.NumberParseException:
+            pass
+    return text.lower()
+
+
+def result_key(analyzer, target):
+    """sha256 hex digest of (analyzer, normalized target)"""
+    return hashlib.sha256(f"{analyzer}\x1e{normalize_target(target)}".encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache of analysis results.
+    An in-memory LRU of `memory_entries` sits in front of a SQLiteCache that
+    survives restarts. Each analyzer has its own TTL (`ttls`), checked in
+    both tiers. Values must be JSON serializable; lookup_result() stores
+    AnalysisResults and never caches ones that carry an error.
+    """
+
+    def __init__(self, path=RESULT_CACHE_PATH, ttls=RESULT_CACHE_TTLS, default_ttl=RESULT_CACHE_DEFAULT_TTL,
+                 memory_entries=RESULT_CACHE_MEMORY_ENTRIES, max_entries=RESULT_CACHE_MAX_ENTRIES):
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.memory_entries = memory_entries
+        self.disk = SQLiteCache(path, "results", None, max_entries)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl(self, analyzer):
+        return self.ttls.get(analyzer, self.default_ttl)
+
+    def get(self, analyzer, target):
+        """Return the cached value, or None on a miss or once the analyzer's TTL has passed"""
+        key = result_key(analyzer, target)
+        ttl = self.ttl(analyzer)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if ttl and now - entry[0] > ttl:
+                    del self._memory[key]
+                else:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+        stored = self.disk.get(key, ttl)
+        if stored is None:
+            return None
+        self._remember(key, stored["created"], stored["value"])
+        return stored["value"]
+
+    def set(self, analyzer, target, value):
+        key = result_key(analyzer, target)
+        now = time.time()
+        # Round-trip through JSON so memory hits return the same shapes as disk hits
+        value = json.loads(json.dumps(value))
+        self.disk.set(key, {"created": now, "value": value})
+        self._remember(key, now, value)
+
+    def _remember(self, key, created, value):
+        with self._lock:
+            self._memory[key] = (created, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def invalidate(self, analyzer, target):
+        key = result_key(analyzer, target)
+        with self._lock:
+            self._memory.pop(key, None)
+        self.disk.delete(key)
+
+    def lookup(self, analyzer, target, compute, refresh=False):
+        """
+        Return the cached value, or compute(), store and return it. With
+        refresh=True the cached value is ignored and replaced.
+        """
+        if not refresh:
+            value = self.get(analyzer, target)
+            if value is not None:
+                return value
+        value = compute()
+        if value is not None:
+            self.set(analyzer, target, value)
+        return value
+
+    def get_result(self, analyzer, target):
+        data = self.get(analyzer, target)
+        return AnalysisResult.from_dict(data) if data is not None else None
+
+    def set_result(self, analyzer, target, result):
+        if not result.error:
+            self.set(analyzer, target, result.to_dict())
+
+    def lookup_result(self, analyzer, target, compute, refresh=False):
+        """lookup() for AnalysisResults; failed results are returned but not cached"""
+        if not refresh:
+            result = self.get_result(analyzer, target)
+            if result is not None:
+                return result
+        result = compute()
+        self.set_result(analyzer, target, result)
+        return result
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def close(self):
+        self.disk.close()
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide ResultCache, opening it on first use"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ResultCache()
+        return _shared_cache
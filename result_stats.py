@@ -0,0 +1,208 @@
+import argparse
+import json
+import sys
+import numpy as np
+
+# Result fields stored as categorical codes
+CATEGORICAL_FIELDS = ("region_code", "country_code", "carrier", "number_type", "reason")
+
+# Label used for missing/empty categorical values
+MISSING = "(none)"
+
+
+class Categories:
+    """Maps category values to dense integer codes and back"""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value):
+        if value is None or value == "":
+            value = MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+class ResultStats:
+    """
+    Columnar store of analysis results for fast breakdowns.
+    Each categorical field is an int32 array of codes and validity is a bool
+    array, so every group-by is a single np.bincount over the columns instead
+    of a loop over result dicts. Timezones are multi-valued and kept as a
+    (row, timezone code) pair of arrays. Rows are appended in chunks, so the
+    store can be fed straight from a batch run of any size.
+    """
+
+    def __init__(self, chunk_size=65536):
+        self.chunk_size = chunk_size
+        self.categories = {field: Categories() for field in CATEGORICAL_FIELDS}
+        self.timezones = Categories()
+        self._chunks = {field: [] for field in CATEGORICAL_FIELDS + ("is_valid", "tz_row", "tz_code")}
+        self._buffer = {field: [] for field in self._chunks}
+        self._rows = 0
+        self._columns = None
+
+    def add(self, result):
+        """Append one result dict (as produced by batch_analyzer.analyze_number)"""
+        buffer = self._buffer
+        for field in CATEGORICAL_FIELDS:
+            buffer[field].append(self.categories[field].encode(result.get(field)))
+        buffer["is_valid"].append(bool(result.get("is_valid")))
+        for timezone in result.get("timezone") or ():
+            buffer["tz_row"].append(self._rows)
+            buffer["tz_code"].append(self.timezones.encode(timezone))
+        self._rows += 1
+        self._columns = None
+        if len(buffer["is_valid"]) >= self.chunk_size:
+            self._flush()
+
+    def extend(self, results):
+        for result in results:
+            self.add(result)
+        return self
+
+    @classmethod
+    def from_results(cls, results):
+        return cls().extend(results)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a batch_analyzer output file (JSONL or CSV)"""
+        from batch_analyzer import read_results
+        return cls.from_results(read_results(path))
+
+    def _flush(self):
+        dtypes = {"is_valid": np.bool_, "tz_row": np.int64}
+        for field, values in self._buffer.items():
+            if values:
+                self._chunks[field].append(np.array(values, dtype=dtypes.get(field, np.int32)))
+                values.clear()
+
+    def column(self, field):
+        """Return a field's full column as one array"""
+        if self._columns is None:
+            self._flush()
+            dtypes = {"is_valid": np.bool_, "tz_row": np.int64}
+            self._columns = {}
+            for field_name, chunks in self._chunks.items():
+                if len(chunks) > 1:
+                    # Merge once so later queries do not concatenate again
+                    chunks[:] = [np.concatenate(chunks)]
+                self._columns[field_name] = chunks[0] if chunks else np.zeros(0, dtype=dtypes.get(field_name, np.int32))
+        return self._columns[field]
+
+    def __len__(self):
+        return self._rows
+
+    def _ranked(self, values, counts):
+        order = np.argsort(-counts, kind="stable")
+        return [(values[i], int(counts[i])) for i in order if counts[i]]
+
+    def counts(self, field):
+        """[(value, count)] for a categorical field, most common first"""
+        categories = self.categories[field]
+        counts = np.bincount(self.column(field), minlength=len(categories))
+        return self._ranked(categories.values, counts)
+
+    def valid_counts(self):
+        valid = int(np.count_nonzero(self.column("is_valid")))
+        return {"total": self._rows, "valid": valid, "invalid": self._rows - valid}
+
+    def timezone_counts(self, valid_only=False):
+        """[(timezone, numbers)] over every timezone each number belongs to"""
+        codes = self.column("tz_code")
+        if valid_only:
+            codes = codes[self.column("is_valid")[self.column("tz_row")]]
+        counts = np.bincount(codes, minlength=len(self.timezones))
+        return self._ranked(self.timezones.values, counts)
+
+    def invalid_rate_by(self, field="country_code"):
+        """[(value, total, invalid, invalid rate)] for a categorical field, most numbers first"""
+        categories = self.categories[field]
+        codes = self.column(field)
+        totals = np.bincount(codes, minlength=len(categories))
+        invalid = np.bincount(codes[~self.column("is_valid")], minlength=len(categories))
+        rates = np.divide(invalid, totals, out=np.zeros(len(categories)), where=totals > 0)
+        order = np.argsort(-totals, kind="stable")
+        return [(categories.values[i], int(totals[i]), int(invalid[i]), float(rates[i]))
+                for i in order if totals[i]]
+
+    def crosstab(self, row_field, column_field):
+        """Counts of every (row value, column value) pair as a 2-D array plus both label lists"""
+        rows, columns = self.categories[row_field], self.categories[column_field]
+        pairs = self.column(row_field).astype(np.int64) * len(columns) + self.column(column_field)
+        table = np.bincount(pairs, minlength=len(rows) * len(columns)).reshape(len(rows), len(columns))
+        return table, rows.values, columns.values
+
+    def summary(self, top=10):
+        """Every breakdown as plain Python data, truncated to `top` entries each"""
+        return {
+            **self.valid_counts(),
+            "by_region_code": self.counts("region_code")[:top],
+            "by_carrier": self.counts("carrier")[:top],
+            "by_number_type": self.counts("number_type")[:top],
+            "by_reason": self.counts("reason")[:top],
+            "by_timezone": self.timezone_counts()[:top],
+            "invalid_rate_by_country_code": self.invalid_rate_by("country_code")[:top],
+        }
+
+
+def country_label(country_code):
+    """Label a calling code with its main region, e.g. 44 -> '+44 (GB)'"""
+    if country_code == MISSING:
+        return MISSING
+    import phonenumbers
+    region = phonenumbers.region_code_for_country_code(int(country_code))
+    return f"+{country_code} ({region})"
+
+
+def format_summary(stats, top=10):
+    """Render ResultStats as the plain-text report shown by the CLI and the GUI"""
+    totals = stats.valid_counts()
+    lines = [f"Total numbers: {totals['total']}",
+             f"Valid: {totals['valid']}", f"Invalid: {totals['invalid']}", ""]
+    if not totals["total"]:
+        return "\n".join(lines)
+
+    def section(title, rows):
+        lines.append(f"--- {title} ---")
+        for value, count in rows[:top]:
+            lines.append(f"{value}: {count} ({count / totals['total']:.1%})")
+        lines.append("")
+
+    section("By Country", stats.counts("region_code"))
+    section("By Carrier", stats.counts("carrier"))
+    section("By Number Type", stats.counts("number_type"))
+    section("By Validation Result", stats.counts("reason"))
+    section("By Timezone", stats.timezone_counts())
+    # Grouped by calling code: invalid numbers rarely resolve to a region code
+    lines.append("--- Invalid Rate by Country ---")
+    for value, total, invalid, rate in stats.invalid_rate_by("country_code")[:top]:
+        lines.append(f"{country_label(value)}: {invalid}/{total} invalid ({rate:.1%})")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate statistics over batch analysis results")
+    parser.add_argument("input", help="batch_analyzer output (.jsonl or .csv, '-' for stdin)")
+    parser.add_argument("--top", type=int, default=10, help="Entries to show per breakdown (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Print the breakdowns as JSON")
+    args = parser.parse_args(argv)
+    stats = ResultStats.from_file(args.input)
+    if args.json:
+        print(json.dumps(stats.summary(args.top), ensure_ascii=False, indent=2))
+    else:
+        print(format_summary(stats, args.top), end="")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import asyncio
+import re
+import weakref
+from async_runtime import TokenBucket, get_background_loop, bounded_map, as_async_iter
+from config import (SOCIAL_SCAN_CONCURRENCY, SOCIAL_PLATFORM_CONCURRENCY, SOCIAL_PLATFORM_DEFAULT_RPM,
+                    SOCIAL_PLATFORM_RPM, SOCIAL_PLATFORM_MAX_FAILURES)
+from osint_results import SocialMediaResult
+
+# Usernames each platform accepts at sign-up. Names that break these rules
+# would only come back "invalid", so they are not sent at all.
+USERNAME_RULES = {
+    "GitHub": re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9]|-(?=[A-Za-z0-9])){0,38}$"),
+    "GitLab": re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.-]{1,254}$"),
+    "Instagram": re.compile(r"^[A-Za-z0-9._]{1,30}$"),
+    "Reddit": re.compile(r"^[A-Za-z0-9_-]{3,20}$"),
+    "Twitter": re.compile(r"^[A-Za-z0-9_]{4,15}$"),
+    "Tumblr": re.compile(r"^[A-Za-z0-9-]{1,32}$"),
+}
+
+
+def username_platforms():
+    """socialscan platforms that can check usernames (the rest are email-only)"""
+    from socialscan.platforms import Platforms, UsernameQueryable
+    return [platform for platform in Platforms if issubclass(platform.value, UsernameQueryable)]
+
+
+def _profile(platform, status, url=None, message=None):
+    return {"platform": str(platform), "status": status, "url": url, "message": message}
+
+
+class SocialScanner:
+    """
+    Username enumeration over socialscan's async API.
+    One aiohttp session and one set of platform checkers is kept per event
+    loop, so sign-up tokens and connections are reused across usernames.
+    Every platform has its own in-flight cap and request rate, a platform
+    that keeps failing (usually a soft ban) is skipped for the rest of the
+    run, and usernames a platform would reject are never sent to it.
+    """
+
+    def __init__(self, concurrency=SOCIAL_SCAN_CONCURRENCY, platform_concurrency=SOCIAL_PLATFORM_CONCURRENCY,
+                 default_rpm=SOCIAL_PLATFORM_DEFAULT_RPM, platform_rpm=SOCIAL_PLATFORM_RPM,
+                 max_failures=SOCIAL_PLATFORM_MAX_FAILURES):
+        self.concurrency = concurrency
+        self.platform_concurrency = platform_concurrency
+        self.default_rpm = default_rpm
+        self.platform_rpm = dict(platform_rpm)
+        self.max_failures = max_failures
+        self._states = weakref.WeakKeyDictionary()
+
+    def _state(self):
+        """Return this loop's {"session", "checkers", "limits"}, creating it on first use"""
+        import aiohttp
+        from socialscan.util import init_checkers
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None or state["session"].closed:
+            session = aiohttp.ClientSession()
+            platforms = username_platforms()
+            limits = {}
+            for platform in platforms:
+                rpm = self.platform_rpm.get(str(platform), self.default_rpm)
+                limits[platform] = (asyncio.Semaphore(self.platform_concurrency), TokenBucket(rpm / 60.0))
+            state = {"session": session, "checkers": init_checkers(session, platforms=platforms), "limits": limits}
+            self._states[loop] = state
+        return state
+
+    async def _check(self, username, platform, state, failures):
+        from socialscan.util import query
+        rule = USERNAME_RULES.get(str(platform))
+        if rule is not None and not rule.match(username):
+            return _profile(platform, "invalid", message="Not a valid username on this platform")
+        if failures.get(platform, 0) >= self.max_failures:
+            return _profile(platform, "skipped", message="Skipped after repeated failures")
+        semaphore, bucket = state["limits"][platform]
+        async with semaphore:
+            await bucket.acquire()
+            try:
+                response = await query(username, platform, state["checkers"])
+            except (asyncio.TimeoutError, OSError) as e:
+                response = None
+                error = f"{type(e).__name__} - {e}"
+            else:
+                error = "No response" if response is None else response.message
+        if response is None or not response.success:
+            failures[platform] = failures.get(platform, 0) + 1
+            return _profile(platform, "error", message=error)
+        failures[platform] = 0
+        if not response.valid:
+            return _profile(platform, "invalid", message=response.message)
+        if response.available:
+            return _profile(platform, "available")
+        return _profile(platform, "found", url=response.link)
+
+    async def _scan(self, username, state, failures):
+        profiles = await asyncio.gather(*[
+            self._check(username, platform, state, failures) for platform in state["checkers"]
+        ])
+        return SocialMediaResult(username, profiles=list(profiles))
+
+    async def scan(self, username):
+        """Check one username on every platform and return a SocialMediaResult"""
+        return await self._scan(username, self._state(), {})
+
+    async def scan_many(self, usernames):
+        """
+        Async generator of SocialMediaResults, one per distinct username, in
+        completion order. `usernames` may be a sync or async iterable.
+        """
+        state = self._state()
+        failures = {}
+
+        async def scan(username):
+            return await self._scan(username, state, failures)
+
+        async for result in bounded_map(scan, _unique_usernames(usernames), self.concurrency):
+            yield result
+
+    def iter_scan(self, usernames):
+        """Run scan_many() on the background loop and yield results to a sync caller"""
+        return get_background_loop().iterate(self.scan_many(usernames))
+
+    async def close(self):
+        state = self._states.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state["session"].close()
+
+
+async def _unique_usernames(usernames):
+    """Strip blanks and drop usernames already seen, ignoring case"""
+    seen = set()
+    async for username in as_async_iter(usernames):
+        username = username.strip().lstrip("@")
+        if username and username.lower() not in seen:
+            seen.add(username.lower())
+            yield username
+
+
+_social_scanner = SocialScanner()
+get_background_loop().add_shutdown_hook(_social_scanner.close)
+
+
+def get_social_scanner():
+    """Return the process-wide SocialScanner"""
+    return _social_scanner
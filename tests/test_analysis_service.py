@@ -0,0 +1,65 @@
+import asyncio
+import job_scheduler
+from analysis_service import AnalysisService, default_analyzers
+from result_cache import ResultCache
+
+
+class FakeOSINT:
+    def __init__(self):
+        self.domains = []
+
+    def email_domain_result(self, target):
+        self.domains.append(target)
+        return FakeResult(target)
+
+
+class FakeResult:
+    def __init__(self, query):
+        self.query = query
+
+    def to_dict(self):
+        return {"kind": "whois", "query": self.query, "error": None}
+
+
+def test_default_scheduler_follows_the_service_limits(monkeypatch):
+    created = []
+
+    class RecordingScheduler(job_scheduler.JobScheduler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    monkeypatch.setattr(job_scheduler, "JobScheduler", RecordingScheduler)
+    osint = FakeOSINT()
+    analyzers = default_analyzers(osint=osint, limits={"phone": 8, "whois": 6})
+    scheduler = created[-1]
+    assert scheduler.max_workers == 14
+    assert scheduler._limit("phone") == 8 and scheduler._limit("whois") == 6
+    assert asyncio.run(analyzers["whois"]("example.com"))["query"] == "example.com"
+    assert osint.domains == ["example.com"]
+
+    default_analyzers(osint=osint, limits={"phone": 1, "whois": 1})
+    assert created[-1].max_workers == 2 and created[-1]._limit("phone") == 1
+
+
+def test_refresh_does_not_join_a_cached_request(tmp_path):
+    calls = []
+
+    async def echo(target):
+        calls.append(target)
+        await asyncio.sleep(0.05)
+        return {"query": target, "call": len(calls), "error": None}
+
+    cache = ResultCache(str(tmp_path / "results.db"), ttls={}, default_ttl=3600)
+    cache.set("echo", "abc", {"query": "abc", "call": 0, "error": None})
+    service = AnalysisService({"echo": echo}, limits={"echo": 4}, cache=cache)
+
+    async def run():
+        return await asyncio.gather(service.analyze("echo", "abc"), service.analyze("echo", "abc", refresh=True),
+                                    service.analyze("echo", "abc", refresh=True))
+
+    cached, fresh, shared = asyncio.run(run())
+    assert cached["call"] == 0
+    assert fresh["call"] == 1 and shared["call"] == 1
+    assert calls == ["abc"]
+    assert service.coalesced == 1
@@ -0,0 +1,84 @@
+import asyncio
+import json
+from aiohttp.test_utils import TestClient, TestServer
+from analysis_service import AnalysisService
+from api_server import create_app
+from result_cache import ResultCache
+
+
+def make_service(tmp_path, calls, delay=0.05, max_pending=10):
+    async def echo(target):
+        calls.append(target)
+        await asyncio.sleep(delay)
+        if target == "bad":
+            return {"query": target, "error": "provider failed"}
+        return {"query": target, "length": len(target), "error": None}
+
+    cache = ResultCache(str(tmp_path / "results.db"), ttls={}, default_ttl=3600)
+    return AnalysisService({"echo": echo}, limits={"echo": 4}, max_pending=max_pending, cache=cache)
+
+
+def with_client(service, test):
+    async def run():
+        async with TestClient(TestServer(create_app(service))) as client:
+            return await test(client)
+    return asyncio.run(run())
+
+
+def test_concurrent_identical_requests_are_coalesced(tmp_path):
+    calls = []
+    service = make_service(tmp_path, calls)
+
+    async def test(client):
+        responses = await asyncio.gather(*[client.get("/v1/echo", params={"target": "abc"}) for _ in range(5)])
+        bodies = [await response.json() for response in responses]
+        assert all(body["length"] == 3 for body in bodies)
+        # Served from the result cache once the first call finished
+        again = await client.get("/v1/echo", params={"target": "ABC "})
+        assert (await again.json())["length"] == 3
+
+    with_client(service, test)
+    assert calls == ["abc"]
+    assert service.coalesced == 4
+
+
+def test_errors_map_to_status_codes(tmp_path):
+    async def test(client):
+        assert (await client.get("/v1/nope", params={"target": "x"})).status == 404
+        assert (await client.get("/v1/echo", params={"target": " "})).status == 400
+        failed = await client.get("/v1/echo", params={"target": "bad"})
+        assert failed.status == 200 and (await failed.json())["error"] == "provider failed"
+
+    calls = []
+    with_client(make_service(tmp_path, calls), test)
+
+
+def test_full_service_answers_503(tmp_path):
+    calls = []
+    service = make_service(tmp_path, calls, delay=0.3, max_pending=2)
+
+    async def test(client):
+        responses = await asyncio.gather(*[client.get("/v1/echo", params={"target": f"t{n}"}) for n in range(4)])
+        statuses = sorted(response.status for response in responses)
+        assert statuses == [200, 200, 503, 503]
+        assert [r for r in responses if r.status == 503][0].headers["Retry-After"] == "1"
+
+    with_client(service, test)
+
+
+def test_batch_streams_every_target(tmp_path):
+    calls = []
+    service = make_service(tmp_path, calls, max_pending=3)
+
+    async def test(client):
+        targets = [f"t{n}" for n in range(20)] + ["t1"]
+        response = await client.post("/v1/echo/batch", json={"targets": targets})
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in (await response.text()).splitlines()]
+        assert sorted(line["target"] for line in lines) == sorted(targets)
+        plain = await client.post("/v1/echo/batch", data="x1\n\nx2\n")
+        assert len((await plain.text()).splitlines()) == 2
+
+    with_client(service, test)
+    # The batch waits for room instead of failing, and the repeat is coalesced or cached
+    assert len(calls) == 22
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+import pytest
+from async_runtime import BackgroundLoop, TokenBucket, bounded_map
+
+
+@pytest.fixture
+def background():
+    loop = BackgroundLoop(name="test-loop")
+    yield loop
+    loop.stop()
+
+
+def test_iterate_yields_items_as_they_arrive(background):
+    threads = []
+
+    async def numbers():
+        for number in range(3):
+            threads.append(threading.current_thread().name)
+            await asyncio.sleep(0.01)
+            yield number
+
+    assert list(background.iterate(numbers())) == [0, 1, 2]
+    assert set(threads) == {"test-loop"}
+
+
+def test_iterate_raises_generator_errors(background):
+    async def failing():
+        yield 1
+        raise KeyError("boom")
+
+    items = background.iterate(failing())
+    assert next(items) == 1
+    with pytest.raises(KeyError):
+        next(items)
+
+
+def test_closing_iterate_cancels_the_generator(background):
+    cancelled = threading.Event()
+
+    async def endless():
+        try:
+            while True:
+                yield 1
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    items = background.iterate(endless())
+    assert next(items) == 1
+    items.close()
+    assert cancelled.wait(2)
+
+
+def test_run_submit_and_shutdown_hooks(background):
+    hooks = []
+
+    async def hook():
+        hooks.append(threading.current_thread().name)
+
+    async def double(value):
+        return value * 2
+
+    background.add_shutdown_hook(hook)
+    assert background.run(double(21)) == 42
+    future = background.submit(asyncio.sleep(10))
+    background.cancel_all()
+    assert future.cancelled()
+    background.stop()
+    assert hooks == ["test-loop"]
+
+
+def test_bounded_map_caps_concurrency():
+    in_flight = []
+    peak = []
+
+    async def work(item):
+        in_flight.append(item)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(item)
+        return item * 2
+
+    async def run():
+        return [result async for result in bounded_map(work, range(10), 3)]
+
+    assert sorted(asyncio.run(run())) == [value * 2 for value in range(10)]
+    assert max(peak) == 3
+
+
+def test_token_bucket_paces_requests():
+    async def run():
+        bucket = TokenBucket(rate=20.0)
+        started = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # One token up front, then four at 20/s
+    assert asyncio.run(run()) >= 0.18
+
+
+def test_token_bucket_pause_blocks_until_deadline():
+    async def run():
+        bucket = TokenBucket(rate=1000.0)
+        bucket.pause(0.2)
+        started = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.19
@@ -0,0 +1,62 @@
+from batch_analyzer import BatchPhoneAnalyzer, analyze_number, read_numbers, read_results
+from osint_results import PhoneNumberResult
+from phone_record import to_phone_record
+from result_cache import ResultCache
+
+
+def test_read_numbers_from_each_input_format(tmp_path):
+    text = tmp_path / "numbers.txt"
+    text.write_text("+14155552671\n\n  +442071838750  \n")
+    assert list(read_numbers(str(text))) == ["+14155552671", "+442071838750"]
+
+    with_header = tmp_path / "with_header.csv"
+    with_header.write_text("name,Phone_Number\nalice,+14155552671\nbob,\ncarol,+442071838750\n")
+    assert list(read_numbers(str(with_header))) == ["+14155552671", "+442071838750"]
+
+    # Without a recognised header the first column is used and the first row is data
+    no_header = tmp_path / "no_header.csv"
+    no_header.write_text("+14155552671,x\n+442071838750,y\n")
+    assert list(read_numbers(str(no_header))) == ["+14155552671", "+442071838750"]
+
+    jsonl = tmp_path / "numbers.jsonl"
+    jsonl.write_text('{"msisdn": "+14155552671"}\n"+442071838750"\n{"other": 1}\n\n')
+    assert list(read_numbers(str(jsonl))) == ["+14155552671", "+442071838750"]
+
+
+def test_analyze_number_reports_valid_invalid_and_unparseable():
+    valid = analyze_number("+14155552671")
+    assert valid["is_valid"] and valid["e164"] == "+14155552671" and valid["region_code"] == "US"
+    assert valid["error"] is None
+
+    invalid = analyze_number("+1415555")
+    assert not invalid["is_valid"] and invalid["country_code"] == 1 and invalid["error"] is None
+
+    unparseable = analyze_number("not a number")
+    assert unparseable["is_valid"] is False and unparseable["error"]
+
+
+def test_analyze_file_round_trips_through_csv(tmp_path):
+    source = tmp_path / "numbers.txt"
+    source.write_text("+14155552671\n+1415555\n+442071838750\n")
+    output = tmp_path / "results.csv"
+    summary = BatchPhoneAnalyzer(workers=1, chunk_size=2).analyze_file(str(source), str(output))
+    assert summary == {"total": 3, "valid": 2, "invalid": 1}
+
+    results = {result["input"]: result for result in read_results(str(output))}
+    assert set(results) == {"+14155552671", "+1415555", "+442071838750"}
+    assert results["+442071838750"]["is_valid"] is True
+    assert results["+442071838750"]["country_code"] == 44
+    assert isinstance(results["+14155552671"]["timezone"], list)
+    assert results["+1415555"]["is_valid"] is False
+
+
+def test_phone_results_are_shared_between_the_service_and_the_gui(tmp_path):
+    record = to_phone_record("+1 415-555-2671")
+    assert analyze_number(record)["input"] == "+1 415-555-2671"
+
+    # The service caches the result dict under the target; the GUI looks it up by PhoneRecord
+    cache = ResultCache(str(tmp_path / "results.db"))
+    service_result = PhoneNumberResult.from_analysis(analyze_number("+14155552671"))
+    cache.set("phone", "+14155552671", service_result.to_dict())
+    assert cache.lookup_result("phone", record, lambda: None) == service_result
+    cache.close()
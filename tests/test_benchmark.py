@@ -0,0 +1,45 @@
+import json
+
+from tools import benchmark
+
+
+def test_synthetic_numbers_are_reproducible():
+    numbers = benchmark.synthetic_numbers(200)
+    assert numbers == benchmark.synthetic_numbers(200)
+    assert numbers != benchmark.synthetic_numbers(200, seed=2)
+    assert sum(number.startswith("not-a-number") for number in numbers) == 200 // benchmark.UNPARSEABLE_EVERY
+
+
+def test_report_and_baseline_regression(tmp_path, capsys):
+    report_path = tmp_path / "now.json"
+    assert benchmark.main(["--numbers", "50", "--repeat", "1", "--filter", "results.",
+                           "--json", str(report_path)]) == 0
+    report = json.loads(report_path.read_text())
+    assert set(report["benchmarks"]) == {"results.format", "results.to_json"}
+    for result in report["benchmarks"].values():
+        assert result["ops"] == 50
+        assert result["ops_per_sec"] > 0
+        assert result["p50_us"] <= result["p99_us"]
+
+    # A baseline ten times faster than anything measured has to fail the check
+    for result in report["benchmarks"].values():
+        result["ops_per_sec"] *= 10
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(report))
+    assert benchmark.main(["--numbers", "50", "--repeat", "1", "--filter", "results.",
+                           "--baseline", str(baseline_path), "--max-regression", "50"]) == 1
+    assert "Slower than the baseline" in capsys.readouterr().out
+
+
+def test_validate_benchmark_parses_and_explains_invalid_numbers(monkeypatch):
+    from phone_analyzer import PhoneAnalyzer
+    explained = []
+    explain = PhoneAnalyzer._get_validation_error
+    monkeypatch.setattr(PhoneAnalyzer, "_get_validation_error", lambda self: explained.append(1) or explain(self))
+    [validate] = [bench for bench in benchmark.benchmarks("unused") if bench.name == "phone_analyzer.validate_number"]
+    numbers = validate.setup(100)
+    assert all(isinstance(number, str) for number in numbers)
+    for number in numbers:
+        validate.op(number)
+    # Every INVALID_EVERY-th number is cut short, except where an unparseable one takes its place
+    assert len(explained) >= 100 // benchmark.INVALID_EVERY - 100 // benchmark.UNPARSEABLE_EVERY
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from breach_scheduler import BulkBreachChecker, _retry_after
+from http_client import HTTPResponse
+from osint_results import BreachResult
+
+
+class FakeHIBP:
+    """Stands in for OSINTAnalyzer's HIBP calls"""
+
+    def __init__(self, rate_limited=0, retry_after="0.2"):
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.requests = []
+
+    def hibp_configured(self):
+        return True
+
+    async def request_breaches(self, email_address):
+        self.requests.append((email_address, time.monotonic()))
+        if self.rate_limited:
+            self.rate_limited -= 1
+            return HTTPResponse(429, "", {"Retry-After": self.retry_after})
+        return HTTPResponse(404, "", {})
+
+    def breach_result_from_response(self, email_address, response):
+        return BreachResult(email_address, breaches=[])
+
+
+async def _collect(checker, emails):
+    return [item async for item in checker.check_many(emails)]
+
+
+def test_retry_after_parsing():
+    assert _retry_after(HTTPResponse(429, "", {"Retry-After": "3"})) == 3.0
+    assert _retry_after(HTTPResponse(429, "", {"Retry-After": "soon"})) == 2.0
+    assert _retry_after(HTTPResponse(429, "", {})) == 2.0
+    assert _retry_after(HTTPResponse(429, "", {"Retry-After": "0"})) == 0.1
+
+
+def test_429_is_retried_after_retry_after():
+    hibp = FakeHIBP(rate_limited=1, retry_after="0.3")
+    checker = BulkBreachChecker(hibp, rate_per_minute=6000, concurrency=1)
+    results = asyncio.run(_collect(checker, ["a@example.com"]))
+    assert results == [("a@example.com", BreachResult("a@example.com", breaches=[]))]
+    assert len(hibp.requests) == 2
+    assert hibp.requests[1][1] - hibp.requests[0][1] >= 0.29
+
+
+def test_gives_up_after_max_retries():
+    hibp = FakeHIBP(rate_limited=10, retry_after="0.01")
+    checker = BulkBreachChecker(hibp, rate_per_minute=60000, concurrency=1, max_retries=2)
+    results = asyncio.run(_collect(checker, ["a@example.com"]))
+    error = "Error checking breaches: rate limited after 2 retries"
+    assert results == [("a@example.com", BreachResult("a@example.com", error))]
+    assert len(hibp.requests) == 3
+
+
+def test_duplicates_and_blanks_are_checked_once():
+    hibp = FakeHIBP()
+    checker = BulkBreachChecker(hibp, rate_per_minute=60000, concurrency=3)
+    emails = ["a@example.com", " A@Example.com ", "", "b@example.com", "a@EXAMPLE.com"]
+    results = asyncio.run(_collect(checker, emails))
+    assert sorted(email for email, _ in results) == ["a@example.com", "b@example.com"]
+    assert sorted(email for email, _ in hibp.requests) == ["a@example.com", "b@example.com"]
+
+
+def test_unconfigured_key_is_rejected():
+    hibp = FakeHIBP()
+    hibp.hibp_configured = lambda: False
+    checker = BulkBreachChecker(hibp, rate_per_minute=60)
+    try:
+        asyncio.run(_collect(checker, ["a@example.com"]))
+    except ValueError as e:
+        assert "HIBP API key not configured" in str(e)
+    else:
+        raise AssertionError("check_many() should reject a missing key")
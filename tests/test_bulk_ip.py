@@ -0,0 +1,94 @@
+import asyncio
+import time
+from bulk_ip import BulkIPAnalyzer, WhoisBlockIndex, expand_targets
+
+
+class CountingDict(dict):
+    probes = 0
+
+    def get(self, key, default=None):
+        CountingDict.probes += 1
+        return super().get(key, default)
+
+
+def test_block_index_prefers_the_most_specific_block():
+    index = WhoisBlockIndex()
+    index.add("10.0.0.0/8", "outer")
+    index.add("10.1.0.0/16", "middle")
+    index.add("10.1.2.0/24", "inner")
+    index.add("2001:db8::/32", "v6")
+    assert index.find("10.1.2.3") == "inner"
+    assert index.find("10.1.3.3") == "middle"
+    assert index.find("10.200.0.1") == "outer"
+    assert index.find("11.0.0.1") is None
+    assert index.find("2001:db8::1") == "v6"
+    assert index.find("2001:db9::1") is None
+    assert len(index) == 4
+
+
+def test_block_index_miss_does_not_scan_every_block():
+    index = WhoisBlockIndex()
+    for n in range(5000):
+        index.add(f"10.{n // 256}.{n % 256}.0/24", n)
+    index.add("172.16.0.0/12", "private")
+    index._tables = {key: CountingDict(table) for key, table in index._tables.items()}
+
+    CountingDict.probes = 0
+    assert index.find("192.168.1.1") is None
+    # One probe per distinct prefix length, not one per indexed block
+    assert CountingDict.probes == 2
+    assert index.find("10.3.4.5") == 3 * 256 + 4
+
+
+def test_expand_targets_dedupes_and_reports_bad_entries():
+    targets = ["10.0.0.1", "10.0.0.0/30", "", "# comment", "not-an-ip", "10.0.0.0/16", "10.0.0.9/32"]
+    expanded = list(expand_targets(targets, max_hosts=256))
+    assert [ip for ip, error in expanded if error is None] == ["10.0.0.1", "10.0.0.2", "10.0.0.9"]
+    errors = [(target, error) for target, error in expanded if error]
+    assert [target for target, _ in errors] == ["not-an-ip", "10.0.0.0/16"]
+    assert "limit 256" in errors[1][1]
+
+
+class FakeWhoisAnalyzer:
+    """Answers every address in 10.0.0.0/16 with one registry block"""
+
+    def __init__(self):
+        self.queries = []
+
+    def whois_ip(self, ip):
+        self.queries.append(ip)
+        time.sleep(0.05)
+        return {"server": "whois.example", "summary": "NetName: EXAMPLE\n", "block": "10.0.0.0/16"}
+
+    async def geolocate_ip_async(self, ip, use_api=False):
+        return {"source": "fake", "city": None, "error": None}
+
+
+def test_bulk_analysis_sends_one_whois_query_per_block():
+    analyzer = FakeWhoisAnalyzer()
+    bulk = BulkIPAnalyzer(analyzer, concurrency=20, whois_concurrency=4)
+
+    async def run():
+        return [result async for result in bulk.analyze(["10.0.0.0/28", "10.0.1.5", "bogus"])]
+
+    results = asyncio.run(run())
+    assert len(results) == 16
+    answered = [result for result in results if result["error"] is None]
+    assert len(answered) == 15
+    assert all(result["whois"]["block"] == "10.0.0.0/16" for result in answered)
+    # Addresses in one /24 wait for the first lookup instead of sending their own
+    assert sum(ip.startswith("10.0.0.") for ip in analyzer.queries) == 1
+    assert len(analyzer.queries) <= 2
+    assert [result["error"] for result in results if result["error"]][0].startswith("Invalid IP")
+
+
+def test_answered_block_covers_later_addresses_in_other_subnets():
+    analyzer = FakeWhoisAnalyzer()
+    bulk = BulkIPAnalyzer(analyzer, concurrency=1, geolocate=False)
+
+    async def run():
+        return [result async for result in bulk.analyze(["10.0.0.1", "10.0.200.7", "10.0.77.1"])]
+
+    results = asyncio.run(run())
+    assert [result["whois"]["block"] for result in results] == ["10.0.0.0/16"] * 3
+    assert analyzer.queries == ["10.0.0.1"]
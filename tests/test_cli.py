@@ -0,0 +1,80 @@
+import argparse
+import asyncio
+import csv
+from analysis_service import AnalysisService
+from cli import plan, run, target_kind
+from osint_results import SocialMediaResult, read_exported_results
+from result_cache import ResultCache
+
+
+def test_targets_are_classified_and_routed():
+    assert target_kind("8.8.8.8") == "ip"
+    assert target_kind("2001:db8::1") == "ip"
+    assert target_kind("a.b@example.com") == "email"
+    assert target_kind("+1 (415) 555-2671") == "phone"
+    assert target_kind("+1") == "phone"
+    assert target_kind("john_doe") == "username"
+    targets = ["+14155552671", "a@example.com", "example.com", "john_doe"]
+    assert list(plan(targets, ["auto"])) == [
+        ("phone", "+14155552671", None), ("breach", "a@example.com", None), ("username", "example.com", None),
+        ("username", "john_doe", None)
+    ]
+    assert list(plan(targets, ["breach", "whois"])) == [
+        ("breach", "+14155552671", "no selected analyzer accepts a phone target"),
+        ("breach", "a@example.com", None), ("whois", "a@example.com", None), ("whois", "example.com", None),
+        ("breach", "john_doe", "no selected analyzer accepts a username target")
+    ]
+    assert list(plan(["+1"], ["auto"])) == [("phone", "+1", None)]
+
+
+def test_run_streams_results_with_rate_and_jobs(tmp_path):
+    inputs = tmp_path / "targets.txt"
+    inputs.write_text("alice\n\nbob\nalice\n+14155552671\n")
+    output = tmp_path / "out.jsonl"
+    in_flight = []
+    peak = []
+
+    async def username(target):
+        in_flight.append(target)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.02)
+        in_flight.remove(target)
+        profiles = [{"platform": "Example", "status": "found", "url": f"https://example.com/{target}", "message": None}]
+        return SocialMediaResult(target, None if target != "bob" else "not found", profiles=profiles).to_dict()
+
+    service = AnalysisService({"username": username}, limits={"username": 4}, max_pending=4,
+                              cache=ResultCache(str(tmp_path / "results.db"), ttls={}, default_ttl=3600))
+    args = argparse.Namespace(inputs=[str(inputs)], analyzers="username", jobs=2, rate=200.0, output=str(output),
+                              format=None, refresh=False, no_progress=True)
+    summary = asyncio.run(run(args, service))
+    results = list(read_exported_results(str(output)))
+    # The phone number is reported as skipped rather than dropped
+    assert summary == {"total": 4, "errors": 2}
+    assert sorted(result.query for result in results) == ["+14155552671", "alice", "alice", "bob"]
+    assert all(result.kind == "social_media" for result in results)
+    skipped = [result for result in results if result.query == "+14155552671"][0]
+    assert skipped.error == "no selected analyzer accepts a phone target"
+    assert max(peak) <= 2
+
+
+def test_csv_output_shares_the_export_schema(tmp_path):
+    inputs = tmp_path / "targets.txt"
+    inputs.write_text("+14155552671\nbad\n")
+    output = tmp_path / "out.csv"
+
+    async def phone(target):
+        return {"kind": "phone", "query": target, "is_valid": True, "e164": target, "timezone": ["America/Los_Angeles"],
+                "error": None}
+
+    async def username(target):
+        raise RuntimeError("provider down")
+
+    service = AnalysisService({"phone": phone, "username": username}, limits={}, max_pending=4,
+                              cache=ResultCache(str(tmp_path / "results.db"), ttls={}, default_ttl=3600))
+    args = argparse.Namespace(inputs=[str(inputs)], analyzers="auto", jobs=2, rate=None, output=str(output),
+                              format=None, refresh=False, no_progress=True)
+    assert asyncio.run(run(args, service)) == {"total": 2, "errors": 1}
+    rows = {row["query"]: row for row in csv.DictReader(output.open(newline=""))}
+    assert list(rows["+14155552671"])[:2] == ["kind", "query"]
+    assert rows["+14155552671"]["kind"] == "phone" and rows["+14155552671"]["timezone"] == '["America/Los_Angeles"]'
+    assert rows["bad"]["kind"] == "social_media" and rows["bad"]["error"] == "provider down"
@@ -0,0 +1,50 @@
+from cluster_map import aggregate_points, build_cluster_map
+
+
+def test_labels_are_escaped_before_they_become_popups(tmp_path):
+    label = '<img src=x onerror="alert(1)">'
+    rows = aggregate_points([(52.5, 13.4, label)])
+    assert rows == [[52.5, 13.4, 1, "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;"]]
+
+    map_file = tmp_path / "map.html"
+    build_cluster_map([(52.5, 13.4, label)], str(map_file))
+    assert "<img src=x" not in map_file.read_text()
+
+
+def test_points_at_one_spot_merge_into_a_weighted_row():
+    points = [(52.500001, 13.400001, "first"), (52.500002, 13.400002, "second", 4), (48.85, 2.35, "paris", 2)]
+    assert aggregate_points(points) == [[52.5, 13.4, 5, "first"], [48.85, 2.35, 2, "paris"]]
+    # Coarser precision merges nearby spots too
+    assert aggregate_points([(52.51, 13.41, "a"), (52.512, 13.409, "b")], precision=1) == [[52.5, 13.4, 2, "a"]]
+    assert aggregate_points([]) == []
+
+
+def test_points_from_results_uses_coordinates_and_groups_regions(monkeypatch):
+    import cluster_map
+    from region_table import RegionTable
+    table = RegionTable()
+    table.add(1, "California", 36.7, -119.4, 6)
+    monkeypatch.setattr(cluster_map, "get_region_table", lambda: table)
+
+    class Geocoder:
+        queries = []
+
+        def geocode(self, query, **kwargs):
+            self.queries.append((query, kwargs))
+            return [{"geometry": {"lat": 51.5, "lng": -0.1}}]
+
+    results = [
+        {"e164": "+1", "latitude": 1.0, "longitude": 2.0},
+        {"is_valid": True, "region": "California", "region_code": "US"},
+        {"is_valid": True, "region": "California", "region_code": "US"},
+        {"is_valid": True, "region": "London", "region_code": "GB"},
+        {"is_valid": True, "region": "London", "region_code": "GB"},
+        {"is_valid": False, "region": "Nowhere", "region_code": "US"},
+    ]
+    geocoder = Geocoder()
+    points = cluster_map.points_from_results(results, geocoder)
+    assert (1.0, 2.0, "+1", 1) in points
+    assert (36.7, -119.4, "California (US): 2 numbers", 2) in points
+    assert (51.5, -0.1, "London (GB): 2 numbers", 2) in points
+    # One geocode per distinct region not in the table
+    assert geocoder.queries == [("London", {"countrycode": "gb", "limit": 1})]
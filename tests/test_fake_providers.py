@@ -0,0 +1,102 @@
+import asyncio
+import json
+from aiohttp.test_utils import TestClient, TestServer
+import osint_analyzer
+from breach_scheduler import BulkBreachChecker
+from fake_providers import FakeProviders, create_app, request_key
+from geocode_cache import opencage_client
+from http_client import get_http_client
+from osint_analyzer import OSINTAnalyzer
+
+
+def with_server(providers, test, host="127.0.0.1"):
+    async def run():
+        async with TestServer(create_app(providers), host=host) as server:
+            try:
+                return await test(server)
+            finally:
+                await get_http_client().close()
+    return asyncio.run(run())
+
+
+def test_analyzers_run_against_synthetic_providers(monkeypatch):
+    async def test(server):
+        base = str(server.make_url("")).rstrip("/")
+        monkeypatch.setattr(osint_analyzer, "HIBP_API_URL", base + "/api/v3")
+        monkeypatch.setattr(osint_analyzer, "GEOAPIFY_API_URL", base + "/v1")
+        analyzer = OSINTAnalyzer()
+        breaches = [await analyzer.breach_result_async(f"user{n}@example.com") for n in range(10)]
+        geo = await analyzer.geolocate_ip_async("203.0.113.7", use_api=True)
+
+        # The opencage client only accepts localhost, and is synchronous
+        geocoder = opencage_client("test-key", f"http://localhost:{server.port}")
+        places = await asyncio.get_running_loop().run_in_executor(None, geocoder.geocode, "Berlin, Germany")
+        return breaches, geo, places
+
+    breaches, geo, places = with_server(FakeProviders(), test, host="localhost")
+    assert all(result.error is None for result in breaches)
+    # Some addresses are "pwned" and some not, the same way on every run
+    assert 0 < sum(bool(result.breaches) for result in breaches) < 10
+    assert geo["error"] is None and geo["source"] == "Geoapify" and geo["city"].startswith("City ")
+    assert places[0]["formatted"] == "Berlin, Germany"
+
+
+def test_injected_429s_are_retried_by_the_breach_checker(monkeypatch):
+    providers = FakeProviders(rate_limit_rate=0.5, retry_after=0, seed=3)
+
+    async def test(server):
+        monkeypatch.setattr(osint_analyzer, "HIBP_API_URL", str(server.make_url("/api/v3")))
+        checker = BulkBreachChecker(rate_per_minute=60000, concurrency=4, max_retries=20)
+        return [item async for item in checker.check_many([f"user{n}@example.com" for n in range(20)])]
+
+    results = with_server(providers, test)
+    assert len(results) == 20
+    assert all(result.error is None for _, result in results)
+    assert providers.stats["hibp.429"] > 0
+    assert providers.stats["hibp.requests"] == 20 + providers.stats["hibp.429"]
+
+
+def test_record_then_replay(tmp_path):
+    upstream = FakeProviders()
+
+    async def test(upstream_server):
+        recorder = FakeProviders("record", str(tmp_path), upstreams={
+            "geoapify": str(upstream_server.make_url("")).rstrip("/")
+        })
+        async with TestClient(TestServer(create_app(recorder))) as client:
+            recorded = await client.get("/v1/ipinfo", params={"ip": "198.51.100.1", "apiKey": "secret"})
+            assert recorded.status == 200
+            return await recorded.json()
+
+    recorded = with_server(upstream, test)
+    fixture_files = list(tmp_path.rglob("*.json"))
+    assert len(fixture_files) == 1
+    assert "secret" not in fixture_files[0].read_text()
+
+    async def replay():
+        replayer = FakeProviders("replay", str(tmp_path))
+        async with TestClient(TestServer(create_app(replayer))) as client:
+            # The API key is not part of the fixture key, so any key replays it
+            hit = await client.get("/v1/ipinfo", params={"ip": "198.51.100.1", "apiKey": "other"})
+            miss = await client.get("/v1/ipinfo", params={"ip": "198.51.100.2", "apiKey": "other"})
+            return hit.status, await hit.json(), miss.status
+
+    status, replayed, miss_status = asyncio.run(replay())
+    assert (status, miss_status) == (200, 502)
+    assert replayed == recorded
+    assert json.loads(fixture_files[0].read_text())["key"] == request_key(
+        "geoapify", "/v1/ipinfo", {"ip": "198.51.100.1", "apiKey": "other"})
+
+
+def test_injected_errors_and_latency():
+    providers = FakeProviders(latency=0.05, error_rate=1.0)
+
+    async def test(server):
+        async with TestClient(server) as client:
+            started = asyncio.get_running_loop().time()
+            response = await client.get("/geocode/v1/json", params={"q": "Paris", "key": "k"})
+            return response.status, asyncio.get_running_loop().time() - started
+
+    status, elapsed = with_server(providers, test)
+    assert status == 500
+    assert elapsed >= 0.05
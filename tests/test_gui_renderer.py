@@ -0,0 +1,87 @@
+import tkinter as tk
+from gui_renderer import TkRenderQueue
+
+
+class FakeText:
+    """Records calls the way a Tk Text widget would receive them"""
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def insert(self, index, text):
+        self.log.append((self.name, "insert", text))
+
+    def delete(self, start, end):
+        self.log.append((self.name, "delete"))
+
+
+class FakeVar:
+    def __init__(self, log):
+        self.log = log
+
+    def set(self, value):
+        self.log.append(("status", "set", value))
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, fn):
+        self.scheduled.append(fn)
+
+
+def make_queue(chunk_chars=1000):
+    return TkRenderQueue(FakeRoot(), interval_ms=10, budget_ms=1000, chunk_chars=chunk_chars)
+
+
+def test_inserts_merge_and_sets_keep_the_last_value():
+    log = []
+    renderer = make_queue()
+    first, second, status = FakeText(log, "first"), FakeText(log, "second"), FakeVar(log)
+    for line in ("a\n", "b\n", "c\n"):
+        renderer.insert(first, line)
+    renderer.insert(second, "x")
+    renderer.set(status, "working")
+    renderer.set(status, "done")
+    renderer._drain()
+    assert log == [("first", "insert", "a\nb\nc\n"), ("second", "insert", "x"), ("status", "set", "done")]
+
+
+def test_clear_drops_pending_text_and_calls_keep_their_order():
+    log = []
+    renderer = make_queue()
+    text, status = FakeText(log, "text"), FakeVar(log)
+    renderer.insert(text, "stale")
+    renderer.clear(text)
+    renderer.insert(text, "fresh")
+    renderer.set(status, "before call")
+    renderer.call(lambda: log.append(("call",)))
+    renderer.insert(text, " after")
+    renderer._drain()
+    assert log == [("text", "delete"), ("text", "insert", "fresh"), ("status", "set", "before call"), ("call",),
+                   ("text", "insert", " after")]
+
+
+def test_large_text_is_split_and_destroyed_widgets_are_ignored():
+    log = []
+    renderer = make_queue(chunk_chars=4)
+    text = FakeText(log, "text")
+    renderer.insert(text, "abcdefghij")
+    assert len(renderer._ops) == 3
+
+    def destroyed(*args):
+        raise tk.TclError("invalid command name")
+    renderer.call(destroyed)
+    renderer._drain()
+    assert "".join(entry[2] for entry in log) == "abcdefghij"
+
+
+def test_tick_reschedules_itself_once():
+    renderer = make_queue()
+    renderer.start()
+    renderer.start()
+    assert renderer.root.scheduled == [renderer._tick]
+    renderer._tick()
+    assert renderer.root.scheduled == [renderer._tick, renderer._tick]
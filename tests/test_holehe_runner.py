@@ -0,0 +1,73 @@
+import asyncio
+import time
+import pytest
+from holehe_runner import HoleheRunner
+
+
+def fake_module(name, delay, exists=False, error=None):
+    async def module(email, client, out):
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        out.append({"name": name, "domain": f"{name}.com", "rateLimit": False, "exists": exists,
+                    "emailrecovery": None, "phoneNumber": None, "others": None})
+    module.__name__ = name
+    return module
+
+
+def make_runner(**kwargs):
+    runner = HoleheRunner(profiles={"fast": ["social", "-slow"], "loop": ["loop"]}, **kwargs)
+    runner._modules = {
+        "quick": fake_module("quick", 0.01, exists=True),
+        "slow": fake_module("slow", 5),
+        "broken": fake_module("broken", 0, error=RuntimeError("boom")),
+        "mail": fake_module("mail", 0.02),
+    }
+    runner._categories = {"quick": "social", "slow": "social", "broken": "other", "mail": "mails"}
+    return runner
+
+
+def test_select_expands_profiles_categories_and_exclusions():
+    runner = make_runner()
+    assert runner.select("all") == ["broken", "mail", "quick", "slow"]
+    assert runner.select("fast") == ["quick"]
+    assert runner.select("mails,broken") == ["broken", "mail"]
+    assert runner.select(["all", "-social"]) == ["broken", "mail"]
+    with pytest.raises(ValueError):
+        runner.select("nope")
+    with pytest.raises(ValueError):
+        runner.select("loop")
+
+
+def test_stream_yields_fast_sites_first_and_times_out_slow_ones():
+    runner = make_runner(module_timeout=0.3)
+
+    async def collect():
+        arrivals = []
+        start = time.monotonic()
+        async for site, details in runner.stream("a@example.com"):
+            arrivals.append((site, details, time.monotonic() - start))
+        await runner.close()
+        return arrivals
+
+    arrivals = asyncio.run(collect())
+    order = [site for site, _, _ in arrivals]
+    assert order[-1] == "slow" and set(order) == {"quick", "slow", "broken", "mail"}
+    details = {site: entry for site, entry, _ in arrivals}
+    assert details["quick"]["exists"] is True
+    assert "timed out" in details["slow"]["error"]
+    assert "boom" in details["broken"]["error"]
+    # The quick hit is reported long before the slow module gives up
+    assert next(elapsed for site, _, elapsed in arrivals if site == "quick") < 0.2
+
+
+def test_run_returns_sorted_results_for_a_subset():
+    runner = make_runner()
+
+    async def run():
+        try:
+            return await runner.run("a@example.com", "quick,mail")
+        finally:
+            await runner.close()
+
+    assert list(asyncio.run(run())) == ["mail", "quick"]
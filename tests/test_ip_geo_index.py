@@ -0,0 +1,68 @@
+import ipaddress
+import pytest
+from ip_geo_index import IPGeoIndex
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_headed_csv_range_lookup(tmp_path):
+    path = _write(tmp_path / "ranges.csv",
+                  "start_ip,end_ip,city,region,country,latitude,longitude\n"
+                  "1.0.0.0,1.0.0.255,Brisbane,Queensland,AU,-27.47,153.02\n"
+                  "8.8.8.0,8.8.8.255,Mountain View,California,US,37.4,-122.1\n"
+                  "2001:db8::,2001:db8::ffff,Amsterdam,,NL,,\n")
+    index = IPGeoIndex.from_csv(path)
+    assert len(index) == 3
+    assert index.lookup("8.8.8.8") == {"city": "Mountain View", "state": "California", "country": "US",
+                                       "latitude": 37.4, "longitude": -122.1}
+    assert index.lookup("1.0.0.0")["city"] == "Brisbane"
+    assert index.lookup("1.0.0.255")["city"] == "Brisbane"
+    assert index.lookup("1.0.1.0") is None
+    assert index.lookup("0.255.255.255") is None
+    assert index.lookup("2001:db8::1")["country"] == "NL"
+    assert index.lookup(ipaddress.ip_address("8.8.8.1"))["country"] == "US"
+
+
+def test_cidr_and_integer_bounds(tmp_path):
+    path = _write(tmp_path / "cidr.csv", "network,country_name\n10.0.0.0/8,Private\n")
+    assert IPGeoIndex.from_csv(path).lookup("10.200.0.1")["country"] == "Private"
+
+    start, end = int(ipaddress.ip_address("192.0.2.0")), int(ipaddress.ip_address("192.0.2.255"))
+    path = _write(tmp_path / "ints.csv", f"ip_start,ip_end,country\n{start},{end},TEST\n")
+    assert IPGeoIndex.from_csv(path).lookup("192.0.2.77")["country"] == "TEST"
+
+
+def test_headerless_dbip_layout(tmp_path):
+    path = _write(tmp_path / "dbip.csv", "1.0.0.0,1.0.0.255,OC,AU,Queensland,South Brisbane,-27.4766,153.017\n")
+    assert IPGeoIndex.from_csv(path).lookup("1.0.0.7") == {
+        "city": "South Brisbane", "state": "Queensland", "country": "AU",
+        "latitude": -27.4766, "longitude": 153.017}
+
+
+def test_unsorted_input_and_shared_locations(tmp_path):
+    rows = "".join(f"{n}.0.0.0,{n}.255.255.255,City{n % 2},,XX,,\n" for n in (9, 3, 7, 1))
+    index = IPGeoIndex.from_csv(_write(tmp_path / "unsorted.csv", "start,end,city,state,country,lat,lon\n" + rows))
+    assert index.lookup("3.1.2.3")["city"] == "City1"
+    assert index.lookup("2.0.0.1") is None
+    # Identical locations are stored once
+    assert len(index._locations) == 1
+
+
+def test_range_without_location_is_a_miss(tmp_path):
+    path = _write(tmp_path / "empty.csv", "start_ip,end_ip,city,country\n1.0.0.0,1.0.0.255,,\n")
+    assert IPGeoIndex.from_csv(path).lookup("1.0.0.1") is None
+
+
+def test_file_without_location_columns_is_rejected(tmp_path):
+    path = _write(tmp_path / "blocks.csv", "network,geoname_id,registered_country_geoname_id\n1.0.0.0/24,2077456,2077456\n")
+    with pytest.raises(ValueError):
+        IPGeoIndex.from_csv(path)
+
+
+def test_invalid_address_raises_value_error(tmp_path):
+    index = IPGeoIndex.from_csv(_write(tmp_path / "one.csv", "network,country\n10.0.0.0/8,X\n"))
+    with pytest.raises(ValueError):
+        index.lookup("not an ip")
@@ -0,0 +1,100 @@
+import threading
+import time
+from job_scheduler import JobScheduler
+
+
+def test_identical_jobs_are_coalesced():
+    scheduler = JobScheduler(max_workers=2)
+    release = threading.Event()
+    calls = []
+
+    def work(target):
+        calls.append(target)
+        release.wait(5)
+        return target.upper()
+
+    first = scheduler.submit("whois", "example.com", work, "example.com")
+    second = scheduler.submit("whois", "example.com", work, "example.com")
+    other = scheduler.submit("whois", "example.org", work, "example.org")
+    assert first is second
+    assert other is not first
+    release.set()
+    assert first.result(5) == "EXAMPLE.COM"
+    assert other.result(5) == "EXAMPLE.ORG"
+    assert sorted(calls) == ["example.com", "example.org"]
+    scheduler.shutdown()
+
+
+def test_finished_job_is_not_reused():
+    scheduler = JobScheduler(max_workers=1)
+    first = scheduler.submit("ip", "1.1.1.1", lambda: 1)
+    assert first.result(5) == 1
+    second = scheduler.submit("ip", "1.1.1.1", lambda: 2)
+    assert second is not first
+    assert second.result(5) == 2
+    scheduler.shutdown()
+
+
+def test_per_kind_limit_is_respected():
+    scheduler = JobScheduler(max_workers=4, limits={"breach": 1})
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def work(n):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return n
+
+    futures = [scheduler.submit("breach", f"user{n}@example.com", work, n) for n in range(5)]
+    assert [future.result(5) for future in futures] == list(range(5))
+    assert peak[0] == 1
+    scheduler.shutdown()
+
+
+def test_cancel_drops_queued_jobs_only():
+    scheduler = JobScheduler(max_workers=2, limits={"map": 1})
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    running = scheduler.submit("map", "a", blocking)
+    assert started.wait(5)
+    queued = [scheduler.submit("map", f"q{n}", lambda: "never") for n in range(3)]
+    assert scheduler.active("map") == 4
+
+    assert scheduler.cancel("map") == 3
+    assert all(future.cancelled() for future in queued)
+    release.set()
+    assert running.result(5) == "done"
+    scheduler.shutdown()
+
+
+def test_exceptions_reach_the_future():
+    scheduler = JobScheduler(max_workers=1)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    future = scheduler.submit("phone", "+1", fail)
+    assert isinstance(future.exception(5), RuntimeError)
+    scheduler.shutdown()
+
+
+def test_submit_after_shutdown_raises():
+    scheduler = JobScheduler(max_workers=1)
+    scheduler.shutdown()
+    try:
+        scheduler.submit("phone", "+1", lambda: None)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("submit() should fail after shutdown()")
@@ -0,0 +1,76 @@
+import asyncio
+import sys
+import textwrap
+from nmap_scanner import NmapScanner, _slots, format_ports
+
+HOST = ('<host><status state="up"/><address addr="10.0.0.{n}" addrtype="ipv4"/>'
+        '<ports><port protocol="tcp" portid="22"><state state="open"/><service name="ssh"/></port>'
+        '<port protocol="tcp" portid="23"><state state="closed"/></port></ports></host>')
+
+
+def fake_nmap(tmp_path, hang):
+    """A stand-in nmap that reports two hosts, then optionally never finishes"""
+    script = tmp_path / "nmap"
+    script.write_text(textwrap.dedent(f"""\
+        #!{sys.executable}
+        import sys, time
+        print('<?xml version="1.0"?><nmaprun>', flush=True)
+        for n in range(2):
+            print({HOST!r}.format(n=n), flush=True)
+        time.sleep({60 if hang else 0})
+        print('</nmaprun>', flush=True)
+    """))
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_format_ports_collapses_ranges():
+    assert format_ports((22, 80, 81, 82, 443)) == "22,80-82,443"
+
+
+def test_scan_parses_hosts_and_open_ports(tmp_path):
+    scanner = NmapScanner(ports="22,23", binary=fake_nmap(tmp_path, hang=False), timeout=10)
+    results = asyncio.run(scanner.scan(["example"]))
+    assert results == {
+        "10.0.0.0": {"target": "example", "open": [(22, "ssh")], "error": None},
+        "10.0.0.1": {"target": "example", "open": [(22, "ssh")], "error": None},
+    }
+
+
+def test_timeout_keeps_partial_results(tmp_path):
+    scanner = NmapScanner(ports="22", binary=fake_nmap(tmp_path, hang=True), timeout=1)
+
+    async def collect():
+        return [event async for event in scanner.scan_iter(["example"])]
+
+    events = asyncio.run(collect())
+    assert [event["port"] for event in events if event["event"] == "open"] == [22, 22]
+    assert events[-1]["event"] == "done" and events[-1]["timed_out"]
+
+
+def test_option_like_targets_are_rejected(tmp_path):
+    scanner = NmapScanner(binary=fake_nmap(tmp_path, hang=False))
+    results = asyncio.run(scanner.scan(["-oN/tmp/out"]))
+    assert "Invalid target" in results["-oN/tmp/out"]["error"]
+
+
+def test_process_cap_follows_each_scanners_limit():
+    async def peak_in_flight(limit):
+        in_flight = []
+        peak = []
+
+        async def hold():
+            async with _slots(limit):
+                in_flight.append(1)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.02)
+                in_flight.pop()
+
+        await asyncio.gather(*[hold() for _ in range(6)])
+        return max(peak)
+
+    async def run():
+        # The first limit used on a loop must not fix the cap for later scanners
+        return await peak_in_flight(1), await peak_in_flight(3)
+
+    assert asyncio.run(run()) == (1, 3)
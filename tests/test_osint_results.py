@@ -0,0 +1,60 @@
+import csv
+import json
+from osint_analyzer import OSINTAnalyzer
+from batch_analyzer import analyze_number
+from osint_results import (AnalysisResult, BreachResult, IPResult, PhoneInfoResult, PhoneNumberResult,
+                           ResultExporter, read_exported_results, CSV_FIELDS)
+from http_client import HTTPResponse
+
+
+def test_phone_result_matches_text_output():
+    analyzer = OSINTAnalyzer()
+    result = analyzer.phone_basic_info_result("+14155552671")
+    assert isinstance(result, PhoneInfoResult)
+    assert result.is_valid and result.timezones == ["America/Los_Angeles"]
+    assert analyzer.analyze_phone_number_basic_info("+14155552671") == result.format()
+    assert analyzer.phone_basic_info_result("+1").error.startswith("Error getting basic phone info")
+
+
+def test_batch_phone_analysis_becomes_structured_result():
+    result = PhoneNumberResult.from_analysis(analyze_number("+14155552671"))
+    assert result.query == "+14155552671" and result.e164 == "+14155552671"
+    assert AnalysisResult.from_dict(result.to_dict()) == result
+    invalid = PhoneNumberResult.from_analysis(analyze_number("+1"))
+    assert not invalid.is_valid and invalid.error
+    assert invalid.format() == invalid.error
+
+
+def test_breach_response_becomes_structured_result():
+    body = json.dumps([{"Name": "Adobe", "Title": "Adobe", "Domain": "adobe.com", "BreachDate": "2013-10-04",
+                        "PwnCount": 152445165, "DataClasses": ["Email addresses", "Passwords"]}])
+    result = OSINTAnalyzer().breach_result_from_response("a@example.com", HTTPResponse(200, body, {}))
+    assert result.breaches[0]["data_classes"] == ["Email addresses", "Passwords"]
+    assert result.format() == "Breaches found for a@example.com:\n  - Adobe (Domain: adobe.com, Date: 2013-10-04)\n"
+    missing = OSINTAnalyzer().breach_result_from_response("a@example.com", HTTPResponse(404, "", {}))
+    assert missing.format() == "No breaches found for a@example.com."
+
+
+def test_exporter_round_trips_jsonl(tmp_path):
+    results = [
+        BreachResult("a@example.com", breaches=[]),
+        IPResult("192.0.2.1", geolocation={"error": "no key"}, whois={"error": "offline"}),
+        PhoneInfoResult("+1", "Error getting basic phone info: too short"),
+    ]
+    path = str(tmp_path / "out.jsonl")
+    with ResultExporter(path) as exporter:
+        exporter.write_many(results)
+    assert list(read_exported_results(path)) == results
+    assert AnalysisResult.from_dict(results[1].to_dict()).format().startswith("no key")
+
+
+def test_exporter_writes_mixed_kinds_to_one_csv(tmp_path):
+    path = str(tmp_path / "out.csv")
+    with ResultExporter(path) as exporter:
+        exporter.write(BreachResult("a@example.com", breaches=[{"title": "X"}]))
+        exporter.write(PhoneInfoResult("+1", is_valid=False))
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert list(rows[0]) == CSV_FIELDS
+    assert json.loads(rows[0]["breaches"]) == [{"title": "X"}]
+    assert rows[1]["kind"] == "phone_info" and rows[1]["breaches"] == ""
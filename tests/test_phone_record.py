@@ -0,0 +1,49 @@
+import phonenumbers
+import pytest
+import phone_record
+from osint_analyzer import OSINTAnalyzer
+from phone_analyzer import PhoneAnalyzer
+from phone_record import PhoneRecord, to_phone_record
+
+
+def test_to_phone_record_parses_strings_and_passes_records_through():
+    record = to_phone_record("+14155552671")
+    assert isinstance(record, PhoneRecord)
+    assert record.raw == "+14155552671" and record.is_valid
+    assert to_phone_record(record) is record
+    with pytest.raises(phonenumbers.NumberParseException):
+        to_phone_record("not a number")
+
+
+def test_one_record_is_parsed_once_for_every_analyzer(monkeypatch):
+    calls = []
+    parse = phonenumbers.parse
+    monkeypatch.setattr(phone_record.phonenumbers, "parse", lambda *args: calls.append(args) or parse(*args))
+
+    record = to_phone_record("+442071838750")
+    analyzer = PhoneAnalyzer(record)
+    osint = OSINTAnalyzer()
+    assert analyzer.record is record
+    assert analyzer.validate_number()["is_valid"]
+    assert osint.phone_basic_info_result(record).region == record.region
+    assert osint.phone_validation_result(record).is_valid
+    assert osint.phone_isp_result(record).query == "+442071838750"
+    assert len(calls) == 1
+
+
+def test_lookups_are_cached_on_the_record(monkeypatch):
+    record = to_phone_record("+14155552671")
+    assert record.number_type in ("FIXED_LINE_OR_MOBILE", "MOBILE", "FIXED_LINE")
+    assert record.e164 == "+14155552671"
+
+    def fail(*args):
+        raise AssertionError("looked up again")
+    monkeypatch.setattr(phone_record.phonenumbers, "number_type", fail)
+    monkeypatch.setattr(phone_record.phonenumbers, "format_number", fail)
+    assert record.number_type in ("FIXED_LINE_OR_MOBILE", "MOBILE", "FIXED_LINE")
+    assert record.e164 == "+14155552671"
+
+
+def test_phone_analyzer_reports_unparseable_input_as_value_error():
+    with pytest.raises(ValueError):
+        PhoneAnalyzer("not a number")
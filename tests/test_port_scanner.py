@@ -0,0 +1,42 @@
+import asyncio
+import socket
+import pytest
+from port_scanner import PortScanner, parse_ports
+
+
+def test_parse_ports_accepts_lists_ranges_and_presets():
+    assert parse_ports("22, 80,8000-8002") == (22, 80, 8000, 8001, 8002)
+    assert len(parse_ports("top100")) == 100
+    assert 3306 in parse_ports("database,22")
+    with pytest.raises(ValueError):
+        parse_ports("0-10")
+    with pytest.raises(ValueError):
+        parse_ports("")
+
+
+def test_scan_reports_listening_ports_only():
+    listeners = []
+    for _ in range(2):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        listeners.append(sock)
+    open_ports = sorted(sock.getsockname()[1] for sock in listeners)
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    closed_port = closed.getsockname()[1]
+    closed.close()
+    try:
+        scanner = PortScanner(ports=open_ports + [closed_port], timeout=1)
+        results = asyncio.run(scanner.scan(["127.0.0.1", "not a host/33"]))
+    finally:
+        for sock in listeners:
+            sock.close()
+    assert [port for port, _ in results["127.0.0.1"]["open"]] == open_ports
+    assert results["not a host/33"]["error"]
+
+
+def test_scan_keys_cidr_hosts_by_address():
+    results = asyncio.run(PortScanner(ports="1", timeout=0.2).scan(["127.0.0.0/30"]))
+    assert set(results) == {"127.0.0.1", "127.0.0.2"}
+    assert all(result["target"] == "127.0.0.0/30" for result in results.values())
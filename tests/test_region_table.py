@@ -0,0 +1,36 @@
+from phone_record import to_phone_record
+from region_table import RegionTable, region_key
+
+
+def test_keys_ignore_case_and_spacing_but_not_country():
+    assert region_key("1", "Jersey  City, NJ ") == region_key(1, "jersey city, nj")
+    assert region_key(1, "Georgia") != region_key(995, "Georgia")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    table = RegionTable()
+    table.add(44, "London", 51.50735, -0.12776, 10)
+    table.add(1, "Georgia", 32.16562, -82.90008, 6)
+    table.add(995, "Georgia", 42.31541, 43.35689, 6)
+    path = tmp_path / "regions.tsv.gz"
+    table.save(str(path), {region_key(44, "London"): "London"})
+    first = path.read_bytes()
+
+    loaded = RegionTable.load(str(path))
+    assert len(loaded) == 3
+    assert loaded.lookup(44, "LONDON") == (51.50735, -0.12776, 10)
+    assert loaded.lookup(995, "Georgia") == (42.31541, 43.35689, 6)
+    assert loaded.lookup(44, "Paris") is None
+    assert loaded.lookup(44, "") is None
+
+    # Saving unchanged data again gives the same bytes
+    loaded.save(str(path), {region_key(44, "London"): "London"})
+    assert path.read_bytes() == first
+
+
+def test_lookup_record_uses_the_calling_code_and_region():
+    record = to_phone_record("+442071838750")
+    table = RegionTable()
+    table.add(44, record.region, 51.5, -0.1, 10)
+    assert table.lookup_record(record) == (51.5, -0.1, 10)
+    assert RegionTable().lookup_record(record) is None
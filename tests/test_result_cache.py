@@ -0,0 +1,69 @@
+import time
+from osint_results import BreachResult
+from phone_record import PhoneRecord
+from result_cache import ResultCache, normalize_target, result_key
+
+
+def make_cache(tmp_path, **kwargs):
+    kwargs.setdefault("ttls", {})
+    kwargs.setdefault("default_ttl", 3600)
+    return ResultCache(str(tmp_path / "results.db"), **kwargs)
+
+
+def test_equivalent_targets_share_a_key():
+    assert normalize_target("+1 (415) 555-2671") == "+14155552671"
+    assert normalize_target(PhoneRecord("+14155552671")) == "+14155552671"
+    assert normalize_target(" 2001:DB8:0::1 ") == "2001:db8::1"
+    assert result_key("breach", "A@Example.com ") == result_key("breach", "a@example.com")
+    assert result_key("breach", "a@example.com") != result_key("holehe", "a@example.com")
+
+
+def test_lookup_computes_once_and_survives_restart(tmp_path):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return BreachResult("a@example.com", breaches=[{"title": "X"}])
+
+    cache = make_cache(tmp_path)
+    first = cache.lookup_result("breach", "a@example.com", compute)
+    assert cache.lookup_result("breach", "A@example.com", compute) == first
+    cache.close()
+
+    reopened = make_cache(tmp_path)
+    assert reopened.lookup_result("breach", "a@example.com", compute) == first
+    assert len(calls) == 1
+    reopened.lookup_result("breach", "a@example.com", compute, refresh=True)
+    assert len(calls) == 2
+    reopened.close()
+
+
+def test_errors_are_not_cached(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.lookup_result("breach", "a@example.com", lambda: BreachResult("a@example.com", "Network error"))
+    assert cache.get_result("breach", "a@example.com") is None
+    cache.close()
+
+
+def test_per_analyzer_ttl_applies_to_both_tiers(tmp_path):
+    cache = make_cache(tmp_path, ttls={"short": 0.1})
+    cache.set("short", "x", [1])
+    cache.set("long", "x", [2])
+    time.sleep(0.15)
+    assert cache.get("short", "x") is None
+    assert cache.get("long", "x") == [2]
+    cache.clear_memory()
+    assert cache.get("short", "x") is None
+    assert cache.get("long", "x") == [2]
+    cache.close()
+
+
+def test_memory_tier_is_bounded_lru(tmp_path):
+    cache = make_cache(tmp_path, memory_entries=2)
+    for n in range(3):
+        cache.set("ip", f"10.0.0.{n}", n)
+    cache.get("ip", "10.0.0.1")
+    assert len(cache._memory) == 2
+    # Evicted from memory but still answered from disk
+    assert cache.get("ip", "10.0.0.0") == 0
+    cache.close()
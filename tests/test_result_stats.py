@@ -0,0 +1,70 @@
+import numpy as np
+from result_stats import ResultStats, format_summary, MISSING
+
+
+def _result(region_code, country_code, valid, carrier="", number_type="MOBILE", timezones=()):
+    return {
+        "region_code": region_code,
+        "country_code": country_code,
+        "is_valid": valid,
+        "carrier": carrier,
+        "number_type": number_type if valid else None,
+        "reason": "Valid phone number" if valid else "Invalid phone number",
+        "timezone": list(timezones),
+    }
+
+
+RESULTS = [
+    _result("US", 1, True, "Verizon", timezones=["America/New_York"]),
+    _result("US", 1, True, "Verizon", "FIXED_LINE", ["America/New_York", "America/Chicago"]),
+    _result(None, 1, False),
+    _result("GB", 44, True, "Vodafone", timezones=["Europe/London"]),
+    _result(None, 44, False),
+    _result(None, 44, False),
+]
+
+
+def test_counts_by_category():
+    stats = ResultStats.from_results(RESULTS)
+    assert len(stats) == 6
+    assert stats.valid_counts() == {"total": 6, "valid": 3, "invalid": 3}
+    assert stats.counts("region_code") == [(MISSING, 3), ("US", 2), ("GB", 1)]
+    assert stats.counts("carrier") == [(MISSING, 3), ("Verizon", 2), ("Vodafone", 1)]
+    assert dict(stats.counts("number_type")) == {"MOBILE": 2, "FIXED_LINE": 1, MISSING: 3}
+
+
+def test_timezones_are_multi_valued():
+    stats = ResultStats.from_results(RESULTS)
+    assert stats.timezone_counts() == [("America/New_York", 2), ("America/Chicago", 1), ("Europe/London", 1)]
+
+
+def test_invalid_rate_uses_calling_code():
+    stats = ResultStats.from_results(RESULTS)
+    # Equal totals keep first-seen order
+    assert stats.invalid_rate_by() == [(1, 3, 1, 1 / 3), (44, 3, 2, 2 / 3)]
+
+
+def test_chunked_ingest_matches_single_chunk():
+    many = RESULTS * 50
+    small = ResultStats(chunk_size=7).extend(many)
+    large = ResultStats().extend(many)
+    assert small.counts("carrier") == large.counts("carrier")
+    assert small.invalid_rate_by() == large.invalid_rate_by()
+    assert small.column("is_valid").dtype == np.bool_
+    # Adding rows after a query is reflected in the next query
+    small.add(_result("FR", 33, True))
+    assert small.valid_counts()["total"] == len(many) + 1
+
+
+def test_crosstab():
+    table, rows, columns = ResultStats.from_results(RESULTS).crosstab("region_code", "carrier")
+    assert table.sum() == 6
+    assert table[rows.index("US"), columns.index("Verizon")] == 2
+
+
+def test_empty_and_report():
+    assert ResultStats().valid_counts() == {"total": 0, "valid": 0, "invalid": 0}
+    assert ResultStats().counts("carrier") == []
+    report = format_summary(ResultStats.from_results(RESULTS))
+    assert "+44 (GB): 2/3 invalid (66.7%)" in report
+    assert "Verizon: 2 (33.3%)" in report
@@ -0,0 +1,75 @@
+import asyncio
+import socialscan.util
+from socialscan.platforms import PlatformResponse, Platforms
+from social_scanner import SocialScanner
+
+
+def fake_query(calls, failing=()):
+    async def query(username, platform, checkers):
+        calls.append((username, str(platform)))
+        await asyncio.sleep(0)
+        if str(platform) in failing:
+            return PlatformResponse(platform, username, False, False, False, "Too many requests", None)
+        taken = username == "taken"
+        return PlatformResponse(platform, username, not taken, True, True, "", "https://x/" + username if taken else None)
+    return query
+
+
+def scan_all(scanner, usernames):
+    async def collect():
+        try:
+            return [result async for result in scanner.scan_many(usernames)]
+        finally:
+            await scanner.close()
+    return asyncio.run(collect())
+
+
+def test_scan_many_streams_one_result_per_distinct_username(monkeypatch):
+    calls = []
+    monkeypatch.setattr(socialscan.util, "query", fake_query(calls))
+    scanner = SocialScanner(default_rpm=6000, platform_rpm={})
+    results = scan_all(scanner, ["taken", "Taken", "free_name1", " "])
+    assert sorted(result.query for result in results) == ["free_name1", "taken"]
+    taken = next(result for result in results if result.query == "taken")
+    assert {profile["status"] for profile in taken.profiles} == {"found"}
+    # Email-only platforms are never asked about usernames
+    assert not any(platform in ("Pinterest", "Firefox") for _, platform in calls)
+
+
+def test_usernames_a_platform_rejects_are_not_sent(monkeypatch):
+    calls = []
+    monkeypatch.setattr(socialscan.util, "query", fake_query(calls))
+    results = scan_all(SocialScanner(default_rpm=6000, platform_rpm={}), ["a.b-c"])
+    statuses = {profile["platform"]: profile["status"] for profile in results[0].profiles}
+    assert statuses["Twitter"] == "invalid" and statuses["GitHub"] == "invalid"
+    assert ("a.b-c", "Twitter") not in calls and ("a.b-c", "GitLab") in calls
+
+
+def test_failing_platform_is_skipped_after_max_failures(monkeypatch):
+    calls = []
+    monkeypatch.setattr(socialscan.util, "query", fake_query(calls, failing=("Reddit",)))
+    scanner = SocialScanner(concurrency=1, default_rpm=6000, platform_rpm={}, max_failures=2)
+    results = scan_all(scanner, [f"user_{n}" for n in range(5)])
+    assert sum(1 for _, platform in calls if platform == "Reddit") == 2
+    reddit = [profile["status"] for result in results for profile in result.profiles if profile["platform"] == "Reddit"]
+    assert reddit.count("skipped") == 3
+
+
+def test_platform_rate_limit_spaces_requests(monkeypatch):
+    calls = []
+    monkeypatch.setattr(socialscan.util, "query", fake_query(calls))
+    scanner = SocialScanner(default_rpm=6000, platform_rpm={"GitLab": 600})
+    loop_time = []
+
+    async def run():
+        start = asyncio.get_running_loop().time()
+        try:
+            async for _ in scanner.scan_many(["user_a", "user_b", "user_c"]):
+                pass
+        finally:
+            await scanner.close()
+        loop_time.append(asyncio.get_running_loop().time() - start)
+
+    asyncio.run(run())
+    # 600/min is one GitLab request per 0.1 s
+    assert loop_time[0] >= 0.2
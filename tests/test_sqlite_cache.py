@@ -0,0 +1,86 @@
+import time
+from sqlite_cache import SQLiteCache
+
+
+def test_round_trip_and_delete(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), "entries")
+    cache.set("key", {"value": [1, 2, 3]})
+    assert cache.get("key") == {"value": [1, 2, 3]}
+    assert len(cache) == 1
+    cache.delete("key")
+    assert cache.get("key") is None
+    cache.close()
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), "entries", ttl=0.2)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    time.sleep(0.25)
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_per_call_ttl_overrides_default(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), "entries", ttl=3600)
+    cache.set("key", "value")
+    time.sleep(0.05)
+    assert cache.get("key", ttl=0.01) is None
+    cache.close()
+
+
+def test_purge_expired(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), "entries", ttl=0.1)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    time.sleep(0.15)
+    cache.set("c", 3)
+    assert cache.purge_expired() == 2
+    assert cache.get("c") == 3
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), "entries", max_entries=2)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+    time.sleep(0.01)
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    cache.close()
+
+
+def test_values_persist_across_connections(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = SQLiteCache(path, "entries")
+    cache.set("key", "value")
+    cache.close()
+    reopened = SQLiteCache(path, "entries")
+    assert reopened.get("key") == "value"
+    reopened.close()
+
+
+def test_geocode_cache_migrates_the_legacy_table(tmp_path):
+    import sqlite3
+    from geocode_cache import GeocodeCache
+    path = str(tmp_path / "geocode.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE geocode (query TEXT PRIMARY KEY, results TEXT NOT NULL,"
+                 " created REAL NOT NULL, accessed REAL NOT NULL)")
+    conn.execute("INSERT INTO geocode VALUES (?, ?, ?, ?)", ("berlin", '[{"formatted": "Berlin"}]', time.time(), time.time()))
+    conn.commit()
+    conn.close()
+
+    cache = GeocodeCache(path, ttl=3600)
+    assert cache.get("berlin") == [{"formatted": "Berlin"}]
+    tables = {row[0] for row in cache._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "geocode" not in tables
+    cache.close()
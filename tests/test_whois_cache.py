@@ -0,0 +1,70 @@
+import threading
+import time
+from whois_cache import IPWhoisCache, WhoisCache, allocated_block, ip_block, registrable_domain, whois_cache_key
+
+ARIN_ANSWER = """
+NetRange:       8.8.8.0 - 8.8.8.255
+CIDR:           8.8.8.0/24
+NetName:        GOGL
+"""
+
+RIPE_ANSWER = """
+% This is the RIPE Database query service.
+inetnum:        193.0.0.0 - 193.0.7.255
+netname:        RIPE-NCC
+route:          193.0.0.0/21
+"""
+
+
+def test_registrable_domain_and_cache_keys():
+    assert registrable_domain("mail.example.com") == "example.com"
+    assert registrable_domain("a.b.example.co.uk.") == "example.co.uk"
+    assert registrable_domain("Example.COM") == "example.com"
+    assert registrable_domain("localhost") == "localhost"
+    assert whois_cache_key("someone@mail.example.com") == whois_cache_key("example.com")
+
+
+def test_allocated_block_picks_the_most_specific_network():
+    assert allocated_block(ARIN_ANSWER, "8.8.8.8") == "8.8.8.0/24"
+    assert allocated_block(RIPE_ANSWER, "193.0.6.139") == "193.0.0.0/21"
+    # LACNIC abbreviates IPv4 networks
+    assert allocated_block("inetnum:     200.160/16\n", "200.160.2.3") == "200.160.0.0/16"
+    assert allocated_block(ARIN_ANSWER, "9.9.9.9") is None
+    assert str(ip_block("8.8.8.8")) == "8.8.8.0/24"
+
+
+def test_ip_whois_cache_answers_every_address_in_a_block(tmp_path):
+    cache = IPWhoisCache(str(tmp_path / "whois.db"), ttl=3600)
+    cache.add("8.8.0.0/16", {"block": "8.8.0.0/16", "summary": "outer"})
+    cache.add("8.8.8.0/24", {"block": "8.8.8.0/24", "summary": "inner"})
+    assert cache.find("8.8.8.200")["summary"] == "inner"
+    assert cache.find("8.8.9.1")["summary"] == "outer"
+    assert cache.find("8.9.0.1") is None
+
+    calls = []
+    answer = cache.lookup("8.9.0.1", lambda: calls.append(1) or {"block": "8.9.0.0/24", "summary": "new"})
+    assert answer["summary"] == "new"
+    assert cache.lookup("8.9.0.77", lambda: calls.append(1))["summary"] == "new"
+    assert calls == [1]
+    cache.close()
+
+
+def test_concurrent_lookups_share_one_query(tmp_path):
+    cache = WhoisCache(str(tmp_path / "whois.db"), ttl=3600)
+    calls = []
+
+    def query():
+        calls.append(1)
+        time.sleep(0.1)
+        return "whois text"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.lookup("domain:example.com", query)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["whois text"] * 5
+    assert calls == [1]
+    cache.close()
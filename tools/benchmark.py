@@ -0,0 +1,357 @@
+"""
+Offline benchmarks for the analysis hot paths.
+
+Times PhoneAnalyzer, the OSINTAnalyzer phone methods, result formatting and
+map generation over a synthetic number set built from a fixed seed, so runs
+on different commits measure the same work. No network access is needed:
+
+    python tools/benchmark.py                        # run everything
+    python tools/benchmark.py --filter phone --numbers 5000
+    python tools/benchmark.py --json now.json        # save the measurements
+    python tools/benchmark.py --baseline old.json --max-regression 15
+
+Each benchmark reports ops/s, p50/p99 latency of a single operation and the
+peak memory allocated while running it (measured in a separate, shorter pass,
+since tracemalloc slows everything it traces).
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# tracemalloc makes everything it traces roughly ten times slower; operations
+# keep nothing between calls, so the memory pass only needs a sample of inputs
+MEMORY_SAMPLE = 500
+
+# Points plotted by each cluster map benchmark operation
+MAP_POINTS = 10000
+
+# One in INVALID_EVERY numbers is cut short so it parses but is not valid,
+# and one in UNPARSEABLE_EVERY is not a number at all
+INVALID_EVERY = 10
+UNPARSEABLE_EVERY = 50
+
+
+def synthetic_numbers(count, seed=1):
+    """
+    Return `count` E.164-style strings spread over every region phonenumbers
+    supports, derived from its example numbers with randomized subscriber
+    digits. The same count and seed always give the same list.
+    """
+    import phonenumbers
+    from phonenumbers import PhoneNumberFormat, PhoneNumberType
+
+    templates = []
+    for region in sorted(phonenumbers.SUPPORTED_REGIONS):
+        for number_type in (PhoneNumberType.MOBILE, PhoneNumberType.FIXED_LINE):
+            example = phonenumbers.example_number_for_type(region, number_type)
+            if example is not None:
+                templates.append(phonenumbers.format_number(example, PhoneNumberFormat.E164))
+    templates = sorted(set(templates))
+
+    rng = random.Random(seed)
+    numbers = []
+    for index in range(count):
+        if index % UNPARSEABLE_EVERY == UNPARSEABLE_EVERY - 1:
+            numbers.append(f"not-a-number-{index}")
+            continue
+        template = rng.choice(templates)
+        keep = max(len(template) - 4, 4)
+        number = template[:keep] + "".join(rng.choice("0123456789") for _ in range(len(template) - keep))
+        if index % INVALID_EVERY == INVALID_EVERY - 1:
+            number = number[:-3]
+        numbers.append(number)
+    return numbers
+
+
+def synthetic_points(count, seed=1):
+    """(lat, lng, label, count) points clustered around a few hundred places"""
+    rng = random.Random(seed)
+    centers = [(rng.uniform(-60, 70), rng.uniform(-170, 170)) for _ in range(300)]
+    points = []
+    for index in range(count):
+        lat, lng = rng.choice(centers)
+        points.append((lat + rng.gauss(0, 0.05), lng + rng.gauss(0, 0.05), f"Place {index % 300}", 1))
+    return points
+
+
+def synthetic_results(count, seed=1):
+    """A mix of every AnalysisResult kind with realistic amounts of data"""
+    from osint_results import (PhoneInfoResult, PhoneCarrierResult, PhoneValidationResult, DomainWhoisResult,
+                               BreachResult, SocialMediaResult, HoleheResult, IPResult)
+
+    rng = random.Random(seed)
+    platforms = ["Instagram", "Twitter", "GitHub", "Tumblr", "Lastfm", "Snapchat", "Yahoo", "Reddit"]
+    makers = [
+        lambda i: PhoneInfoResult(f"+1555{i:07d}", is_valid=True, parsed=f"Country Code: 1 National Number: 555{i:07d}",
+                                  region="Jersey City, NJ", timezones=["America/New_York"]),
+        lambda i: PhoneCarrierResult(f"+1555{i:07d}", is_valid=True, carrier="Example Wireless"),
+        lambda i: PhoneValidationResult(f"+1555{i:07d}", is_valid=bool(i % 2)),
+        lambda i: DomainWhoisResult(f"user{i}@example.com", domain="example.com",
+                                    text="Domain Name: EXAMPLE.COM\n" * 20),
+        lambda i: BreachResult(f"user{i}@example.com", breaches=[
+            {"name": f"Breach{n}", "title": f"Breach {n}", "domain": f"site{n}.com", "date": "2019-01-01",
+             "pwn_count": rng.randint(1000, 10 ** 8), "data_classes": ["Email addresses", "Passwords"]}
+            for n in range(rng.randint(0, 12))
+        ]),
+        lambda i: SocialMediaResult(f"user{i}", profiles=[
+            {"platform": name, "status": rng.choice(["found", "available", "invalid", "error"]),
+             "url": f"https://{name.lower()}.com/user{i}", "message": "Rate limited"}
+            for name in platforms
+        ]),
+        lambda i: HoleheResult(f"user{i}@example.com", sites={
+            f"site{n}.com": {"exists": bool(n % 3), "emailrecovery": None, "phoneNumber": None, "others": None}
+            for n in range(40)
+        }),
+        lambda i: IPResult(f"203.0.113.{i % 256}", geolocation={
+            "source": "local database", "city": "Amsterdam", "state": "North Holland", "country": "Netherlands",
+            "latitude": 52.37, "longitude": 4.89
+        }, whois={"server": "whois.ripe.net", "summary": "NetName: EXAMPLE\nCountry: NL\n" * 4, "block": None}),
+    ]
+    return [makers[index % len(makers)](index) for index in range(count)]
+
+
+class Benchmark:
+    """
+    `setup(size)` builds the inputs outside the timed region and `op(item)`
+    is timed once per input, `ops` inputs per pass (default: --numbers).
+    Benchmarks whose operation caches on the input
+    (PhoneRecord looks things up once) get fresh inputs for every pass.
+    """
+
+    def __init__(self, name, setup, op, ops=None):
+        self.name = name
+        self.setup = setup
+        self.op = op
+        self.ops = ops
+
+    def size(self, numbers):
+        return self.ops or numbers
+
+
+def _phone_analyzers(size):
+    from phone_analyzer import PhoneAnalyzer
+    analyzers = []
+    for number in synthetic_numbers(size):
+        try:
+            analyzers.append(PhoneAnalyzer(number))
+        except ValueError:
+            pass
+    return analyzers
+
+
+def _construct():
+    from phone_analyzer import PhoneAnalyzer
+
+    def op(number):
+        try:
+            PhoneAnalyzer(number)
+        except ValueError:
+            pass
+    return op
+
+
+def _validate():
+    """Parse each raw string and validate it, so invalid numbers build their reason too"""
+    import phonenumbers
+    from phone_analyzer import PhoneAnalyzer
+    from phone_record import to_phone_record
+
+    def op(number):
+        try:
+            PhoneAnalyzer(to_phone_record(number)).validate_number()
+        except phonenumbers.NumberParseException:
+            pass
+    return op
+
+
+def _osint_method(name):
+    from osint_analyzer import OSINTAnalyzer
+    return getattr(OSINTAnalyzer(), name)
+
+
+def _single_map(map_file):
+    import folium
+
+    def op(point):
+        m = folium.Map(location=[point[0], point[1]], zoom_start=10)
+        folium.Marker([point[0], point[1]], popup=point[2]).add_to(m)
+        m.save(map_file)
+    return op
+
+
+def _cluster_map(map_file):
+    from cluster_map import build_cluster_map
+
+    def op(points):
+        build_cluster_map(points, map_file)
+    return op
+
+
+def _point_sets(size):
+    return [synthetic_points(MAP_POINTS)] * size
+
+
+def _result_json(result):
+    json.dumps(result.to_dict(), ensure_ascii=False, default=str)
+
+
+def benchmarks(workdir):
+    """All benchmarks, in the order they are reported"""
+    from batch_analyzer import analyze_number
+    from cluster_map import aggregate_points
+    map_file = os.path.join(workdir, "map.html")
+    return [
+        Benchmark("phone_analyzer.construct", synthetic_numbers, _construct()),
+        Benchmark("phone_analyzer.get_basic_info", _phone_analyzers, lambda a: a.get_basic_info()),
+        Benchmark("phone_analyzer.validate_number", synthetic_numbers, _validate()),
+        Benchmark("phone_analyzer.get_number_type", _phone_analyzers, lambda a: a.get_number_type()),
+        Benchmark("osint.analyze_phone_number_basic_info", synthetic_numbers,
+                  _osint_method("analyze_phone_number_basic_info")),
+        Benchmark("osint.analyze_phone_number_isp", synthetic_numbers, _osint_method("analyze_phone_number_isp")),
+        Benchmark("osint.validate_phone_number", synthetic_numbers, _osint_method("validate_phone_number")),
+        Benchmark("batch.analyze_number", synthetic_numbers, analyze_number),
+        Benchmark("results.format", synthetic_results, lambda result: result.format()),
+        Benchmark("results.to_json", synthetic_results, _result_json),
+        # One op is a whole map of MAP_POINTS points, so these run a fixed, smaller number of times
+        Benchmark("map.aggregate_points", _point_sets, aggregate_points, ops=20),
+        Benchmark("map.single_location", synthetic_points, _single_map(map_file), ops=50),
+        Benchmark("map.cluster_map", _point_sets, _cluster_map(map_file), ops=5),
+    ]
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(benchmark, numbers, repeat=3):
+    """Time `repeat` passes and keep the fastest, then measure peak memory in one more pass"""
+    size = benchmark.size(numbers)
+    op = benchmark.op
+    perf_counter = time.perf_counter
+    best = None
+    for _ in range(repeat):
+        items = benchmark.setup(size)
+        latencies = []
+        gc.collect()
+        started = perf_counter()
+        for item in items:
+            op_started = perf_counter()
+            op(item)
+            latencies.append(perf_counter() - op_started)
+        elapsed = perf_counter() - started
+        if best is None or elapsed < best[0]:
+            best = (elapsed, latencies)
+
+    elapsed, latencies = best
+    latencies.sort()
+
+    items = benchmark.setup(min(size, MEMORY_SAMPLE))
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for item in items:
+            op(item)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_us": _percentile(latencies, 0.50) * 1e6,
+        "p99_us": _percentile(latencies, 0.99) * 1e6,
+        "peak_kib": peak / 1024,
+    }
+
+
+def _versions():
+    versions = {"python": platform.python_version()}
+    for module in ("phonenumbers", "folium"):
+        try:
+            versions[module] = __import__(module).__version__
+        except (ImportError, AttributeError):
+            versions[module] = None
+    return versions
+
+
+def measure(numbers=10000, repeat=3, name_filter=None):
+    with tempfile.TemporaryDirectory() as workdir:
+        selected = [b for b in benchmarks(workdir) if not name_filter or name_filter in b.name]
+        results = {}
+        for benchmark in selected:
+            results[benchmark.name] = run_benchmark(benchmark, numbers, repeat)
+    return {"numbers": numbers, "repeat": repeat, "versions": _versions(), "benchmarks": results}
+
+
+def print_report(report):
+    print(f"{report['numbers']} synthetic numbers, best of {report['repeat']} pass(es), "
+          + ", ".join(f"{name} {version}" for name, version in report["versions"].items()))
+    print()
+    print(f"{'benchmark':<40} {'ops':>7} {'ops/s':>11} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}")
+    for name, result in report["benchmarks"].items():
+        print(f"{name:<40} {result['ops']:>7} {result['ops_per_sec']:>11.1f} {result['p50_us']:>10.1f} "
+              f"{result['p99_us']:>10.1f} {result['peak_kib']:>10.1f}")
+
+
+def compare(report, baseline):
+    """Yield (name, ops/s change %, p99 change %, peak memory change %) for benchmarks in both runs"""
+    for name, result in report["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None:
+            continue
+        yield (name,
+               (result["ops_per_sec"] - before["ops_per_sec"]) / max(before["ops_per_sec"], 1e-9) * 100,
+               (result["p99_us"] - before["p99_us"]) / max(before["p99_us"], 1e-9) * 100,
+               (result["peak_kib"] - before["peak_kib"]) / max(before["peak_kib"], 1e-9) * 100)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis hot paths offline")
+    parser.add_argument("--numbers", type=int, default=10000, help="Synthetic phone numbers per benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per benchmark; the fastest is kept")
+    parser.add_argument("--filter", dest="name_filter", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--json", dest="json_path", help="Write the measurements to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="Exit with status 1 if any benchmark's ops/s drops by more than this percentage")
+    args = parser.parse_args(argv)
+    if args.numbers < 1 or args.repeat < 1:
+        parser.error("--numbers and --repeat must be at least 1")
+
+    report = measure(args.numbers, args.repeat, args.name_filter)
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        if baseline.get("numbers") != report["numbers"]:
+            print(f"\nWarning: baseline used {baseline.get('numbers')} numbers, this run {report['numbers']}")
+        print(f"\n{'benchmark':<40} {'ops/s':>9} {'p99':>9} {'peak':>9}")
+        regressed = []
+        for name, throughput, p99, peak in compare(report, baseline):
+            print(f"{name:<40} {throughput:>+8.1f}% {p99:>+8.1f}% {peak:>+8.1f}%")
+            if args.max_regression is not None and -throughput > args.max_regression:
+                regressed.append(name)
+        if regressed:
+            print(f"Slower than the baseline by more than {args.max_regression}%: {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Build data/region_coordinates.tsv.gz, the offline region -> coordinates table.
+
+Enumerates every English description phonenumbers' geocoder can return
+(area descriptions from phonenumbers.geodata plus country names), resolves
+each one once through OpenCage and stores centroid and zoom hint:
+
+    python tools/build_region_table.py                    # everything
+    python tools/build_region_table.py --countries US,GB  # only these regions
+    python tools/build_region_table.py --list             # print the work list
+
+Answers are kept in a dedicated geocode cache (no size limit), so a build
+that stops at the API's daily quota resumes where it left off when rerun.
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import phonenumbers  # noqa: E402
+from config import OPEN_CAGE_API_KEY, REGION_TABLE_PATH  # noqa: E402
+from geocode_cache import CachedGeocoder, GeocodeCache, opencage_client  # noqa: E402
+from region_table import RegionTable, region_key  # noqa: E402
+
+BUILD_CACHE_PATH = os.path.join(REPO_ROOT, "region_build_cache.db")
+
+
+def _country_code(prefix):
+    # Country calling codes are prefix-free, so the first match is the only one
+    for length in (1, 2, 3):
+        code = int(prefix[:length])
+        if code in phonenumbers.COUNTRY_CODE_TO_REGION_CODE:
+            return code
+    return None
+
+
+def _country_name(region_code):
+    from phonenumbers.geodata.locale import LOCALE_DATA
+    names = LOCALE_DATA.get(region_code, {})
+    name = names.get("en")
+    # "*xx" entries mean "same as language xx"
+    while name and name.startswith("*"):
+        name = names.get(name[1:])
+    return name
+
+
+def enumerate_regions(region_codes=None):
+    """
+    Return {(country_code, description): region codes} for every English
+    description the geocoder can produce, optionally limited to region_codes.
+    """
+    from phonenumbers.geodata import GEOCODE_DATA
+    wanted = {code.upper() for code in region_codes} if region_codes else None
+    regions = {}
+
+    for country_code, codes in phonenumbers.COUNTRY_CODE_TO_REGION_CODE.items():
+        for region_code in codes:
+            if wanted and region_code not in wanted:
+                continue
+            name = _country_name(region_code)
+            if name:
+                regions.setdefault((country_code, name), set()).add(region_code)
+
+    for prefix, names in GEOCODE_DATA.items():
+        description = names.get("en")
+        country_code = _country_code(prefix)
+        if not description or country_code is None:
+            continue
+        codes = [code for code in phonenumbers.COUNTRY_CODE_TO_REGION_CODE[country_code]
+                 if code != phonenumbers.UNKNOWN_REGION]
+        if wanted and not wanted.intersection(codes):
+            continue
+        regions.setdefault((country_code, description), set()).update(codes)
+    return regions
+
+
+def zoom_hint(result):
+    """Pick a map zoom from the size of the result's bounding box"""
+    bounds = result.get("bounds")
+    if not bounds:
+        return 10
+    span = max(abs(bounds["northeast"]["lat"] - bounds["southwest"]["lat"]),
+               abs(bounds["northeast"]["lng"] - bounds["southwest"]["lng"]), 1e-4)
+    return max(2, min(14, int(round(math.log2(360 / span)))))
+
+
+def resolve(geocoder, description, region_codes):
+    """Geocode one description, restricted to its countries; None if not found"""
+    countrycode = ",".join(sorted(code.lower() for code in region_codes)) if region_codes else None
+    kwargs = {"limit": 1, "no_annotations": 1}
+    if countrycode:
+        kwargs["countrycode"] = countrycode
+    results = geocoder.geocode(description, **kwargs)
+    if not results:
+        return None
+    result = results[0]
+    return result["geometry"]["lat"], result["geometry"]["lng"], zoom_hint(result)
+
+
+def build(output, region_codes=None, workers=1, delay=1.0, limit=None):
+    if not OPEN_CAGE_API_KEY:
+        raise SystemExit("OPEN_CAGE_API_KEY is not set in config.py")
+    from opencage.geocoder import RateLimitExceededError
+
+    regions = enumerate_regions(region_codes)
+    work = sorted(regions.items())
+    if limit:
+        work = work[:limit]
+    cache = GeocodeCache(BUILD_CACHE_PATH, ttl=None, max_entries=None)
+    geocoder = CachedGeocoder(opencage_client(OPEN_CAGE_API_KEY), cache)
+    table = RegionTable()
+    descriptions = {}
+    missing = 0
+
+    def task(item):
+        (country_code, description), codes = item
+        started = time.monotonic()
+        location = resolve(geocoder, description, codes)
+        # Cache hits return immediately; only real API calls are paced
+        elapsed = time.monotonic() - started
+        if elapsed > 0.05 and delay:
+            time.sleep(max(0, delay - elapsed))
+        return country_code, description, location
+
+    print(f"Resolving {len(work)} region descriptions...", file=sys.stderr)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for done, (country_code, description, location) in enumerate(executor.map(task, work), 1):
+                if location is None:
+                    missing += 1
+                else:
+                    table.add(country_code, description, *location)
+                    descriptions[region_key(country_code, description)] = description
+                if done % 500 == 0:
+                    print(f"  {done}/{len(work)}", file=sys.stderr)
+    except RateLimitExceededError:
+        print("OpenCage quota exhausted; writing what was resolved. Rerun later to continue.", file=sys.stderr)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    table.save(output, descriptions)
+    print(f"Wrote {len(table)} regions to {output} ({missing} not found)", file=sys.stderr)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the offline region -> coordinates table")
+    parser.add_argument("-o", "--output", default=os.path.join(REPO_ROOT, REGION_TABLE_PATH))
+    parser.add_argument("--countries", help="comma separated region codes to include, e.g. US,GB")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent geocoding requests (default: 1)")
+    parser.add_argument("--delay", type=float, default=1.0, help="seconds between API calls per worker (default: 1.0)")
+    parser.add_argument("--limit", type=int, help="resolve at most this many descriptions")
+    parser.add_argument("--list", action="store_true", help="print the descriptions that would be resolved and exit")
+    args = parser.parse_args(argv)
+    region_codes = [code.strip() for code in args.countries.split(",")] if args.countries else None
+
+    if args.list:
+        for (country_code, description), codes in sorted(enumerate_regions(region_codes).items()):
+            print(f"+{country_code}\t{description}\t{','.join(sorted(codes))}")
+        return 0
+    build(args.output, region_codes, args.workers, args.delay, args.limit)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Import-time report for the Pheonix entry points.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+summarizes the slowest imports, so startup regressions show up in review:
+
+    python tools/importtime_report.py                  # report for Pheonix
+    python tools/importtime_report.py --json now.json  # save the measurements
+    python tools/importtime_report.py --baseline old.json --max-regression 20
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported just to show the main window
+HEAVY_MODULES = ("folium", "holehe", "bs4", "lxml", "aiohttp", "tqdm", "opencage", "whois", "socialscan", "httpx")
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module, runs=3):
+    """Import module in `runs` fresh interpreters and keep the fastest run"""
+    best = None
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{process.stderr[-2000:]}")
+        imports = {}
+        for line in process.stderr.splitlines():
+            match = _LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, name = match.groups()
+                imports[name] = {"self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                                 "depth": len(indent) // 2}
+        total = imports.get(module, {}).get("cumulative_us", 0)
+        if best is None or total < best["total_us"]:
+            best = {"module": module, "total_us": total, "imports": imports}
+    return best
+
+
+def print_report(report, top=25):
+    print(f"Cold import of {report['module']}: {report['total_us'] / 1000:.1f} ms")
+    heavy = sorted(name for name in report["imports"] if name.split(".")[0] in HEAVY_MODULES and "." not in name)
+    print(f"Heavy modules loaded at startup: {', '.join(heavy) if heavy else 'none'}")
+    print()
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    ranked = sorted(report["imports"].items(), key=lambda item: item[1]["cumulative_us"], reverse=True)
+    for name, timing in ranked[:top]:
+        print(f"{timing['cumulative_us'] / 1000:14.1f} {timing['self_us'] / 1000:9.1f}  {'  ' * timing['depth']}{name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report module import times (python -X importtime)")
+    parser.add_argument("module", nargs="?", default="Pheonix", help="Module to import (default: Pheonix)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to try; the fastest is kept")
+    parser.add_argument("--top", type=int, default=25, help="Number of slowest imports to list")
+    parser.add_argument("--json", dest="json_path", help="Write the measurements to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="Exit with status 1 if the total grows by more than this percentage over the baseline")
+    args = parser.parse_args(argv)
+
+    report = measure(args.module, args.runs)
+    print_report(report, args.top)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        change = (report["total_us"] - baseline["total_us"]) / max(baseline["total_us"], 1) * 100
+        print(f"\nBaseline: {baseline['total_us'] / 1000:.1f} ms, now {report['total_us'] / 1000:.1f} ms ({change:+.1f}%)")
+        new_modules = sorted(set(report["imports"]) - set(baseline["imports"]))
+        if new_modules:
+            print(f"Newly imported at startup: {', '.join(new_modules[:20])}")
+        if args.max_regression is not None and change > args.max_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
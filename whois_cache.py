@@ -0,0 +1,252 @@
+import ipaddress
+import re
+import threading
+from sqlite_cache import SQLiteCache
+from config import WHOIS_CACHE_PATH, WHOIS_CACHE_TTL, WHOIS_CACHE_MAX_ENTRIES
+
+# Second-level labels under which registrations happen one level deeper
+# (example.co.uk, example.com.au). Not the full public suffix list, but it
+# covers the country-code suffixes that make up most real traffic.
+_SECOND_LEVEL_LABELS = {"ac", "co", "com", "edu", "gov", "net", "org", "ne", "or", "go", "gob", "mil", "nic", "ltd", "plc"}
+
+
+def registrable_domain(domain):
+    """Reduce a host name to the domain that is actually registered, e.g. mail.example.co.uk -> example.co.uk"""
+    labels = [label for label in domain.strip().lower().rstrip(".").split(".") if label]
+    if len(labels) <= 2:
+        return ".".join(labels)
+    if len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def ip_block(ip_address):
+    """
+    Network an IP is provisionally grouped under while its WHOIS answer is
+    pending: its /24 (IPv4) or /48 (IPv6). Answers are cached by the block
+    the registry actually returns.
+    """
+    address = ipaddress.ip_address(ip_address.strip())
+    prefix = 24 if address.version == 4 else 48
+    return ipaddress.ip_network(f"{address}/{prefix}", strict=False)
+
+
+_CIDR_FIELDS = re.compile(r"^\s*(?:CIDR|route6?|inet6?num)\s*:\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+_RANGE_FIELDS = re.compile(r"^\s*(?:NetRange|inetnum)\s*:\s*([0-9A-Fa-f:.]+)\s*-\s*([0-9A-Fa-f:.]+)", re.IGNORECASE | re.MULTILINE)
+
+
+def _parse_network(text):
+    text = text.strip()
+    if "/" in text and ":" not in text:
+        # LACNIC abbreviates IPv4 networks, e.g. "200.0.0/16"
+        address, prefix = text.split("/", 1)
+        octets = address.split(".")
+        text = ".".join(octets + ["0"] * (4 - len(octets))) + "/" + prefix
+    return ipaddress.ip_network(text, strict=False)
+
+
+def allocated_block(whois_text, ip_address):
+    """
+    Find the most specific allocation (CIDR, NetRange, inetnum, route) in raw
+    WHOIS text that contains ip_address. Returns a CIDR string or None.
+    """
+    address = ipaddress.ip_address(ip_address.strip())
+    networks = []
+    for match in _CIDR_FIELDS.finditer(whois_text):
+        for part in match.group(1).split(","):
+            try:
+                networks.append(_parse_network(part))
+            except ValueError:
+                pass
+    for match in _RANGE_FIELDS.finditer(whois_text):
+        try:
+            first = ipaddress.ip_address(match.group(1))
+            last = ipaddress.ip_address(match.group(2))
+            networks.extend(ipaddress.summarize_address_range(first, last))
+        except (ValueError, TypeError):
+            pass
+    containing = [network for network in networks if network.version == address.version and address in network]
+    if not containing:
+        return None
+    return str(min(containing, key=lambda network: network.num_addresses))
+
+
+IANA_WHOIS_SERVER = "whois.iana.org"
+_REFER_FIELD = re.compile(r"^\s*(?:refer|whois)\s*:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+_REFERRAL_SERVER = re.compile(r"^\s*ReferralServer\s*:\s*whois://([^\s:/]+)", re.IGNORECASE | re.MULTILINE)
+
+
+def query_ip_whois(ip_address, timeout=10, max_referrals=2):
+    """
+    Ask the registries about the IP itself: IANA names the responsible RIR,
+    which answers with the allocation (ARIN may refer on to another RIR).
+    Returns (server, text) for the last registry that answered.
+    """
+    from whois import NICClient
+    ip_address = str(ipaddress.ip_address(ip_address.strip()))
+    client = NICClient()
+    text = client.whois(ip_address, IANA_WHOIS_SERVER, 0, quiet=True, timeout=timeout, ignore_socket_errors=False)
+    match = _REFER_FIELD.search(text)
+    server = IANA_WHOIS_SERVER
+    while match and max_referrals >= 0:
+        server = match.group(1).lower()
+        # ARIN answers a bare IP with every matching record; "n +" asks for the network details
+        query = f"n + {ip_address}" if server == "whois.arin.net" else ip_address
+        text = client.whois(query, server, 0, quiet=True, timeout=timeout, ignore_socket_errors=False)
+        match = _REFERRAL_SERVER.search(text)
+        max_referrals -= 1
+    return server, text
+
+
+def whois_cache_key(target):
+    """Cache key for a domain or email address"""
+    return f"domain:{registrable_domain(target.strip().split('@')[-1])}"
+
+
+class WhoisCache(SQLiteCache):
+    """WHOIS answers keyed by registrable domain, with TTL and LRU limits"""
+
+    def __init__(self, path=WHOIS_CACHE_PATH, ttl=WHOIS_CACHE_TTL, max_entries=WHOIS_CACHE_MAX_ENTRIES):
+        super().__init__(path, "whois", ttl, max_entries)
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def lookup(self, key, query):
+        """
+        Return the cached value for key, or call query() to produce it.
+        Threads asking for the same key at the same time wait for a single
+        query instead of each sending their own. Exceptions are not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._inflight_lock:
+            lock = self._inflight.setdefault(key, threading.Lock())
+        with lock:
+            try:
+                value = self.get(key)
+                if value is None:
+                    value = query()
+                    self.set(key, value)
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+        return value
+
+
+def _range_bounds(network):
+    # Fixed-width hex sorts like the integer, and fits IPv6 where SQLite integers do not
+    width = 8 if network.version == 4 else 32
+    return (format(int(network.network_address), f"0{width}x"),
+            format(int(network.broadcast_address), f"0{width}x"))
+
+
+class IPWhoisCache(SQLiteCache):
+    """
+    IP WHOIS answers keyed by the allocation the registry returned.
+    Values live in the usual key/value table under the block's CIDR; a side
+    table of (first, last) address bounds lets any address inside a cached
+    block find its answer with one indexed containment query.
+    """
+
+    def __init__(self, path=WHOIS_CACHE_PATH, ttl=WHOIS_CACHE_TTL, max_entries=WHOIS_CACHE_MAX_ENTRIES):
+        super().__init__(path, "ip_whois", ttl, max_entries)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ip_whois_ranges ("
+                " block TEXT PRIMARY KEY,"
+                " version INTEGER NOT NULL,"
+                " first TEXT NOT NULL,"
+                " last TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ip_whois_ranges_first ON ip_whois_ranges (version, first)")
+            self._conn.commit()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def find(self, ip_address):
+        """Return the cached answer for the most specific block containing ip_address, or None"""
+        address = ipaddress.ip_address(ip_address.strip())
+        point = _range_bounds(ipaddress.ip_network(address))[0]
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT block FROM ip_whois_ranges WHERE version = ? AND first <= ? AND last >= ?"
+                " ORDER BY first DESC, last ASC",
+                (address.version, point, point)
+            ).fetchall()
+        for (block,) in rows:
+            value = self.get(block)
+            if value is not None:
+                return value
+            # Expired or evicted from the value table
+            with self._lock:
+                self._conn.execute("DELETE FROM ip_whois_ranges WHERE block = ?", (block,))
+                self._conn.commit()
+        return None
+
+    def add(self, block, value):
+        network = ipaddress.ip_network(block, strict=False)
+        first, last = _range_bounds(network)
+        self.set(str(network), value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ip_whois_ranges (block, version, first, last) VALUES (?, ?, ?, ?)",
+                (str(network), network.version, first, last)
+            )
+            self._conn.commit()
+
+    def lookup(self, ip_address, query):
+        """
+        Return the answer for ip_address from any cached block containing it,
+        or call query() and cache its result under result["block"] (just the
+        address itself if the registry named no block). Concurrent lookups in
+        the same /24 or /48 wait for the first one and reuse its answer when
+        its block covers them. Exceptions are not cached.
+        """
+        value = self.find(ip_address)
+        if value is not None:
+            return value
+        provisional = str(ip_block(ip_address))
+        with self._inflight_lock:
+            lock = self._inflight.setdefault(provisional, threading.Lock())
+        with lock:
+            try:
+                value = self.find(ip_address)
+                if value is None:
+                    value = query()
+                    address = ipaddress.ip_address(ip_address.strip())
+                    self.add(value.get("block") or str(ipaddress.ip_network(address)), value)
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(provisional, None)
+        return value
+
+    def purge_expired(self):
+        removed = super().purge_expired()
+        with self._lock:
+            self._conn.execute(f"DELETE FROM ip_whois_ranges WHERE block NOT IN (SELECT key FROM {self.table})")
+            self._conn.commit()
+        return removed
+
+
+_shared_cache = None
+_shared_ip_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_whois_cache():
+    """Return the process-wide WhoisCache, opening it on first use"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = WhoisCache()
+        return _shared_cache
+
+
+def get_ip_whois_cache():
+    """Return the process-wide IPWhoisCache, opening it on first use"""
+    global _shared_ip_cache
+    with _shared_cache_lock:
+        if _shared_ip_cache is None:
+            _shared_ip_cache = IPWhoisCache()
+        return _shared_ip_cache